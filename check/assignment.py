@@ -0,0 +1,168 @@
+"""희소 후보 그래프(왼쪽 행 ↔ 오른쪽 행 간선 + 종합 점수)에서 일대일 매칭을 푸는 모듈.
+
+개요
+- 입력: ContractMatcher.edges() 결과 (left_position, right_position, overall_score ...)
+- min_score 미만 간선은 버림 → 짝이 없는 행은 미매칭으로 남음
+- greedy: 점수 내림차순(동점이면 왼쪽 → 오른쪽 시트 순서)으로 양쪽 모두 비어 있을 때만 채택, O(E log E)
+- hungarian: 간선으로 이어진 연결 요소마다 점수 합이 최대가 되는 할당
+  - scipy가 있으면 connected_components + linear_sum_assignment, 없으면 내장 union-find + Hungarian(numpy)
+  - 연결 요소가 max_component 셀보다 크면 그 요소만 greedy로 처리
+- 메모리: 간선 배열과 요소별 작은 행렬만 사용 (행 수에 거의 비례)
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+except Exception:  # pragma: no cover
+    linear_sum_assignment = None  # type: ignore
+
+ASSIGNMENT_METHODS = ('greedy', 'hungarian')
+
+
+def _greedy(left: np.ndarray, right: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """채택한 간선 위치 목록"""
+    order = np.lexsort((right, left, -score))
+    used_left, used_right = set(), set()
+    chosen = []
+    for edge in order.tolist():
+        a, b = int(left[edge]), int(right[edge])
+        if a in used_left or b in used_right:
+            continue
+        used_left.add(a)
+        used_right.add(b)
+        chosen.append(edge)
+    return np.array(chosen, dtype=np.int64)
+
+
+def _components(left: np.ndarray, right: np.ndarray, n_left: int) -> np.ndarray:
+    """간선 그래프의 연결 요소 번호 (노드: 왼쪽 0..n_left-1, 오른쪽 n_left + 위치) → 간선별 요소 번호"""
+    if linear_sum_assignment is not None:
+        size = n_left + int(right.max()) + 1
+        graph = coo_matrix((np.ones(len(left)), (left, right + n_left)), shape=(size, size))
+        labels = connected_components(graph, directed=False)[1]
+        return labels[left].astype(np.int64)
+
+    parent: Dict[int, int] = {}
+
+    def find(x: int) -> int:
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(x, x) != root:  # 경로 압축
+            parent[x], x = root, parent[x]
+        return root
+
+    for a, b in zip(left.tolist(), (right + n_left).tolist()):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    return np.array([find(a) for a in left.tolist()], dtype=np.int64)
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    """최소 비용 할당 (행 수 ≤ 열 수) → 행마다 열 번호 (potential 기반 O(n²m), 열 방향은 numpy 연산)"""
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)    # 열 j에 배정된 행 (1부터, 0은 없음)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            current = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (current < minv[1:])
+            minv[1:][better] = current[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(candidates.argmin()) + 1
+            delta = candidates[j1 - 1]
+            used_columns = np.flatnonzero(used)
+            u[p[used_columns]] += delta
+            v[used_columns] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    result = np.full(n, -1, dtype=np.int64)
+    assigned = np.flatnonzero(p[1:]) + 1
+    result[p[assigned] - 1] = assigned - 1
+    return result
+
+
+def _solve_component(left: np.ndarray, right: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """한 연결 요소의 최대 점수 할당 → 채택한 간선 위치 (요소 안 기준)"""
+    rows, row_index = np.unique(left, return_inverse=True)
+    cols, col_index = np.unique(right, return_inverse=True)
+    # 간선이 없는 칸은 0점(비용 0) - 그 칸에 배정되면 미매칭으로 처리하므로 점수 합 최대 매칭과 같음
+    cost = np.zeros((len(rows), len(cols)))
+    edge_of = np.full((len(rows), len(cols)), -1, dtype=np.int64)
+    # 같은 칸에 간선이 둘 이상이면 점수가 높은 간선
+    for edge in np.argsort(score, kind='stable').tolist():
+        cost[row_index[edge], col_index[edge]] = -score[edge]
+        edge_of[row_index[edge], col_index[edge]] = edge
+    transposed = len(rows) > len(cols)
+    matrix = cost.T if transposed else cost
+    if linear_sum_assignment is not None:
+        r, c = linear_sum_assignment(matrix)
+    else:
+        c = _hungarian(matrix)
+        r = np.arange(len(c))
+        r, c = r[c >= 0], c[c >= 0]
+    if transposed:
+        r, c = c, r
+    chosen = edge_of[r, c]
+    return chosen[chosen >= 0]
+
+
+def assign(edges: pd.DataFrame, method: str = 'greedy', min_score: float = 0,
+           max_component: int = 4_000_000) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """일대일 매칭 → (채택한 간선 DataFrame(왼쪽 위치 순), 통계)
+
+    통계: 간선 수, 연결 요소 수, greedy로 대신 푼 큰 요소 수
+    """
+    if method not in ASSIGNMENT_METHODS:
+        raise ValueError(f"지원하지 않는 할당 방식: {method} (가능: {', '.join(ASSIGNMENT_METHODS)})")
+    edges = edges[edges['overall_score'] >= min_score].reset_index(drop=True)
+    left = edges['left_position'].to_numpy()
+    right = edges['right_position'].to_numpy()
+    score = edges['overall_score'].to_numpy(dtype=np.float64)
+    stats = {'edges': len(edges), 'components': 0, 'greedy_fallback': 0}
+
+    if method == 'greedy' or len(edges) == 0:
+        chosen = _greedy(left, right, score)
+    else:
+        n_left = int(left.max()) + 1
+        component = _components(left, right, n_left)
+        order = np.argsort(component, kind='stable')
+        bounds = np.flatnonzero(np.r_[True, component[order][1:] != component[order][:-1], True])
+        chosen_parts: List[np.ndarray] = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            members = order[start:stop]
+            size = len(np.unique(left[members])) * len(np.unique(right[members]))
+            if size > max_component:
+                stats['greedy_fallback'] += 1
+                picked = _greedy(left[members], right[members], score[members])
+            else:
+                picked = _solve_component(left[members], right[members], score[members])
+            chosen_parts.append(members[picked])
+        stats['components'] = len(bounds) - 1
+        chosen = np.concatenate(chosen_parts) if chosen_parts else np.zeros(0, dtype=np.int64)
+
+    result = edges.iloc[np.sort(chosen)]
+    return result.sort_values('left_position', kind='stable', ignore_index=True), stats
@@ -5,26 +5,161 @@
 - 통합본 폴더의 엑셀 파일들 (check/통합본/*.xlsx)
 - raw_data 폴더의 JSON 파일들 (check/raw_data/**/selectDetail.json)
 - 처리: 주요 필드의 Fuzzy 매칭으로 유사도 계산 및 불일치 분류
+  (컬럼 단위 벡터화 비교는 column_compare.compare_frame)
 - 출력: 불일치 항목을 시트별로 정리한 Excel 파일
 """
 
+import argparse
 import json
+import multiprocessing
 import pandas as pd
 import sys
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from fuzzywuzzy import fuzz
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
+from json_index_store import JsonIndexStore
+from match_index import MatchIndex
+from column_compare import SHEET_NAMES, compare_frame
+from row_cache import ROW_CACHE_FILENAME, RowCache, compare_incremental
+from sample_check import DEFAULT_PER_STRATUM, sample_frame
 
+# 저장소 루트의 utils 패키지 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.excel_cache import read_workbook
+from utils.report_writer import SIDECAR_FORMATS, ReportWriter
 
-def load_json_data(raw_data_path: Path) -> Dict[str, Dict[str, Any]]:
-    """raw_data 폴더에서 모든 selectDetail.json 파일을 로드하여 ManageNo를 키로 하는 딕셔너리 생성"""
+# 파일별 요약을 모은 전체 요약 파일 (비교결과 폴더)
+SUMMARY_FILENAME = "전체_비교요약.xlsx"
+# --sample 표본 점검 결과 (비교결과 폴더, 파일 × 항목별 추정 불일치율)
+SAMPLE_SUMMARY_FILENAME = "표본점검_요약.xlsx"
+
+
+# 엑셀과 JSON 필드 매핑 정의
+# 엑셀 컬럼명: [JSON 필드명 후보들]
+FIELD_MAPPINGS: Dict[str, List[str]] = {
+    '계약명': ['ContractName'],
+    '계약 명': ['ContractName'],
+    '진행 상태': ['StatusName'],
+    '진행상태': ['StatusName'],
+    '상태': ['StatusName'],
+    '담당자 이름': ['ManagerUserName'],
+    '담당자': ['ManagerUserName'],
+    '담당자명': ['ManagerUserName'],
+    '검토 요청자': ['ManagerUserName'],
+    '검토요청자': ['ManagerUserName'],
+    '계약 시작일': ['ContractStartDate'],
+    '계약 완료일': ['ContractEndDate'],
+    '계약 종료': ['ContractEndDate'],
+    '계약 체결일': ['SignedDate'],
+    '계약예정일': ['SignedDate'],
+    '계약 규모': ['ContractAmountList'],
+    '통화': ['CurrencyCode'],
+    '상대 계약자': ['SignedContractPartnerInfoList'],
+    '상대계약자': ['SignedContractPartnerInfoList'],
+    '대분류': ['MainContractTypeCode'],
+    '대분류_카테고리이름': ['MainContractTypeName'],
+    '분류': ['ContractClassCode'],
+    '분류_카테고리이름': ['ContractClassName'],
+    # 새로 확인된 매핑
+    '계열사명': ['CCName'],
+    '관리 번호': ['ManageNo'],  # ManageName이 아니라 ManageNo인 것으로 확인
+    '관리번호': ['ManageNo'],
+    '개정번호': ['Revision'],
+    '수정일': ['UpdateDate'],
+    '담당자 이메일': ['ManagerUserEmail'],
+    '담당자 휴대폰 번호': ['ManagerUserPhoneNumber'],
+    '담당자 휴대폰': ['ManagerUserPhoneNumber'],
+    '담당자 휴대폰번호': ['ManagerUserPhoneNumber'],
+    '담당자 퇴사여부': ['ManagerUserIsActive'],
+    '담당자 퇴사': ['ManagerUserIsActive'],
+}
+
+
+def _normalize_field_name(name: Any) -> str:
+    """컬럼명/JSON 키 부분 매칭용 정규화 (소문자, 공백/밑줄 제거)"""
+    return str(name).strip().lower().replace(" ", "").replace("_", "")
+
+
+class ComparisonPlan:
+    """엑셀 헤더만으로 정해지는 컬럼 → JSON 필드 대응을 워크북당 한 번만 계산
+
+    - 컬럼별 후보: FIELD_MAPPINGS 후보(순서 유지) → 없으면 이름 부분 매칭 (3글자 이상)
+    - 실제로 어떤 후보가 쓰일지는 레코드에 그 키가 있는지에 달려 있으므로,
+      레코드 키 구성(스키마)별로 결과를 캐시해 같은 스키마의 행은 조회만 함
+    """
+
+    def __init__(self, columns: List[Any], key_col: Any):
+        self.columns = [col for col in columns if col != key_col]
+        self.mapped: Dict[Any, List[str]] = {}
+        self.fallback_norm: Dict[Any, Optional[str]] = {}
+        for col in self.columns:
+            self.mapped[col] = FIELD_MAPPINGS.get(str(col).strip(), [])
+            col_normalized = _normalize_field_name(col)
+            self.fallback_norm[col] = col_normalized if len(col_normalized) >= 3 else None
+        self._key_norm: Dict[str, str] = {}
+        self._resolved: Dict[tuple, List[tuple]] = {}
+
+    def _fallback_field(self, col_normalized: str, json_keys: tuple) -> Optional[str]:
+        for json_key in json_keys:
+            key_normalized = self._key_norm.get(json_key)
+            if key_normalized is None:
+                key_normalized = self._key_norm[json_key] = _normalize_field_name(json_key)
+            if col_normalized in key_normalized or key_normalized in col_normalized:
+                return json_key
+        return None
+
+    def resolve(self, json_data: Dict[str, Any]) -> List[tuple]:
+        """[(엑셀 컬럼, JSON 필드 또는 None), ...] - 레코드 키 구성별 캐시"""
+        json_keys = tuple(json_data.keys())
+        resolved = self._resolved.get(json_keys)
+        if resolved is None:
+            key_set = set(json_keys)
+            resolved = []
+            for col in self.columns:
+                field = next((f for f in self.mapped[col] if f in key_set), None)
+                if field is None and self.fallback_norm[col] is not None:
+                    field = self._fallback_field(self.fallback_norm[col], json_keys)
+                resolved.append((col, field))
+            self._resolved[json_keys] = resolved
+        return resolved
+
+
+def load_json_data(
+    raw_data_path: Path,
+    use_index: bool = True,
+    companies: Optional[List[str]] = None,
+    refresh: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """raw_data 폴더에서 모든 selectDetail.json 파일을 로드하여 ManageNo를 키로 하는 딕셔너리 생성
+
+    use_index=True 이면 SQLite 색인(json_index_store)을 갱신한 뒤 색인에서 로드
+    (바뀐 파일만 다시 파싱, refresh=False 이면 갱신 없이 로드만)
+    companies: raw_data/<기업명> 폴더명 목록 - 주면 해당 기업 레코드만 로드
+    """
+    target = f" (기업: {', '.join(companies)})" if companies is not None else ""
+    if use_index:
+        print(f"[JSON 수집] {raw_data_path} 색인에서 selectDetail.json 로드 중...{target}")
+        with JsonIndexStore(raw_data_path) as store:
+            if refresh:
+                store.refresh()
+            json_data_map = store.load_map(companies)
+        print(f"  로드된 JSON 데이터 수: {len(json_data_map)}")
+        return json_data_map
+    
     json_data_map: Dict[str, Dict[str, Any]] = {}
     
-    print(f"[JSON 수집] {raw_data_path}에서 selectDetail.json 파일 수집 중...")
+    print(f"[JSON 수집] {raw_data_path}에서 selectDetail.json 파일 수집 중...{target}")
     
-    json_files = list(raw_data_path.rglob("selectDetail.json"))
+    if companies is None:
+        json_files = list(raw_data_path.rglob("selectDetail.json"))
+    else:
+        json_files = []
+        for company in companies:
+            company_dir = raw_data_path / company
+            if company and company_dir.is_dir():
+                json_files.extend(company_dir.rglob("selectDetail.json"))
     print(f"  발견된 JSON 파일 수: {len(json_files)}")
     
     for json_file in json_files:
@@ -50,6 +185,35 @@ def load_json_data(raw_data_path: Path) -> Dict[str, Dict[str, Any]]:
     return json_data_map
 
 
+def list_companies(raw_data_path: Path, use_index: bool = True) -> Dict[str, Set[str]]:
+    """raw_data/<기업명> 폴더명 → CCName 집합 (색인을 쓰지 않으면 폴더명만, CCName은 빈 집합)"""
+    if use_index:
+        with JsonIndexStore(raw_data_path) as store:
+            return store.companies()
+    return {
+        item.name: set() for item in sorted(raw_data_path.iterdir())
+        if item.is_dir() and not item.name.startswith('.')
+    }
+
+
+def match_workbook_companies(excel_path: Path, companies: Dict[str, Set[str]]) -> Optional[List[str]]:
+    """통합본 파일명(예: 선진_통합본.xlsx)의 첫 토큰과 기업 폴더명/CCName을 비교해 해당 기업 폴더 목록 반환
+
+    - 토큰이 폴더명에 포함되거나 폴더명이 토큰에 포함되면 매칭 (선진 → 선진, 선진팜, 선진에프에스 ...)
+    - 폴더명으로 못 찾으면 그 폴더 레코드의 CCName으로 비교
+    - 매칭되는 기업이 없으면 None (전체 데이터 사용)
+    """
+    token = re.split(r'[_\s]', excel_path.stem.strip())[0]
+    if not token:
+        return None
+    matched = [
+        company for company, cc_names in companies.items()
+        if (company and (token in company or company in token))
+        or any(token in name or name in token for name in cc_names)
+    ]
+    return matched or None
+
+
 def find_excel_key_column(df: pd.DataFrame) -> Optional[str]:
     """엑셀 DataFrame에서 키 컬럼 찾기 (NO., 관리 번호 등)"""
     candidates = [
@@ -118,54 +282,79 @@ def find_column(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
     return None
 
 
+def select_sheet(sheet_names: List[str]) -> str:
+    """CLM등록 시트 찾기 (없으면 첫 번째 시트)"""
+    for name in sheet_names:
+        if '등록' in name or 'CLM' in name.upper():
+            return name
+    return sheet_names[0]
+
+
+def find_summary_columns(df: pd.DataFrame) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """기존 방식 비교에 쓰는 (계약명, 진행상태, 담당자) 컬럼"""
+    contract_name_col = find_column(df, [
+        "계약명", "계약 명", "계약이름", "계약 이름",
+        "ContractName", "contract name", "계약서명"
+    ])
+    status_col = find_column(df, [
+        "진행 상태", "진행상태", "상태", "진행 상태 ", "Status",
+        "계약단계", "계약 단계"
+    ])
+    manager_col = find_column(df, [
+        "담당자 이름", "담당자", "담당자명", "담당자 이름 ",
+        "ManagerUserName", "manager", "담당자 이메일"
+    ])
+    return contract_name_col, status_col, manager_col
+
+
 def compare_excel_with_json(
     excel_path: Path,
     json_data_map: Dict[str, Dict[str, Any]],
-    output_path: Path
-) -> None:
-    """엑셀 파일과 JSON 데이터를 비교하여 결과를 저장"""
+    output_path: Path,
+    match_index: Optional[MatchIndex] = None,
+    sidecar: Optional[str] = None,
+    row_cache_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """엑셀 파일과 JSON 데이터를 비교하여 결과를 저장
+
+    match_index: 여러 엑셀 파일에서 재사용할 보조 색인 (없으면 이 파일용으로 생성)
+    sidecar: 'csv' / 'parquet' 이면 시트별 사이드카 파일도 저장
+    row_cache_path: 행 지문 캐시 파일 (row_cache.py) - 주면 지난 실행 이후 바뀐 행만 다시 비교
+    반환: 전체 요약 시트에 들어갈 파일별 요약 (시트별 불일치 건수, 결과 파일명, 상태)
+    """
     print(f"\n[처리 시작] {excel_path.name}")
+    if match_index is None:
+        match_index = MatchIndex(json_data_map)
+    summary: Dict[str, Any] = {'파일': excel_path.name, '시트': '', '엑셀_행수': 0}
+    summary.update({name: 0 for name in SHEET_NAMES})
+    summary.update({'결과파일': '', '상태': ''})
     
     try:
-        # 엑셀 파일 읽기
-        xls = pd.ExcelFile(excel_path)
-        print(f"  시트 목록: {xls.sheet_names}")
+        # 엑셀 파일 읽기 (모든 시트를 한 번에 파싱, 내용이 같으면 캐시에서 로드)
+        sheets = read_workbook(excel_path)
+        sheet_names = list(sheets)
+        print(f"  시트 목록: {sheet_names}")
         
         # CLM등록 시트 찾기 (없으면 첫 번째 시트 사용)
-        sheet_name = None
-        for name in xls.sheet_names:
-            if '등록' in name or 'CLM' in name.upper():
-                sheet_name = name
-                break
-        
-        if sheet_name is None:
-            sheet_name = xls.sheet_names[0]
+        sheet_name = select_sheet(sheet_names)
         
         print(f"  사용할 시트: {sheet_name}")
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        df = sheets[sheet_name]
         print(f"  엑셀 행 수: {len(df)}")
+        summary['시트'] = sheet_name
+        summary['엑셀_행수'] = len(df)
         
         # 키 컬럼 찾기
         key_col = find_excel_key_column(df)
         if key_col is None:
             print(f"  경고: 키 컬럼을 찾을 수 없습니다. 컬럼: {list(df.columns)[:10]}")
-            return
+            summary['상태'] = '키 컬럼 없음'
+            return summary
         
         print(f"  키 컬럼: {key_col}")
         
-        # 비교할 컬럼 찾기 (더 많은 후보 추가)
-        contract_name_col = find_column(df, [
-            "계약명", "계약 명", "계약이름", "계약 이름",
-            "ContractName", "contract name", "계약서명"
-        ])
-        status_col = find_column(df, [
-            "진행 상태", "진행상태", "상태", "진행 상태 ", "Status",
-            "계약단계", "계약 단계"
-        ])
-        manager_col = find_column(df, [
-            "담당자 이름", "담당자", "담당자명", "담당자 이름 ",
-            "ManagerUserName", "manager", "담당자 이메일"
-        ])
+        # 비교할 컬럼 찾기 (계약명/진행상태/담당자)
+        contract_name_col, status_col, manager_col = find_summary_columns(df)
         
         # 찾은 컬럼 출력
         print(f"  계약명 컬럼: {contract_name_col if contract_name_col else '없음'}")
@@ -197,392 +386,51 @@ def compare_excel_with_json(
                         print(f"      담당자 - 엑셀: '{excel_manager}' | JSON: '{json_manager}' | 일치: {excel_manager == json_manager}")
                         break
         
-        # 불일치 결과 저장 리스트
-        management_mismatch = []
-        contract_mismatch = []
-        status_mismatch = []
-        manager_mismatch = []
-        not_found = []
-        overall_mismatch = []
-        all_fields_mismatch = []  # 모든 필드 불일치
+        # 컬럼 → JSON 필드 대응은 헤더로 정해지므로 워크북당 한 번만 계산
+        plan = ComparisonPlan(list(df.columns), key_col)
         
-        # 각 행 비교
-        for index, row in df.iterrows():
-            excel_key = str(row[key_col]).strip() if pd.notna(row[key_col]) else ""
-            
-            if not excel_key:
-                continue
-            
-            # JSON 데이터에서 매칭 찾기 (SignedContractUUID로 먼저 시도)
-            json_data = json_data_map.get(excel_key)
-            
-            if json_data is None:
-                # UUID 형식이 아닌 경우 ManageNo로도 시도
-                for key, data in json_data_map.items():
-                    if data.get('ManageNo') == excel_key:
-                        json_data = data
-                        break
-            
-            if json_data is None:
-                # 정확 매칭 실패 시 Fuzzy 매칭으로 가장 유사한 것 찾기
-                best_match = None
-                best_score = 0
-                best_key = None
-                
-                for json_key, json_val in json_data_map.items():
-                    score = fuzz.ratio(excel_key, json_key)
-                    if score > best_score:
-                        best_score = score
-                        best_match = json_val
-                        best_key = json_key
-                
-                if best_score >= 80:  # 80% 이상 유사하면 매칭
-                    json_data = best_match
-                    excel_key = best_key
-                else:
-                    not_found.append({
-                        '엑셀_관리번호': excel_key,
-                        '계약명': row[contract_name_col] if contract_name_col and pd.notna(row.get(contract_name_col)) else '',
-                        '진행_상태': row[status_col] if status_col and pd.notna(row.get(status_col)) else '',
-                        '담당자': row[manager_col] if manager_col and pd.notna(row.get(manager_col)) else '',
-                    })
-                    continue
-            
-            # 엑셀과 JSON 필드 매핑 정의
-            field_mappings = {
-                # 엑셀 컬럼명: [JSON 필드명 후보들]
-                '계약명': ['ContractName'],
-                '계약 명': ['ContractName'],
-                '진행 상태': ['StatusName'],
-                '진행상태': ['StatusName'],
-                '상태': ['StatusName'],
-                '담당자 이름': ['ManagerUserName'],
-                '담당자': ['ManagerUserName'],
-                '담당자명': ['ManagerUserName'],
-                '검토 요청자': ['ManagerUserName'],
-                '검토요청자': ['ManagerUserName'],
-                '계약 시작일': ['ContractStartDate'],
-                '계약 완료일': ['ContractEndDate'],
-                '계약 종료': ['ContractEndDate'],
-                '계약 체결일': ['SignedDate'],
-                '계약예정일': ['SignedDate'],
-                '계약 규모': ['ContractAmountList'],
-                '통화': ['CurrencyCode'],
-                '상대 계약자': ['SignedContractPartnerInfoList'],
-                '상대계약자': ['SignedContractPartnerInfoList'],
-                '대분류': ['MainContractTypeCode'],
-                '대분류_카테고리이름': ['MainContractTypeName'],
-                '분류': ['ContractClassCode'],
-                '분류_카테고리이름': ['ContractClassName'],
-                # 새로 확인된 매핑
-                '계열사명': ['CCName'],
-                '관리 번호': ['ManageNo'],  # ManageName이 아니라 ManageNo인 것으로 확인
-                '관리번호': ['ManageNo'],
-                '개정번호': ['Revision'],
-                '수정일': ['UpdateDate'],
-                '담당자 이메일': ['ManagerUserEmail'],
-                '담당자 휴대폰 번호': ['ManagerUserPhoneNumber'],
-                '담당자 휴대폰': ['ManagerUserPhoneNumber'],
-                '담당자 휴대폰번호': ['ManagerUserPhoneNumber'],
-                '담당자 퇴사여부': ['ManagerUserIsActive'],
-                '담당자 퇴사': ['ManagerUserIsActive'],
-            }
-            
-            # 모든 엑셀 컬럼과 JSON 필드 비교
-            all_mismatches = []
-            base_data = {
-                '엑셀_관리번호': excel_key,
-                'JSON_관리번호': json_data.get('ManageNo', ''),
-                'JSON_SignedContractUUID': json_data.get('SignedContractUUID', ''),
-            }
-            
-            # 엑셀의 모든 컬럼에 대해 비교
-            for excel_col in df.columns:
-                if excel_col == key_col:  # 키 컬럼은 제외
-                    continue
-                
-                excel_val_raw = row[excel_col] if pd.notna(row[excel_col]) else ''
-                excel_val = normalize_value(excel_val_raw)
-                
-                # JSON 필드 찾기 (매핑 테이블 사용)
-                json_field = None
-                json_val = None
-                json_val_raw = None
-                
-                # 매핑 테이블에서 찾기
-                excel_col_normalized = str(excel_col).strip()
-                if excel_col_normalized in field_mappings:
-                    for json_field_candidate in field_mappings[excel_col_normalized]:
-                        if json_field_candidate in json_data:
-                            json_field = json_field_candidate
-                            json_val_raw = json_data[json_field_candidate]
-                            # 리스트나 딕셔너리는 문자열로 변환
-                            if isinstance(json_val_raw, (list, dict)):
-                                json_val = str(json_val_raw)
-                            else:
-                                json_val = normalize_value(json_val_raw)
-                            break
-                
-                # 매핑 테이블에 없으면 컬럼명과 유사한 JSON 필드 찾기
-                if json_val is None:
-                    # 컬럼명을 정규화하여 JSON 필드명과 매칭 시도
-                    col_normalized = str(excel_col).strip().lower().replace(" ", "").replace("_", "")
-                    for json_key in json_data.keys():
-                        json_key_normalized = str(json_key).lower().replace(" ", "").replace("_", "")
-                        if col_normalized in json_key_normalized or json_key_normalized in col_normalized:
-                            if len(col_normalized) >= 3:  # 최소 3글자 이상
-                                json_field = json_key
-                                json_val_raw = json_data[json_key]
-                                if isinstance(json_val_raw, (list, dict)):
-                                    json_val = str(json_val_raw)
-                                else:
-                                    json_val = normalize_value(json_val_raw)
-                                break
-                
-                # 값 비교 (빈 값도 포함하여 비교)
-                is_match = False
-                similarity = 100
-                mismatch_reason = ''
-                
-                if json_val is not None:
-                    # 둘 다 빈 값이면 일치
-                    if not excel_val and not json_val:
-                        is_match = True
-                    # 둘 다 값이 있으면 비교
-                    elif excel_val and json_val:
-                        if excel_val == json_val:
-                            is_match = True
-                        else:
-                            similarity = fuzz.ratio(excel_val, json_val)
-                            if similarity >= 95:
-                                is_match = True  # 95% 이상이면 일치로 간주
-                            else:
-                                mismatch_reason = '값 불일치'
-                    # 한쪽만 값이 있으면 불일치
-                    else:
-                        mismatch_reason = '한쪽 값만 존재'
-                        similarity = 0
-                elif excel_val:  # JSON에 해당 필드가 없는 경우
-                    mismatch_reason = 'JSON에 해당 필드 없음'
-                    similarity = 0
-                elif json_val:  # 엑셀에 값이 없지만 JSON에는 있는 경우
-                    mismatch_reason = '엑셀에 해당 필드 없음'
-                    similarity = 0
-                else:
-                    # 둘 다 없으면 일치로 간주
-                    is_match = True
-                
-                # 불일치인 경우에만 기록
-                if not is_match:
-                    all_mismatches.append({
-                        '엑셀_컬럼명': excel_col,
-                        '엑셀_값': excel_val if excel_val else '(없음)',
-                        '엑셀_원본값': str(excel_val_raw) if excel_val_raw else '(없음)',
-                        'JSON_필드명': json_field if json_field else '(매칭 실패)',
-                        'JSON_값': json_val if json_val else '(없음)',
-                        'JSON_원본값': str(json_val_raw) if json_val_raw is not None else '(없음)',
-                        '유사성_점수': similarity,
-                        '비고': mismatch_reason,
-                    })
-            
-            # 기존 방식 유지 (계약명, 진행상태, 담당자)
-            json_contract_name = ''
-            if json_data.get('ContractName'):
-                json_contract_name = normalize_value(json_data.get('ContractName'))
-            elif json_data.get('CCName'):
-                json_contract_name = normalize_value(json_data.get('CCName'))
-            
-            json_status = normalize_value(json_data.get('StatusName', ''))
-            json_manager = normalize_value(json_data.get('ManagerUserName', ''))
-            
-            excel_contract = ''
-            excel_status = ''
-            excel_manager = ''
-            
-            if contract_name_col and pd.notna(row.get(contract_name_col)):
-                excel_contract = normalize_value(row[contract_name_col])
-            if status_col and pd.notna(row.get(status_col)):
-                excel_status = normalize_value(row[status_col])
-            if manager_col and pd.notna(row.get(manager_col)):
-                excel_manager = normalize_value(row[manager_col])
-            
-            # base_data에 기존 필드 추가
-            base_data.update({
-                '엑셀_계약명': excel_contract,
-                '엑셀_진행상태': excel_status,
-                '엑셀_담당자': excel_manager,
-                'JSON_계약명': json_contract_name,
-                'JSON_진행상태': json_status,
-                'JSON_담당자': json_manager,
-            })
-            
-            # 관리번호 비교 (이미 매칭되었으므로 100%여야 함)
-            if base_data['엑셀_관리번호'] != base_data['JSON_관리번호']:
-                management_mismatch.append({
-                    **base_data,
-                    '유사성_점수': fuzz.ratio(base_data['엑셀_관리번호'], base_data['JSON_관리번호'])
-                })
-            
-            # 계약명 비교 (둘 다 값이 있을 때만)
-            if excel_contract and json_contract_name:
-                # 정확히 같으면 일치로 처리
-                if excel_contract == json_contract_name:
-                    pass  # 일치, 불일치 리스트에 추가하지 않음
-                else:
-                    similarity = fuzz.ratio(excel_contract, json_contract_name)
-                    # 95% 이상이면 실질적으로 일치로 간주 (공백, 특수문자 차이 등)
-                    if similarity < 95:
-                        contract_mismatch.append({
-                            **base_data,
-                            '유사성_점수': similarity,
-                            '엑셀_원본값': str(row[contract_name_col]) if contract_name_col and pd.notna(row.get(contract_name_col)) else '',
-                            'JSON_원본값': str(json_data.get('ContractName') or json_data.get('CCName', ''))
-                        })
-            elif excel_contract or json_contract_name:
-                # 한쪽만 값이 있는 경우도 불일치로 기록
-                contract_mismatch.append({
-                    **base_data,
-                    '유사성_점수': 0,
-                    '비고': '한쪽 값만 존재'
-                })
-            
-            # 진행상태 비교 (둘 다 값이 있을 때만)
-            if excel_status and json_status:
-                # 정확히 같으면 일치로 처리
-                if excel_status == json_status:
-                    pass  # 일치, 불일치 리스트에 추가하지 않음
-                else:
-                    similarity = fuzz.ratio(excel_status, json_status)
-                    # 95% 이상이면 실질적으로 일치로 간주 (공백 차이 등)
-                    if similarity < 95:
-                        status_mismatch.append({
-                            **base_data,
-                            '유사성_점수': similarity,
-                            '엑셀_원본값': str(row[status_col]) if status_col and pd.notna(row.get(status_col)) else '',
-                            'JSON_원본값': str(json_data.get('StatusName', ''))
-                        })
-            elif excel_status or json_status:
-                # 한쪽만 값이 있는 경우도 불일치로 기록
-                status_mismatch.append({
-                    **base_data,
-                    '유사성_점수': 0,
-                    '비고': '한쪽 값만 존재'
-                })
-            
-            # 담당자 비교 (둘 다 값이 있을 때만)
-            if excel_manager and json_manager:
-                # 정확히 같으면 일치로 처리
-                if excel_manager == json_manager:
-                    pass  # 일치, 불일치 리스트에 추가하지 않음
-                else:
-                    similarity = fuzz.ratio(excel_manager, json_manager)
-                    # 95% 이상이면 실질적으로 일치로 간주 (공백 차이 등)
-                    if similarity < 95:
-                        manager_mismatch.append({
-                            **base_data,
-                            '유사성_점수': similarity,
-                            '엑셀_원본값': str(row[manager_col]) if manager_col and pd.notna(row.get(manager_col)) else '',
-                            'JSON_원본값': str(json_data.get('ManagerUserName', ''))
-                        })
-            elif excel_manager or json_manager:
-                # 한쪽만 값이 있는 경우도 불일치로 기록
-                manager_mismatch.append({
-                    **base_data,
-                    '유사성_점수': 0,
-                    '비고': '한쪽 값만 존재'
-                })
-            
-            # 종합 불일치 계산 (정규화된 값으로 비교)
-            contract_sim = 100
-            if excel_contract and json_contract_name:
-                if excel_contract == json_contract_name:
-                    contract_sim = 100  # 정확히 일치
-                else:
-                    contract_sim = fuzz.ratio(excel_contract, json_contract_name)
-                    if contract_sim >= 95:
-                        contract_sim = 100  # 95% 이상이면 일치로 간주
-            elif excel_contract or json_contract_name:
-                contract_sim = 0  # 한쪽만 값이 있으면 불일치
-            
-            status_sim = 100
-            if excel_status and json_status:
-                if excel_status == json_status:
-                    status_sim = 100  # 정확히 일치
-                else:
-                    status_sim = fuzz.ratio(excel_status, json_status)
-                    if status_sim >= 95:
-                        status_sim = 100  # 95% 이상이면 일치로 간주
-            elif excel_status or json_status:
-                status_sim = 0  # 한쪽만 값이 있으면 불일치
-            
-            manager_sim = 100
-            if excel_manager and json_manager:
-                if excel_manager == json_manager:
-                    manager_sim = 100  # 정확히 일치
-                else:
-                    manager_sim = fuzz.ratio(excel_manager, json_manager)
-                    if manager_sim >= 95:
-                        manager_sim = 100  # 95% 이상이면 일치로 간주
-            elif excel_manager or json_manager:
-                manager_sim = 0  # 한쪽만 값이 있으면 불일치
-            
-            overall_score = (contract_sim * 0.5 + status_sim * 0.3 + manager_sim * 0.2)
-            
-            if overall_score < 100:
-                overall_mismatch.append({
-                    **base_data,
-                    '종합_유사성_점수': round(overall_score, 2),
-                    '계약명_유사성': contract_sim,
-                    '진행상태_유사성': status_sim,
-                    '담당자_유사성': manager_sim,
-                })
-            
-            # 모든 필드 불일치 추가
-            if all_mismatches:
-                for mismatch in all_mismatches:
-                    all_fields_mismatch.append({
-                        **base_data,
-                        **mismatch,
-                    })
-            
-            # 첫 번째 행에서만 디버깅 정보 출력
-            if index == df.index[0]:
-                print(f"\n  [디버깅] 첫 번째 행의 모든 컬럼 비교 결과:")
-                print(f"    - 총 비교한 컬럼 수: {len([c for c in df.columns if c != key_col])}개")
-                print(f"    - 불일치한 컬럼 수: {len(all_mismatches)}개")
-                if all_mismatches:
-                    print(f"    - 불일치 컬럼 목록 (전체):")
-                    for mismatch in all_mismatches:
-                        print(f"      • {mismatch['엑셀_컬럼명']}: {mismatch['비고']}")
+        # 컬럼 단위 벡터화 비교 (column_compare), 행 지문 캐시가 있으면 바뀐 행만 비교
+        if row_cache_path is None:
+            results, first_row_mismatches = compare_frame(
+                df, key_col, contract_name_col, status_col, manager_col, plan, match_index
+            )
+        else:
+            with RowCache(row_cache_path) as row_cache:
+                results, first_row_mismatches = compare_incremental(
+                    row_cache, excel_path.name, df, key_col, contract_name_col, status_col, manager_col, plan,
+                    match_index
+                )
+        management_mismatch = results['관리번호_불일치']
+        contract_mismatch = results['계약명_불일치']
+        status_mismatch = results['진행상태_불일치']
+        manager_mismatch = results['담당자_불일치']
+        not_found = results['JSON_매칭_실패']
+        overall_mismatch = results['종합_불일치']
+        all_fields_mismatch = results['전체필드_불일치']
         
-        # 결과를 DataFrame으로 변환 (불일치 항목만 저장)
-        result_dfs = {}
+        # 첫 번째 행에서만 디버깅 정보 출력
+        if first_row_mismatches is not None:
+            print(f"\n  [디버깅] 첫 번째 행의 모든 컬럼 비교 결과:")
+            print(f"    - 총 비교한 컬럼 수: {len(plan.columns)}개")
+            print(f"    - 불일치한 컬럼 수: {len(first_row_mismatches)}개")
+            if first_row_mismatches:
+                print(f"    - 불일치 컬럼 목록 (전체):")
+                for mismatch in first_row_mismatches:
+                    print(f"      • {mismatch['엑셀_컬럼명']}: {mismatch['비고']}")
         
-        # 불일치 항목이 있는 경우에만 시트 생성
-        if management_mismatch:
-            result_dfs['관리번호_불일치'] = pd.DataFrame(management_mismatch)
-        if contract_mismatch:
-            result_dfs['계약명_불일치'] = pd.DataFrame(contract_mismatch)
-        if status_mismatch:
-            result_dfs['진행상태_불일치'] = pd.DataFrame(status_mismatch)
-        if manager_mismatch:
-            result_dfs['담당자_불일치'] = pd.DataFrame(manager_mismatch)
-        if not_found:
-            result_dfs['JSON_매칭_실패'] = pd.DataFrame(not_found)
-        if overall_mismatch:
-            result_dfs['종합_불일치'] = pd.DataFrame(overall_mismatch)
-        if all_fields_mismatch:
-            result_dfs['전체필드_불일치'] = pd.DataFrame(all_fields_mismatch)
+        summary.update({name: len(rows) for name, rows in results.items()})
         
-        # 불일치 항목이 있는 경우에만 결과 파일 저장
-        if result_dfs:
+        # 불일치 항목이 있는 경우에만 결과 파일 저장 (DataFrame 없이 행 단위로 기록, 비어 있는 시트는 생략)
+        if any(results.values()):
             output_file = output_path / f"{excel_path.stem}_비교결과.xlsx"
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                for sheet_name, df_result in result_dfs.items():
-                    # 불일치 항목만 포함된 DataFrame 저장
-                    df_result.to_excel(writer, sheet_name=sheet_name, index=False)
+            with ReportWriter(output_file, sidecar=sidecar) as writer:
+                for sheet_name, rows in results.items():
+                    if rows:
+                        writer.write_rows(sheet_name, rows)
             
             print(f"  [완료] 불일치 항목만 저장: {output_file.name}")
+            summary['결과파일'] = output_file.name
+            summary['상태'] = '불일치 있음'
             print(f"    - 관리번호 불일치: {len(management_mismatch)}개")
             print(f"    - 계약명 불일치: {len(contract_mismatch)}개")
             print(f"    - 진행상태 불일치: {len(status_mismatch)}개")
@@ -592,15 +440,205 @@ def compare_excel_with_json(
             print(f"    - 전체 필드 불일치: {len(all_fields_mismatch)}개")
         else:
             print(f"  [완료] 모든 데이터가 일치합니다! 결과 파일을 생성하지 않습니다.")
+            summary['상태'] = '전체 일치'
     
     except Exception as e:
         print(f"  [오류] {excel_path.name} 처리 실패: {e}")
         import traceback
         traceback.print_exc()
+        summary['상태'] = f'오류: {e}'
+    
+    return summary
+
+
+# 비교 작업(순차/병렬 워커 공통) 설정과, 필요할 때만 만드는 전체 JSON 데이터/보조 색인
+# - fork: 부모가 풀 생성 전에 채워 둔 전체 데이터를 copy-on-write로 그대로 사용 (다시 읽지 않음)
+# - spawn(Windows/macOS): 처음 필요할 때 워커에서 한 번 로드 (색인 사용 시 재파싱 없이 SQLite에서 읽음)
+_worker_raw_data_dir: Optional[Path] = None
+_worker_use_index: bool = True
+_worker_sidecar: Optional[str] = None
+_worker_row_cache: Optional[Path] = None
+_shared_json_data_map: Optional[Dict[str, Dict[str, Any]]] = None
+_shared_match_index: Optional[MatchIndex] = None
+
+
+def _init_worker(raw_data_dir: Path, use_index: bool, sidecar: Optional[str] = None,
+                 row_cache: Optional[Path] = None) -> None:
+    global _worker_raw_data_dir, _worker_use_index, _worker_sidecar, _worker_row_cache
+    _worker_raw_data_dir, _worker_use_index, _worker_sidecar = raw_data_dir, use_index, sidecar
+    _worker_row_cache = row_cache
+
+
+def _full_data() -> Tuple[Dict[str, Dict[str, Any]], MatchIndex]:
+    global _shared_json_data_map, _shared_match_index
+    if _shared_match_index is None:
+        _shared_json_data_map = load_json_data(_worker_raw_data_dir, _worker_use_index, refresh=False)
+        _shared_match_index = MatchIndex(_shared_json_data_map)
+    return _shared_json_data_map, _shared_match_index
+
+
+def _compare_in_worker(excel_path: Path, output_path: Path, companies: Optional[List[str]]) -> Dict[str, Any]:
+    """companies가 있으면 해당 기업 파티션만 로드해 비교, None이면 전체 데이터와 비교"""
+    if companies is None:
+        json_data_map, match_index = _full_data()
+    else:
+        json_data_map = load_json_data(_worker_raw_data_dir, _worker_use_index, companies=companies, refresh=False)
+        match_index = MatchIndex(json_data_map)
+    return compare_excel_with_json(excel_path, json_data_map, output_path, match_index, _worker_sidecar,
+                                   _worker_row_cache)
+
+
+def compare_workbooks(
+    xlsx_files: List[Path],
+    partitions: Dict[Path, Optional[List[str]]],
+    output_path: Path,
+    raw_data_dir: Path,
+    use_index: bool,
+    workers: int = 1,
+    sidecar: Optional[str] = None,
+    row_cache: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """엑셀 파일들을 비교 (workers > 1 이면 프로세스 풀에서 동시에, 결과 파일은 각 워커가 저장)
+
+    partitions: 파일 → 비교할 기업 폴더 목록 (None이면 전체 데이터)
+    row_cache: 행 지문 캐시 파일 (None이면 모든 행 비교)
+    병렬 모드는 큰 파일부터 제출해 가장 큰 파일이 마지막에 혼자 남지 않도록 함
+    반환: xlsx_files 순서의 파일별 요약
+    """
+    global _shared_json_data_map, _shared_match_index
+    _init_worker(raw_data_dir, use_index, sidecar, row_cache=row_cache)
+    
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+    needs_full = any(partitions[path] is None for path in xlsx_files)
+    summaries: Dict[Path, Dict[str, Any]] = {}
+    try:
+        # 전체 데이터가 필요한 파일이 있으면 부모에서 한 번만 로드해 공유
+        if needs_full and (workers <= 1 or fork):
+            _full_data()
+        
+        if workers <= 1:
+            for path in xlsx_files:
+                summaries[path] = _compare_in_worker(path, output_path, partitions[path])
+            return [summaries[path] for path in xlsx_files]
+        
+        mp_context = multiprocessing.get_context('fork') if fork else multiprocessing.get_context()
+        ordered = sorted(xlsx_files, key=lambda path: path.stat().st_size, reverse=True)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_worker,
+                                 initargs=(raw_data_dir, use_index, sidecar, row_cache)) as executor:
+            futures = {
+                executor.submit(_compare_in_worker, path, output_path, partitions[path]): path
+                for path in ordered
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    summaries[path] = future.result()
+                except Exception as e:
+                    # 워커 프로세스 자체가 죽은 경우 (compare_excel_with_json 내부 오류는 요약에 기록됨)
+                    print(f"  [오류] {path.name} 워커 실패: {e}")
+                    summaries[path] = {'파일': path.name, '상태': f'워커 오류: {e}'}
+                print(f"  [진행] {len(summaries)}/{len(xlsx_files)} 완료 - {path.name}")
+    finally:
+        _shared_json_data_map, _shared_match_index = None, None
+    
+    return [summaries[path] for path in xlsx_files]
+
+
+def write_summary(summaries: List[Dict[str, Any]], output_path: Path) -> Path:
+    """파일별 요약을 한 시트로 모은 전체 요약 파일 저장 (합계 행 포함)"""
+    summary_df = pd.DataFrame(summaries)
+    count_columns = [name for name in ['엑셀_행수', *SHEET_NAMES] if name in summary_df.columns]
+    total = {'파일': '합계', **summary_df[count_columns].fillna(0).sum().astype(int).to_dict()}
+    summary_df = pd.concat([summary_df, pd.DataFrame([total])], ignore_index=True)
+    
+    summary_file = output_path / SUMMARY_FILENAME
+    summary_df.to_excel(summary_file, sheet_name='요약', index=False)
+    print(f"\n[전체 요약] {summary_file.name} 저장 ({len(summaries)}개 파일)")
+    for name in SHEET_NAMES:
+        print(f"    - {name}: {total.get(name, 0)}개")
+    return summary_file
+
+
+def sample_excel_with_json(
+    excel_path: Path,
+    match_index: MatchIndex,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+) -> List[Dict[str, Any]]:
+    """엑셀 파일을 기업 × 진행상태 층별 표본만 비교해 항목별 불일치율 추정 (결과 파일은 만들지 않음)
+
+    반환: 표본 점검 요약 파일에 들어갈 항목별 행
+    """
+    print(f"\n[표본 점검] {excel_path.name}")
+    try:
+        sheets = read_workbook(excel_path)
+        sheet_name = select_sheet(list(sheets))
+        df = sheets[sheet_name]
+        key_col = find_excel_key_column(df)
+        if key_col is None:
+            print(f"  ⚠ 키 컬럼을 찾을 수 없습니다. 컬럼: {list(df.columns)[:10]}")
+            return [{'파일': excel_path.name, '시트': sheet_name, '항목': '키 컬럼 없음'}]
+        contract_name_col, status_col, manager_col = find_summary_columns(df)
+        company_col = find_column(df, ["계열사명", "계열사", "회사명"])
+        plan = ComparisonPlan(list(df.columns), key_col)
+        report = sample_frame(df, key_col, contract_name_col, status_col, manager_col, company_col, plan,
+                              match_index, per_stratum=per_stratum)
+    except Exception as e:
+        print(f"  [오류] {excel_path.name} 표본 점검 실패: {e}")
+        return [{'파일': excel_path.name, '항목': f'오류: {e}'}]
+    print(report.explain())
+    return [{'파일': excel_path.name, '시트': sheet_name, **record} for record in report.records()]
+
+
+def sample_workbooks(
+    xlsx_files: List[Path],
+    partitions: Dict[Path, Optional[List[str]]],
+    output_path: Path,
+    raw_data_dir: Path,
+    use_index: bool,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+) -> Path:
+    """전체 비교 전 점검: 파일마다 표본만 비교하고 결과를 표본 점검 요약 파일 하나로 저장"""
+    global _shared_json_data_map, _shared_match_index
+    _init_worker(raw_data_dir, use_index)
+    records: List[Dict[str, Any]] = []
+    try:
+        for path in xlsx_files:
+            companies = partitions[path]
+            if companies is None:
+                _, match_index = _full_data()
+            else:
+                match_index = MatchIndex(load_json_data(raw_data_dir, use_index, companies=companies, refresh=False))
+            records.extend(sample_excel_with_json(path, match_index, per_stratum))
+    finally:
+        _shared_json_data_map, _shared_match_index = None, None
+    
+    summary_file = output_path / SAMPLE_SUMMARY_FILENAME
+    pd.DataFrame(records).to_excel(summary_file, sheet_name='표본점검', index=False)
+    flagged = sum(1 for record in records if record.get('판정'))
+    print(f"\n[표본 점검 요약] {summary_file.name} 저장 ({len(xlsx_files)}개 파일, 체계적 문제 의심 {flagged}건)")
+    return summary_file
 
 
 def main(argv: List[str]) -> None:
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="통합본 엑셀 vs raw_data JSON 비교")
+    parser.add_argument("--no-index", action="store_true",
+                        help="SQLite 색인을 쓰지 않고 모든 selectDetail.json을 직접 읽음")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="동시에 비교할 엑셀 파일 수 (프로세스 수, 0이면 CPU 코어 수, 기본 1 = 순차)")
+    parser.add_argument("--no-partition", action="store_true",
+                        help="기업별로 나누지 않고 모든 엑셀 파일을 전체 JSON 데이터와 비교")
+    parser.add_argument("--sidecar", choices=SIDECAR_FORMATS,
+                        help="결과 시트별 CSV/Parquet 파일도 함께 저장")
+    parser.add_argument("--no-row-cache", action="store_true",
+                        help=f"지난 실행 결과를 쓰지 않고 모든 행을 다시 비교 (기본: 비교결과/{ROW_CACHE_FILENAME}에 "
+                             "행 지문을 저장해 바뀐 행만 비교)")
+    parser.add_argument("--sample", type=int, nargs="?", const=DEFAULT_PER_STRATUM, metavar="N",
+                        help=f"전체 비교 전 점검: 기업 × 진행상태 층마다 N행(기본 {DEFAULT_PER_STRATUM})만 비교해 "
+                             "항목별 불일치율(95%% 신뢰구간)과 체계적 매핑 문제만 출력 (결과 파일 대신 표본 점검 요약 저장)")
+    args = parser.parse_args(argv[1:])
+    
     # 경로 설정
     script_dir = Path(__file__).parent
     tonghab_dir = script_dir / "통합본"
@@ -619,10 +657,15 @@ def main(argv: List[str]) -> None:
         print(f"오류: raw_data 폴더를 찾을 수 없습니다: {raw_data_dir}")
         return
     
-    # JSON 데이터 로드
-    json_data_map = load_json_data(raw_data_dir)
+    # JSON 색인은 여기서 한 번만 갱신하고, 이후 로드는 갱신 없이 읽기만 함
+    use_index = not args.no_index
+    if use_index:
+        print(f"[JSON 색인] {raw_data_dir} 색인 갱신 중...")
+        with JsonIndexStore(raw_data_dir) as store:
+            store.refresh()
     
-    if not json_data_map:
+    companies = list_companies(raw_data_dir, use_index)
+    if not companies:
         print("오류: JSON 데이터를 찾을 수 없습니다.")
         return
     
@@ -634,9 +677,31 @@ def main(argv: List[str]) -> None:
         print("오류: 엑셀 파일을 찾을 수 없습니다.")
         return
     
-    # 각 엑셀 파일 처리
+    # 통합본 파일 ↔ 기업 파티션 (파일명 첫 토큰과 raw_data/<기업명> 폴더명/CCName 비교)
+    partitions: Dict[Path, Optional[List[str]]] = {}
     for excel_file in xlsx_files:
-        compare_excel_with_json(excel_file, json_data_map, output_dir)
+        matched = None if args.no_partition else match_workbook_companies(excel_file, companies)
+        partitions[excel_file] = matched
+        if matched:
+            print(f"  {excel_file.name} → 기업 폴더: {', '.join(matched)}")
+        elif not args.no_partition:
+            print(f"  ⚠ {excel_file.name}: 일치하는 기업 폴더가 없어 전체 JSON 데이터와 비교합니다.")
+    
+    if args.sample is not None:
+        sample_workbooks(xlsx_files, partitions, output_dir, raw_data_dir, use_index, max(1, args.sample))
+        return
+    
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    workers = min(workers, len(xlsx_files))
+    
+    # 각 엑셀 파일 처리 (전체 데이터와 비교하는 파일이 있으면 전체 데이터/보조 색인은 한 번만 만들어 재사용)
+    if workers > 1:
+        print(f"[병렬 모드] 워커 {workers}개로 {len(xlsx_files)}개 파일 비교")
+    row_cache = None if args.no_row_cache else output_dir / ROW_CACHE_FILENAME
+    summaries = compare_workbooks(xlsx_files, partitions, output_dir, raw_data_dir, use_index, workers,
+                                  args.sidecar, row_cache)
+    
+    write_summary(summaries, output_dir)
     
     print(f"\n[전체 완료] 모든 비교 작업이 완료되었습니다.")
     print(f"결과 파일은 {output_dir} 폴더에 저장되었습니다.")
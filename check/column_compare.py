@@ -0,0 +1,349 @@
+"""엑셀 행 ↔ JSON 레코드 비교를 컬럼 단위로 처리하는 벡터화 엔진.
+
+개요
+- 행마다 MatchIndex로 레코드를 찾은 뒤, 비교에 필요한 JSON 필드만 뽑아 엑셀 행 순서에 맞춘 DataFrame으로 펼침
+- 정규화(normalize_value와 같은 규칙)는 pandas 문자열 연산으로 컬럼 전체에 한 번에 적용
+- 정확히 같은 값은 등호 마스크 한 번으로 걸러내고, 남은 (둘 다 값이 있고 서로 다른) 쌍만 모아서 fuzz.ratio 채점
+  - rapidfuzz가 있으면 cpdist로 일괄 채점 (fuzzywuzzy와 같은 정수 점수로 반올림), 없으면 fuzzywuzzy로 순차 채점
+- 결과 dict 목록은 기존 행 단위 루프와 같은 행/컬럼 순서, 같은 키 구성으로 만들어 시트 내용이 바뀌지 않음
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+except Exception:  # pragma: no cover
+    rf_process = None  # type: ignore
+
+# 결과 시트 순서 (compare_excel_with_json 저장 순서와 동일)
+SHEET_NAMES = [
+    '관리번호_불일치', '계약명_불일치', '진행상태_불일치', '담당자_불일치',
+    'JSON_매칭_실패', '종합_불일치', '전체필드_불일치',
+]
+
+# 이 점수 이상이면 공백/특수문자 차이 정도로 보고 일치로 간주
+MATCH_SCORE = 95
+
+# 레코드에서 항상 꺼내 두는 필드 (기본 정보/계약명·진행상태·담당자 비교용)
+_BASE_FIELDS = ('ManageNo', 'SignedContractUUID', 'ContractName', 'CCName', 'StatusName', 'ManagerUserName')
+
+
+def _object_array(values) -> np.ndarray:
+    """리스트/딕셔너리 원소가 섞여 있어도 1차원 object 배열로 변환"""
+    return pd.Series(values, dtype=object).to_numpy()
+
+
+def normalize_array(values) -> np.ndarray:
+    """normalize_value 벡터화 버전: 결측 → '', 나머지는 str() 후 연속 공백류를 한 칸으로 합치고 양끝 제거"""
+    series = pd.Series(values, dtype=object)
+    present = series.notna().to_numpy()
+    result = np.full(len(series), '', dtype=object)
+    if present.any():
+        text = series[present].map(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+        result[present] = text.to_numpy()
+    return result
+
+
+def batch_ratio(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """문자열 쌍 배열의 fuzz.ratio (정수 점수)"""
+    if len(left) == 0:
+        return np.zeros(0, dtype=int)
+    if rf_process is not None:
+        scores = rf_process.cpdist(list(left), list(right), scorer=rf_fuzz.ratio, dtype=np.float64)
+        return np.rint(scores).astype(int)
+    return _fuzz_pairs(left, right)
+
+
+def _fuzz_pairs(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    return np.array([fuzz.ratio(a, b) for a, b in zip(left, right)], dtype=int)
+
+
+def _ratio_pairs(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """문자열끼리는 일괄 채점, 숫자 등 다른 타입이 섞인 쌍만 fuzzywuzzy로 개별 채점"""
+    is_text = np.fromiter((isinstance(a, str) and isinstance(b, str) for a, b in zip(left, right)),
+                          dtype=bool, count=len(left))
+    scores = np.zeros(len(left), dtype=int)
+    scores[is_text] = batch_ratio(left[is_text], right[is_text])
+    for i in np.flatnonzero(~is_text):
+        scores[i] = fuzz.ratio(left[i], right[i])
+    return scores
+
+
+def _json_text_array(raw: np.ndarray) -> np.ndarray:
+    """JSON 값 정규화: 리스트/딕셔너리는 str() 그대로, 나머지는 normalize_array"""
+    is_container = np.fromiter((isinstance(v, (list, dict)) for v in raw), dtype=bool, count=len(raw))
+    if not is_container.any():
+        return normalize_array(raw)
+    text = np.full(len(raw), '', dtype=object)
+    text[~is_container] = normalize_array(raw[~is_container])
+    text[is_container] = _object_array([str(v) for v in raw[is_container]])
+    return text
+
+
+def _compare_summary(excel_text: np.ndarray, json_text: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """계약명/진행상태/담당자 비교 → (불일치 여부, 한쪽만 값 존재 여부, 종합 점수용 유사도)"""
+    excel_has = excel_text != ''
+    json_has = json_text != ''
+    differ = excel_has & json_has & (excel_text != json_text)
+    similarity = np.full(len(excel_text), 100, dtype=int)
+    similarity[differ] = batch_ratio(excel_text[differ], json_text[differ])
+    low = differ & (similarity < MATCH_SCORE)
+    one_side = excel_has != json_has
+    similarity[differ & ~low] = 100
+    similarity[one_side] = 0
+    return low | one_side, one_side, similarity
+
+
+def match_rows(df: pd.DataFrame, key_col: Any, match_index, min_score: int = 80,
+               fuzzy_memo: Optional[Dict[str, Optional[str]]] = None
+               ) -> List[Optional[Tuple[Optional[Dict[str, Any]], str]]]:
+    """행마다 (매칭된 레코드 또는 None, 엑셀 관리번호) - 관리번호가 비어 있는 행은 None (비교 대상 아님)
+
+    fuzzy_memo: MatchIndex.lookup 참고 (row_cache가 지난 실행의 fuzzy 매칭 결과를 넘김)
+    """
+    key_raw = df[key_col].astype(object)
+    keys = np.where(pd.notna(key_raw.to_numpy()), key_raw.map(str).str.strip().to_numpy(), '')
+    matches: List[Optional[Tuple[Optional[Dict[str, Any]], str]]] = [None] * len(df)
+    for pos in np.flatnonzero(keys != ''):
+        # SignedContractUUID/ManageNo 키 → ManageNo 보조 색인 → n-gram 블로킹 Fuzzy (min_score 이상)
+        record, excel_key, _ = match_index.lookup(str(keys[pos]), min_score=min_score, fuzzy_memo=fuzzy_memo)
+        matches[pos] = (record, excel_key)
+    return matches
+
+
+def compare_rows(
+    df: pd.DataFrame,
+    matches: List[Optional[Tuple[Optional[Dict[str, Any]], str]]],
+    contract_name_col: Optional[Any],
+    status_col: Optional[Any],
+    manager_col: Optional[Any],
+    plan,
+    positions: Optional[List[int]] = None,
+) -> Dict[int, List[Tuple[str, Dict[str, Any]]]]:
+    """positions 행(기본: 전체)을 비교해 행 위치 → [(시트명, 결과 dict), ...] 반환
+
+    matches: match_rows 결과 (관리번호가 비어 있는 행은 결과에 넣지 않음)
+    행 하나의 결과는 시트 저장 순서대로 들어 있으므로, 행 위치 순으로 펼치면 시트별 순서가 compare_frame과 같음
+    """
+    outputs: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
+    values = df.astype(object)  # iterrows 와 같은 파이썬 객체 값
+
+    def excel_raw(col, positions=None) -> np.ndarray:
+        if col is None:
+            return np.full(len(df) if positions is None else len(positions), None, dtype=object)
+        column = values[col].to_numpy()
+        return column if positions is None else column[positions]
+
+    # 1. 매칭된 행만 모음 (매칭 실패 행은 바로 결과 기록)
+    rows: List[int] = []
+    records: List[Dict[str, Any]] = []
+    matched_keys: List[str] = []
+    contract_all, status_all, manager_all = excel_raw(contract_name_col), excel_raw(status_col), excel_raw(manager_col)
+    for pos in (range(len(df)) if positions is None else positions):
+        if matches[pos] is None:
+            continue
+        record, excel_key = matches[pos]
+        outputs[pos] = []
+        if record is None:
+            outputs[pos].append(('JSON_매칭_실패', {
+                '엑셀_관리번호': excel_key,
+                '계약명': contract_all[pos] if contract_name_col and pd.notna(contract_all[pos]) else '',
+                '진행_상태': status_all[pos] if status_col and pd.notna(status_all[pos]) else '',
+                '담당자': manager_all[pos] if manager_col and pd.notna(manager_all[pos]) else '',
+            }))
+            continue
+        rows.append(pos)
+        records.append(record)
+        matched_keys.append(excel_key)
+
+    n = len(rows)
+    if n == 0:
+        return outputs
+    rows_arr = np.array(rows, dtype=int)
+
+    # 2. 레코드 스키마별 컬럼 → 필드 대응, 필요한 필드만 엑셀 행 순서로 펼침
+    schema_of: Dict[int, int] = {}
+    field_rows: List[List[Optional[str]]] = []
+    schema_ids = np.empty(n, dtype=int)
+    for i, record in enumerate(records):
+        resolved = plan.resolve(record)
+        schema = schema_of.get(id(resolved))
+        if schema is None:
+            schema = schema_of[id(resolved)] = len(field_rows)
+            field_rows.append([field for _, field in resolved])
+        schema_ids[i] = schema
+    field_table = np.empty((len(field_rows), len(plan.columns)), dtype=object)
+    for schema, fields in enumerate(field_rows):
+        field_table[schema, :] = fields
+
+    needed = set(_BASE_FIELDS)
+    needed.update(field for fields in field_rows for field in fields if field is not None)
+    json_frame = pd.DataFrame(
+        {field: pd.Series([record.get(field, '') for record in records], dtype=object) for field in sorted(needed)}
+    )
+
+    # 3. 컬럼별 비교 (행 순서 × 컬럼 순서를 유지하기 위해 행마다 불일치 목록을 모음)
+    row_mismatches: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+    for j, excel_col in enumerate(plan.columns):
+        field_of_row = field_table[schema_ids, j]
+        has_field = pd.notna(field_of_row)
+
+        json_raw = np.full(n, None, dtype=object)
+        for field in pd.unique(field_of_row[has_field]):
+            same_field = field_of_row == field
+            json_raw[same_field] = json_frame[field].to_numpy()[same_field]
+        json_text = _json_text_array(json_raw)
+
+        raw = excel_raw(excel_col, rows_arr)
+        excel_text = normalize_array(raw)
+
+        excel_has = excel_text != ''
+        json_has = has_field & (json_text != '')
+        differ = excel_has & json_has & (excel_text != json_text)
+        similarity = np.full(n, 100, dtype=int)
+        similarity[differ] = batch_ratio(excel_text[differ], json_text[differ])
+        value_mismatch = differ & (similarity < MATCH_SCORE)
+        one_side = has_field & (excel_has != json_has)
+        no_field = ~has_field & excel_has
+        similarity[one_side | no_field] = 0
+
+        for i in np.flatnonzero(value_mismatch | one_side | no_field):
+            if value_mismatch[i]:
+                reason = '값 불일치'
+            elif one_side[i]:
+                reason = '한쪽 값만 존재'
+            else:
+                reason = 'JSON에 해당 필드 없음'
+            excel_value = raw[i]
+            row_mismatches[i].append({
+                '엑셀_컬럼명': excel_col,
+                '엑셀_값': excel_text[i] if excel_text[i] else '(없음)',
+                '엑셀_원본값': str(excel_value) if pd.notna(excel_value) and excel_value else '(없음)',
+                'JSON_필드명': field_of_row[i] if field_of_row[i] else '(매칭 실패)',
+                'JSON_값': json_text[i] if json_has[i] else '(없음)',
+                'JSON_원본값': str(json_raw[i]) if json_raw[i] is not None else '(없음)',
+                '유사성_점수': int(similarity[i]),
+                '비고': reason,
+            })
+
+    # 4. 기존 방식 비교 (관리번호, 계약명, 진행상태, 담당자, 종합)
+    manage_no = json_frame['ManageNo'].to_numpy()
+    uuid = json_frame['SignedContractUUID'].to_numpy()
+    contract_name = json_frame['ContractName'].to_numpy()
+    cc_name = json_frame['CCName'].to_numpy()
+    json_contract_raw = _object_array([a or b or '' for a, b in zip(contract_name, cc_name)])
+
+    excel_contract_raw = excel_raw(contract_name_col, rows_arr)
+    excel_status_raw = excel_raw(status_col, rows_arr)
+    excel_manager_raw = excel_raw(manager_col, rows_arr)
+    summary_text = {
+        '엑셀_계약명': normalize_array(excel_contract_raw),
+        '엑셀_진행상태': normalize_array(excel_status_raw),
+        '엑셀_담당자': normalize_array(excel_manager_raw),
+        'JSON_계약명': normalize_array(json_contract_raw),
+        'JSON_진행상태': normalize_array(json_frame['StatusName'].to_numpy()),
+        'JSON_담당자': normalize_array(json_frame['ManagerUserName'].to_numpy()),
+    }
+    contract_mm, contract_one, contract_sim = _compare_summary(summary_text['엑셀_계약명'], summary_text['JSON_계약명'])
+    status_mm, status_one, status_sim = _compare_summary(summary_text['엑셀_진행상태'], summary_text['JSON_진행상태'])
+    manager_mm, manager_one, manager_sim = _compare_summary(summary_text['엑셀_담당자'], summary_text['JSON_담당자'])
+    overall_score = contract_sim * 0.5 + status_sim * 0.3 + manager_sim * 0.2
+
+    excel_keys = _object_array(matched_keys)
+    management_mm = excel_keys != manage_no
+    management_score = np.zeros(n, dtype=int)
+    management_score[management_mm] = _ratio_pairs(excel_keys[management_mm], manage_no[management_mm])
+
+    def original(raw_values, col, i) -> str:
+        return str(raw_values[i]) if col and pd.notna(raw_values[i]) else ''
+
+    summary_specs = [
+        ('계약명_불일치', contract_mm, contract_one, contract_sim, excel_contract_raw, contract_name_col,
+         lambda i: str(contract_name[i] or cc_name[i])),
+        ('진행상태_불일치', status_mm, status_one, status_sim, excel_status_raw, status_col,
+         lambda i: str(json_frame['StatusName'].iat[i])),
+        ('담당자_불일치', manager_mm, manager_one, manager_sim, excel_manager_raw, manager_col,
+         lambda i: str(json_frame['ManagerUserName'].iat[i])),
+    ]
+
+    # 5. 불일치가 있는 행만 결과 dict 생성 (행 순서 유지)
+    needs_output = management_mm | contract_mm | status_mm | manager_mm | (overall_score < 100)
+    needs_output |= np.fromiter((bool(m) for m in row_mismatches), dtype=bool, count=n)
+    for i in np.flatnonzero(needs_output):
+        base_data = {
+            '엑셀_관리번호': matched_keys[i],
+            'JSON_관리번호': manage_no[i],
+            'JSON_SignedContractUUID': uuid[i],
+        }
+        base_data.update({name: text[i] for name, text in summary_text.items()})
+
+        output = outputs[rows[i]]
+        if management_mm[i]:
+            output.append(('관리번호_불일치', {**base_data, '유사성_점수': int(management_score[i])}))
+
+        for sheet, mismatch, one_side, similarity, raw_values, col, json_original in summary_specs:
+            if not mismatch[i]:
+                continue
+            if one_side[i]:
+                output.append((sheet, {**base_data, '유사성_점수': 0, '비고': '한쪽 값만 존재'}))
+            else:
+                output.append((sheet, {
+                    **base_data,
+                    '유사성_점수': int(similarity[i]),
+                    '엑셀_원본값': original(raw_values, col, i),
+                    'JSON_원본값': json_original(i),
+                }))
+
+        if overall_score[i] < 100:
+            output.append(('종합_불일치', {
+                **base_data,
+                '종합_유사성_점수': round(float(overall_score[i]), 2),
+                '계약명_유사성': int(contract_sim[i]),
+                '진행상태_유사성': int(status_sim[i]),
+                '담당자_유사성': int(manager_sim[i]),
+            }))
+
+        for mismatch in row_mismatches[i]:
+            output.append(('전체필드_불일치', {**base_data, **mismatch}))
+
+    return outputs
+
+
+def collect_results(outputs: Dict[int, List[Tuple[str, Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """compare_rows 결과를 행 위치 순으로 펼쳐 {시트명: 결과 dict 목록}"""
+    results: Dict[str, List[Dict[str, Any]]] = {name: [] for name in SHEET_NAMES}
+    for pos in sorted(outputs):
+        for sheet, entry in outputs[pos]:
+            results[sheet].append(entry)
+    return results
+
+
+def first_row_mismatches(matches, outputs) -> Optional[List[Dict[str, Any]]]:
+    """첫 번째 행이 매칭됐으면 그 행의 전체 필드 불일치 목록 (디버깅 출력용)"""
+    if not matches or matches[0] is None or matches[0][0] is None:
+        return None
+    return [entry for sheet, entry in outputs.get(0, []) if sheet == '전체필드_불일치']
+
+
+def compare_frame(
+    df: pd.DataFrame,
+    key_col: Any,
+    contract_name_col: Optional[Any],
+    status_col: Optional[Any],
+    manager_col: Optional[Any],
+    plan,
+    match_index,
+    min_score: int = 80,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]:
+    """엑셀 DataFrame 전체를 JSON과 비교
+
+    plan: check_json_to_excel.ComparisonPlan (컬럼 → JSON 필드)
+    반환: ({시트명: 결과 dict 목록}, 첫 번째 행이 매칭됐으면 그 행의 전체 필드 불일치 목록)
+    """
+    matches = match_rows(df, key_col, match_index, min_score)
+    outputs = compare_rows(df, matches, contract_name_col, status_col, manager_col, plan)
+    return collect_results(outputs), first_row_mismatches(matches, outputs)
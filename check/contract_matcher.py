@@ -0,0 +1,524 @@
+"""두 시트의 계약 행을 가중 유사도로 짝짓는 매칭 엔진 (check_contract_data_migration/origin 공용).
+
+개요
+- 점수: 비교 컬럼마다 fuzz.ratio(str(왼쪽 값), str(오른쪽 값)) × 가중치를 더한 값
+  (기존 calculate_overall_similarity와 같은 순서로 더하므로 종합 점수가 같음)
+- 1단계: 정규화한 관리번호가 같은 오른쪽 행이 있으면 그 행들만 채점
+- 2단계: 나머지 행은 관리번호/계약명 문자 n-gram 블로킹으로 후보 top_k개만 채점
+  - 공유 n-gram은 희귀할수록 가중치(IDF)를 크게, 너무 흔한 n-gram은 무시 (match_index와 같은 방식)
+  - 공유 n-gram이 하나도 없으면 오른쪽 전체를 채점
+- 1·2단계 최고점이 min_score 미만인 행(짝이 없는 행 등)은 오른쪽 전체를 다시 채점 (기존 전수 비교와 같은 선택)
+- 채점은 (왼쪽 행, 오른쪽 행) 쌍을 batch_size개씩 모아 컬럼별로 한 번에 계산
+  - 고유값이 적은 컬럼(진행 상태, 요청자 등)은 고유값끼리 점수 행렬을 한 번 만들어 조회
+  - 나머지는 rapidfuzz cpdist/cdist로 일괄 채점 (fuzzywuzzy와 같은 정수 점수로 반올림), 없으면 fuzzywuzzy로 순차 채점
+  - fuzzywuzzy로 순차 채점할 때 점수 캐시(fuzzy_cache.py)가 켜져 있으면 전체 채점 행렬은 왼쪽 값별로, 쌍 채점은 쌍별로 재사용
+    (rapidfuzz 일괄 채점은 캐시 조회보다 빠르므로 캐시를 쓰지 않음)
+- 최고점이 여럿이면 오른쪽 시트 순서상 앞선 행 선택 (기존 idxmax와 동일)
+- 전략(strategy): 위 단계 중 어디까지 쓸지 (match_planner가 표본으로 비용을 추정해 자동 선택)
+  - 'blocked'(기본): 1·2단계 + 기준 미만 전체 재채점
+  - 'key': 1단계만, 관리번호가 없거나 기준 미만인 행은 전체 채점
+  - 'blocked_only': 1·2단계만 (전체 재채점 없음, 후보가 없는 행은 미매칭 'none')
+  - 'full': 관리번호 조인/블로킹 없이 모든 쌍을 채점 (기존 전수 비교와 같은 결과, exhaustive=True와 같음)
+- 왼쪽 행끼리는 서로 영향이 없으므로 청크로 나눠 여러 프로세스에서 채점해도 결과가 같음 (parallel_match.py)
+"""
+
+import math
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import fuzzy_cache
+import numpy as np
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+except Exception:  # pragma: no cover
+    rf_process = None  # type: ignore
+
+STRATEGIES = ('key', 'blocked', 'blocked_only', 'full')
+
+# rapidfuzz cdist/cpdist 스레드 수 (-1: 전체 코어) - 프로세스 풀 워커에서는 1로 낮춤
+RAPIDFUZZ_WORKERS = -1
+
+
+def text_array(values) -> np.ndarray:
+    """기존 스크립트와 같은 str() 변환 (결측은 'nan')"""
+    return np.array([str(value) for value in values], dtype=object)
+
+
+class MatchColumn:
+    """비교 컬럼 하나 - right가 None이면 오른쪽 시트에 없는 컬럼 (항상 0점)
+
+    normalize: 값 배열 → 비교용 문자열 배열 (기본: 기존 스크립트와 같은 str() 변환)
+    """
+
+    def __init__(self, name: str, left: Any, right: Optional[Any], weight: float,
+                 normalize: Optional[Callable[[np.ndarray], np.ndarray]] = None):
+        self.name = name
+        self.left = left
+        self.right = right
+        self.weight = weight
+        self.normalize = normalize or text_array
+
+
+def _score_matrix(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """left × right 전체 fuzz.ratio 점수 행렬"""
+    if rf_process is not None:
+        scores = rf_process.cdist(list(left), list(right), scorer=rf_fuzz.ratio, dtype=np.float64,
+                                  workers=RAPIDFUZZ_WORKERS)
+        return np.rint(scores).astype(np.int16)
+    return np.array([[fuzz.ratio(a, b) for b in right] for a in left], dtype=np.int16).reshape(len(left), len(right))
+
+
+def _score_cache() -> Optional[fuzzy_cache.FuzzyCache]:
+    """조회가 채점보다 싼 경우(fuzzywuzzy 순차 채점)에만 점수 캐시 반환"""
+    return fuzzy_cache.active() if rf_process is None else None
+
+
+def _ratio_matrix(left: Sequence[str], right: Sequence[str], right_key: Optional[bytes] = None) -> np.ndarray:
+    """_score_matrix + 점수 캐시 (fuzzywuzzy 채점이고 켜져 있으면 왼쪽 값별 행 단위로 재사용)"""
+    cache = _score_cache()
+    if cache is not None and len(left):
+        return cache.rows(left, right, _score_matrix, right_key)
+    return _score_matrix(left, right)
+
+
+def _fuzz_pairs(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    return np.array([fuzz.ratio(a, b) for a, b in zip(left, right)], dtype=np.int16)
+
+
+def _ratio_pairs(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """(left[i], right[i]) 쌍별 fuzz.ratio (fuzzywuzzy 순차 채점일 때만 점수 캐시 사용)"""
+    if len(left) == 0:
+        return np.zeros(0, dtype=np.int16)
+    if rf_process is not None:
+        scores = rf_process.cpdist(list(left), list(right), scorer=rf_fuzz.ratio, dtype=np.float64,
+                                   workers=RAPIDFUZZ_WORKERS)
+        return np.rint(scores).astype(np.int16)
+    cache = _score_cache()
+    if cache is not None:
+        return cache.pairs(left, right, _fuzz_pairs)
+    return _fuzz_pairs(left, right)
+
+
+class _ColumnScorer:
+    """한 비교 컬럼의 점수 계산 - 값은 고유값 코드로 바꿔 두고 같은 문자열 쌍은 한 번만 채점"""
+
+    def __init__(self, left_text: np.ndarray, right_text: Optional[np.ndarray], matrix_limit: int):
+        self.missing = right_text is None
+        if self.missing:
+            return
+        self.left_codes, self.left_uniques = pd.factorize(left_text)
+        self.right_codes, self.right_uniques = pd.factorize(right_text)
+        self.right_key = fuzzy_cache.fingerprint(self.right_uniques) if _score_cache() else None
+        self.matrix = None
+        if len(self.left_uniques) * len(self.right_uniques) <= matrix_limit:
+            self.matrix = _ratio_matrix(self.left_uniques, self.right_uniques, self.right_key)
+
+    def pairs(self, left_rows: np.ndarray, right_rows: np.ndarray) -> np.ndarray:
+        if self.missing:
+            return np.zeros(len(left_rows), dtype=np.int16)
+        left_codes = self.left_codes[left_rows]
+        right_codes = self.right_codes[right_rows]
+        if self.matrix is not None:
+            return self.matrix[left_codes, right_codes]
+        # 같은 (왼쪽 값, 오른쪽 값) 쌍은 한 번만 채점
+        width = len(self.right_uniques)
+        pair_codes, inverse = np.unique(left_codes.astype(np.int64) * width + right_codes, return_inverse=True)
+        scores = _ratio_pairs(self.left_uniques[pair_codes // width], self.right_uniques[pair_codes % width])
+        return scores[inverse.reshape(-1)]
+
+    def rows(self, left_rows: np.ndarray) -> np.ndarray:
+        """left_rows × 오른쪽 전체 행 점수"""
+        if self.missing:
+            return np.zeros((len(left_rows), 0), dtype=np.int16)
+        left_codes = self.left_codes[left_rows]
+        if self.matrix is not None:
+            return self.matrix[left_codes][:, self.right_codes]
+        codes, inverse = np.unique(left_codes, return_inverse=True)
+        matrix = _ratio_matrix(self.left_uniques[codes], self.right_uniques, self.right_key)
+        return matrix[inverse.reshape(-1)][:, self.right_codes]
+
+
+def _ngrams(text: str, n: int) -> set:
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class _BlockIndex:
+    """오른쪽 행의 블로킹 컬럼 n-gram → 행 위치 색인"""
+
+    def __init__(self, texts: List[np.ndarray], ngram: int, max_block_ratio: float):
+        self.ngram = ngram
+        size = len(texts[0]) if texts else 0
+        blocks: Dict[tuple, List[int]] = defaultdict(list)
+        for column, values in enumerate(texts):
+            for position, text in enumerate(values):
+                for gram in _ngrams(text, ngram):
+                    blocks[(column, gram)].append(position)
+        # 거의 모든 행에 있는 n-gram은 후보를 좁히지 못하므로 제외하고 나머지는 IDF 가중치 부여
+        max_block = max(1, int(size * max_block_ratio))
+        self.size = size
+        self.blocks = {
+            gram: np.array(positions, dtype=np.int64)
+            for gram, positions in blocks.items() if len(positions) <= max_block
+        }
+        self.weights = {gram: math.log(size / len(positions)) + 1 for gram, positions in self.blocks.items()}
+
+    def candidates(self, texts: Sequence[str], top_k: int) -> np.ndarray:
+        """희귀 n-gram을 많이 공유하는 오른쪽 행 위치 top_k개 (시트 순서 정렬)"""
+        postings, weights = [], []
+        for column, text in enumerate(texts):
+            for gram in _ngrams(text, self.ngram):
+                positions = self.blocks.get((column, gram))
+                if positions is not None:
+                    postings.append(positions)
+                    weights.append(np.full(len(positions), self.weights[(column, gram)]))
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        # 오른쪽 전체 길이 배열 대신 실제로 나온 위치만 모아 합산 (질의당 비용이 오른쪽 행 수와 무관)
+        found, inverse = np.unique(np.concatenate(postings), return_inverse=True)
+        if len(found) > top_k:
+            shared = np.bincount(inverse, weights=np.concatenate(weights))
+            found = found[np.argpartition(-shared, top_k - 1)[:top_k]]
+        return np.sort(found)
+
+
+class ContractMatcher:
+    """오른쪽 시트(웹 수집 데이터)를 한 번 색인해 두고 왼쪽 시트 행마다 최고점 행을 찾음
+
+    columns: 비교 컬럼 목록 (종합 점수는 이 순서로 가중치를 곱해 더함)
+    key: 1단계 정확 조인에 쓸 컬럼 이름 (MatchColumn.name, None이면 생략)
+    block_on: 2단계 n-gram 블로킹에 쓸 컬럼 이름들
+    min_score: 후보 중 최고 종합 점수가 이 값 미만이면 오른쪽 전체를 다시 채점
+    """
+
+    def __init__(self, right: pd.DataFrame, columns: List[MatchColumn], key: Optional[str] = '관리번호',
+                 block_on: Sequence[str] = ('관리번호', '계약명'), ngram: int = 2, top_k: int = 50,
+                 max_block_ratio: float = 0.05, min_score: float = 80, batch_size: int = 200_000,
+                 matrix_limit: int = 2_000_000):
+        if right.empty:
+            raise ValueError("비교 대상(오른쪽) 시트에 행이 없습니다")
+        # 워커 프로세스에서 같은 설정으로 다시 만들 때 사용 (from_texts)
+        self.options = dict(key=key, block_on=tuple(block_on), ngram=ngram, top_k=top_k,
+                            max_block_ratio=max_block_ratio, min_score=min_score, batch_size=batch_size,
+                            matrix_limit=matrix_limit)
+        self._configure(columns, **self.options)
+        self._build(self._right_texts(right))
+
+    @classmethod
+    def from_texts(cls, texts: Dict[str, np.ndarray], columns: List[MatchColumn], **options) -> 'ContractMatcher':
+        """오른쪽 시트 대신 _right_texts() 결과(공유 메모리에서 복원한 배열 등)로 같은 색인을 만듦"""
+        matcher = cls.__new__(cls)
+        matcher.options = options
+        matcher._configure(columns, **options)
+        matcher._build(texts)
+        return matcher
+
+    def _configure(self, columns: List[MatchColumn], key: Optional[str], block_on: Sequence[str], ngram: int,
+                   top_k: int, max_block_ratio: float, min_score: float, batch_size: int, matrix_limit: int) -> None:
+        self.columns = columns
+        self.key = key
+        self.ngram = ngram
+        self.top_k = top_k
+        self.max_block_ratio = max_block_ratio
+        self.min_score = min_score
+        self.batch_size = batch_size
+        self.matrix_limit = matrix_limit
+        by_name = {column.name: column for column in columns}
+        self.block_on = [name for name in block_on if by_name[name].right is not None]
+
+    def _right_texts(self, right: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """오른쪽 시트 → 색인에 쓰는 문자열 배열 (이름 → 배열)
+
+        - 'text:<컬럼>': 비교 컬럼의 정규화 값 (오른쪽 시트에 없는 컬럼은 제외)
+        - 'key': 공백 제거한 관리번호 (결측이나 관리번호 조인을 쓰지 않으면 '')
+        - 'block:<컬럼>': 블로킹용 텍스트
+        """
+        values = right.astype(object)
+        by_name = {column.name: column for column in self.columns}
+        texts = {
+            f'text:{column.name}': column.normalize(values[column.right].to_numpy())
+            for column in self.columns if column.right is not None
+        }
+        if self.key is not None and by_name[self.key].right is not None:
+            texts['key'] = self._block_text(values[by_name[self.key].right])
+        else:
+            texts['key'] = np.full(len(right), '', dtype=object)
+        for name in self.block_on:
+            texts[f'block:{name}'] = self._block_text(values[by_name[name].right])
+        return texts
+
+    def _build(self, texts: Dict[str, np.ndarray]) -> None:
+        self.texts = texts
+        self.size = len(texts['key'])
+        self.right_text = {column.name: texts.get(f'text:{column.name}') for column in self.columns}
+
+        # 정규화 관리번호 → 오른쪽 행 위치 목록 (결측 제외)
+        grouped: Dict[str, List[int]] = defaultdict(list)
+        for position, value in enumerate(texts['key']):
+            if value:
+                grouped[value].append(position)
+        self.key_positions: Dict[str, np.ndarray] = {k: np.array(v, dtype=np.int64) for k, v in grouped.items()}
+
+        self.block_index = _BlockIndex([texts[f'block:{name}'] for name in self.block_on], self.ngram,
+                                       self.max_block_ratio)
+
+    @staticmethod
+    def _block_text(values) -> np.ndarray:
+        """블로킹용 텍스트 (결측은 빈 문자열, 공백 제거)"""
+        return np.array([str(value).strip() if pd.notna(value) else '' for value in values], dtype=object)
+
+    def _scorers(self, left: pd.DataFrame) -> List[_ColumnScorer]:
+        values = left.astype(object)
+        return [
+            _ColumnScorer(column.normalize(values[column.left].to_numpy()), self.right_text[column.name],
+                          self.matrix_limit)
+            for column in self.columns
+        ]
+
+    def _overall(self, scores: List[np.ndarray]) -> np.ndarray:
+        total = scores[0] * self.columns[0].weight
+        for column, column_scores in zip(self.columns[1:], scores[1:]):
+            if column.right is not None:
+                total = total + column_scores * column.weight
+        return total
+
+    def _pair_batches(self, left_rows: np.ndarray):
+        """(왼쪽, 오른쪽) 쌍 배열을 batch_size 단위 구간으로 나눔 - 한 왼쪽 행의 후보는 같은 구간에 둠 (left_rows 정렬 가정)"""
+        start = 0
+        while start < len(left_rows):
+            stop = min(start + self.batch_size, len(left_rows))
+            if stop < len(left_rows):
+                row_start = int(np.searchsorted(left_rows, left_rows[stop], side='left'))
+                stop = row_start if row_start > start else int(np.searchsorted(left_rows, left_rows[stop], side='right'))
+            yield start, stop
+            start = stop
+
+    def _score_pairs(self, scorers, left_rows: np.ndarray, right_rows: np.ndarray):
+        scores = [scorer.pairs(left_rows, right_rows) for scorer in scorers]
+        return scores, self._overall(scores)
+
+    def _best_of_pairs(self, scorers, left_rows: np.ndarray, right_rows: np.ndarray, best: Dict[str, np.ndarray]) -> None:
+        """(왼쪽, 오른쪽 후보) 쌍을 채점해 왼쪽 행마다 최고점 쌍을 best에 기록 (후보는 왼쪽 행별로 시트 순서)"""
+        for start, stop in self._pair_batches(left_rows):
+            batch_left, batch_right = left_rows[start:stop], right_rows[start:stop]
+            scores, overall = self._score_pairs(scorers, batch_left, batch_right)
+            # 왼쪽 행 → 종합 점수 내림차순 → 원래 순서(오른쪽 시트 순서) 정렬 후 행마다 첫 번째
+            order = np.lexsort((np.arange(len(batch_left)), -overall, batch_left))
+            first = order[np.flatnonzero(np.r_[True, batch_left[order][1:] != batch_left[order][:-1]])]
+            rows = batch_left[first]
+            best['right_position'][rows] = batch_right[first]
+            best['overall_score'][rows] = overall[first]
+            for column, column_scores in zip(self.columns, scores):
+                best[column.name][rows] = column_scores[first]
+
+    def _all_scores(self, scorers, left_rows: np.ndarray):
+        """왼쪽 행 묶음마다 오른쪽 전체 행 점수 (메모리 제한을 위해 batch_size 셀 단위로 나눔)"""
+        step = max(1, self.batch_size // self.size)
+        for start in range(0, len(left_rows), step):
+            rows = left_rows[start:start + step]
+            scores = [scorer.rows(rows) for scorer in scorers]
+            scores = [s if s.shape[1] else np.zeros((len(rows), self.size), dtype=np.int16) for s in scores]
+            yield rows, scores, self._overall(scores)
+
+    def _best_of_all(self, scorers, left_rows: np.ndarray, best: Dict[str, np.ndarray]) -> None:
+        """왼쪽 행마다 오른쪽 전체 행을 채점해 최고점 쌍을 best에 기록"""
+        for rows, scores, overall in self._all_scores(scorers, left_rows):
+            choice = overall.argmax(axis=1)  # 첫 번째 최고점
+            picked = np.arange(len(rows))
+            best['right_position'][rows] = choice
+            best['overall_score'][rows] = overall[picked, choice]
+            for column, column_scores in zip(self.columns, scores):
+                best[column.name][rows] = column_scores[picked, choice]
+
+    def _candidates(self, left: pd.DataFrame, union: bool = False, block: bool = True):
+        """왼쪽 행마다 후보 오른쪽 행 → (방식 배열, 왼쪽 위치 배열, 오른쪽 위치 배열)
+
+        union=False: 관리번호가 같은 행이 있으면 그 행들만, 없으면 n-gram 블로킹 후보
+        union=True: 관리번호가 같은 행 + 블로킹 후보 (일대일 할당에서 대안 후보 확보용)
+        block=False: 관리번호 조인만 ('key' 전략)
+        """
+        n = len(left)
+        method = np.full(n, 'full', dtype=object)
+        values = left.astype(object)
+        by_name = {column.name: column for column in self.columns}
+        key_values = values[by_name[self.key].left] if self.key_positions else None
+        block_texts = [self._block_text(values[by_name[name].left]) for name in self.block_on]
+
+        pair_left: List[np.ndarray] = []
+        pair_right: List[np.ndarray] = []
+        for position in range(n):
+            candidates = []
+            if key_values is not None:
+                key_value = key_values.iat[position]
+                if pd.notna(key_value):
+                    found = self.key_positions.get(str(key_value).strip())
+                    if found is not None:
+                        candidates.append(found)
+                        method[position] = 'key'
+            if (union or not candidates) and block and block_texts:
+                found = self.block_index.candidates([texts[position] for texts in block_texts], self.top_k)
+                if len(found):
+                    candidates.append(found)
+                    if method[position] == 'full':
+                        method[position] = 'block'
+            if candidates:
+                found = candidates[0] if len(candidates) == 1 else np.unique(np.concatenate(candidates))
+                pair_left.append(np.full(len(found), position, dtype=np.int64))
+                pair_right.append(found)
+        if not pair_left:
+            return method, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return method, np.concatenate(pair_left), np.concatenate(pair_right)
+
+    @staticmethod
+    def _strategy(exhaustive: bool, strategy: str) -> str:
+        strategy = 'full' if exhaustive else strategy
+        if strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 매칭 전략: {strategy} (가능: {', '.join(STRATEGIES)})")
+        return strategy
+
+    def match(self, left: pd.DataFrame, exhaustive: bool = False, strategy: str = 'blocked') -> pd.DataFrame:
+        """왼쪽 행마다 최고점 오른쪽 행
+
+        반환: 왼쪽 행 순서의 DataFrame
+          right_position(오른쪽 시트 행 위치, 미매칭은 -1), method('key' / 'block' / 'full' / 'none'),
+          overall_score(종합 점수), 비교 컬럼 이름별 점수
+        """
+        strategy = self._strategy(exhaustive, strategy)
+        n = len(left)
+        scorers = self._scorers(left)
+        best = self._empty_best(n)
+        if strategy == 'full':
+            method = np.full(n, 'full', dtype=object)
+        else:
+            method, pair_left, pair_right = self._candidates(left, block=strategy != 'key')
+            if len(pair_left):
+                self._best_of_pairs(scorers, pair_left, pair_right, best)
+                # 후보 안에 기준 점수 이상이 없으면 블로킹 누락일 수 있으므로 전체 확인
+                if strategy != 'blocked_only':
+                    method[(method != 'full') & (best['overall_score'] < self.min_score)] = 'full'
+            if strategy == 'blocked_only':
+                method[method == 'full'] = 'none'
+        full_rows = np.flatnonzero(method == 'full')
+        if len(full_rows):
+            self._best_of_all(scorers, full_rows, best)
+        return self._result(best, method)
+
+    def edges(self, left: pd.DataFrame, exhaustive: bool = False, strategy: str = 'blocked') -> pd.DataFrame:
+        """왼쪽 행마다 후보 쌍과 점수 (일대일 할당용 희소 후보 그래프)
+
+        - 관리번호가 같은 행과 n-gram 블로킹 후보를 모두 채점 ('key' 전략은 관리번호가 같은 행만)
+        - 후보 최고점이 min_score 미만이거나 후보가 없는 행은 오른쪽 전체에서 종합 점수 상위 top_k개
+          ('blocked_only' 전략은 생략)
+        - 간선 수는 최대 왼쪽 행 수 × (top_k + 관리번호 중복 수)라 행 수에 비례
+        반환: left_position, right_position, overall_score, 비교 컬럼 이름별 점수 (왼쪽 → 오른쪽 위치 순)
+        """
+        strategy = self._strategy(exhaustive, strategy)
+        n = len(left)
+        scorers = self._scorers(left)
+        parts: List[Dict[str, np.ndarray]] = []
+        if strategy == 'full':
+            method = np.full(n, 'full', dtype=object)
+        else:
+            method, pair_left, pair_right = self._candidates(left, union=True, block=strategy != 'key')
+            best = np.full(n, -np.inf)
+            for start, stop in self._pair_batches(pair_left):
+                batch_left, batch_right = pair_left[start:stop], pair_right[start:stop]
+                scores, overall = self._score_pairs(scorers, batch_left, batch_right)
+                np.maximum.at(best, batch_left, overall)
+                parts.append(self._edge_part(batch_left, batch_right, overall, scores))
+            if strategy == 'blocked_only':
+                method[:] = 'none'
+            else:
+                method[(method != 'full') & (best < self.min_score)] = 'full'
+            if parts:
+                # 전체 다시 채점할 행의 후보 간선은 버림 (아래 상위 top_k로 대체)
+                keep_rows = method != 'full'
+                parts = [{name: array[keep_rows[part['left_position']]] for name, array in part.items()}
+                         for part in parts]
+
+        full_rows = np.flatnonzero(method == 'full')
+        k = min(self.top_k, self.size)
+        for rows, scores, overall in self._all_scores(scorers, full_rows):
+            top = np.sort(np.argpartition(-overall, k - 1, axis=1)[:, :k], axis=1)
+            picked = np.arange(len(rows))[:, None]
+            parts.append(self._edge_part(
+                np.repeat(rows, k), top.reshape(-1), overall[picked, top].reshape(-1),
+                [column_scores[picked, top].reshape(-1) for column_scores in scores],
+            ))
+
+        if not parts:
+            return pd.DataFrame(self._edge_part(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                                                np.zeros(0), [np.zeros(0, dtype=np.int16)] * len(self.columns)))
+        edges = pd.DataFrame({name: np.concatenate([part[name] for part in parts]) for name in parts[0]})
+        return edges.sort_values(['left_position', 'right_position'], kind='stable', ignore_index=True)
+
+    def profile(self, left: pd.DataFrame, probe_rows: int = 20) -> Dict[str, float]:
+        """표본 왼쪽 행으로 전략별 비용/재현율 추정에 쓸 값을 측정 (match_planner용)
+
+        - key_hit: 관리번호가 같은 행이 있는 비율, key_pairs / block_pairs: 단계별 후보 쌍 수
+        - rescan_blocked / rescan_key: 'blocked' / 'key' 전략에서 전체 채점으로 넘어가는 행 비율
+        - candidate_seconds: 행당 후보 찾기 시간, pair_seconds: 쌍당 채점 시간, cell_seconds: 전체 채점 셀당 시간
+        - probed / missed: 전체 재채점 대상 중 실제로 전체 채점해 본 행 수 / 그중 후보 밖에서 기준 이상 행을 찾은 수
+        """
+        n = len(left)
+        scorers = self._scorers(left)
+        started = time.perf_counter()
+        method, pair_left, pair_right = self._candidates(left)
+        candidate_seconds = (time.perf_counter() - started) / max(n, 1)
+
+        best = self._empty_best(n)
+        started = time.perf_counter()
+        self._best_of_pairs(scorers, pair_left, pair_right, best)
+        pair_seconds = (time.perf_counter() - started) / max(len(pair_left), 1)
+
+        key_rows = method == 'key'
+        low = (method != 'full') & (best['overall_score'] < self.min_score)
+        rescan = (method == 'full') | low
+        # 전체 채점 셀 비용 + 블로킹 누락 측정 (재채점 대상이 없으면 비용만 앞쪽 행으로 측정)
+        probe = np.flatnonzero(rescan)[:probe_rows]
+        timed = probe if len(probe) else np.arange(min(probe_rows, n))
+        full_best = self._empty_best(n)
+        started = time.perf_counter()
+        self._best_of_all(scorers, timed, full_best)
+        cell_seconds = (time.perf_counter() - started) / max(len(timed) * self.size, 1)
+        missed = int((full_best['overall_score'][probe] >= self.min_score).sum())
+
+        row_pairs = np.bincount(pair_left, minlength=n)
+        return {
+            'rows': n,
+            'key_hit': float(key_rows.mean()) if n else 0.0,
+            'key_pairs': float(row_pairs[key_rows].sum()),
+            'block_pairs': float(row_pairs[method == 'block'].sum()),
+            'rescan_blocked': float(rescan.mean()) if n else 0.0,
+            'rescan_key': float(((method != 'key') | (key_rows & low)).mean()) if n else 0.0,
+            'candidate_seconds': candidate_seconds,
+            'pair_seconds': pair_seconds,
+            'cell_seconds': cell_seconds,
+            'probed': len(probe),
+            'missed': missed,
+        }
+
+    def _edge_part(self, left_rows, right_rows, overall, scores) -> Dict[str, np.ndarray]:
+        part = {'left_position': left_rows, 'right_position': right_rows, 'overall_score': overall}
+        for column, column_scores in zip(self.columns, scores):
+            part[column.name] = column_scores
+        return part
+
+    def _empty_best(self, n: int) -> Dict[str, np.ndarray]:
+        best: Dict[str, np.ndarray] = {
+            'right_position': np.full(n, -1, dtype=np.int64),
+            'overall_score': np.zeros(n, dtype=np.float64),
+        }
+        for column in self.columns:
+            best[column.name] = np.zeros(n, dtype=np.int16)
+        return best
+
+    def _result(self, best: Dict[str, np.ndarray], method: np.ndarray) -> pd.DataFrame:
+        result = pd.DataFrame(best)
+        result.insert(1, 'method', method)
+        return result
@@ -0,0 +1,264 @@
+"""fuzz.ratio 점수를 실행 간에 재사용하는 SQLite 디스크 캐시.
+
+개요
+- 키: blake2b(채점기 이름 + 정규화 문자열 쌍) 16바이트, 값: 점수
+  - 쌍(pair): 왼쪽 문자열 하나 × 오른쪽 문자열 하나 → 점수 1개
+  - 행(row): 왼쪽 문자열 하나 × 오른쪽 문자열 목록 전체 → uint8 점수 배열 (목록은 fingerprint로 구분)
+- 조회가 채점보다 싼 경우에만 사용: fuzzywuzzy 순차 채점일 때 (rapidfuzz 일괄 채점은 키 해시 + 조회보다 빠름)
+  - 행 캐시: 오른쪽 전체와 비교하는 전수 채점
+  - 쌍 캐시: 쌍별 채점
+- 조회한 항목은 실행 번호(generation)를 갱신, 새로 계산한 항목은 호출마다 바로 기록 (워커 프로세스도 안전)
+- 크기 제한: 기록할 때마다 누적 크기를 확인
+  - 이번 실행에서 기록한 양이 max_mb에 닿으면 더 이상 기록하지 않음 (큰 행 항목도 한도 안에서만 저장)
+  - 전체 크기가 max_mb를 넘으면 가장 오래 쓰지 않은 실행 번호부터 삭제 (LRU)
+  - 지운 페이지는 SQLite가 다음 기록에 재사용하므로 VACUUM은 하지 않음
+- 여러 프로세스가 같은 파일을 쓰므로 WAL 모드 + 잠금 대기
+
+기본 위치: ~/.cache/contract_crawler/fuzzy_scores.sqlite (FUZZY_CACHE_PATH 환경변수로 변경)
+
+사용 예시
+    import fuzzy_cache
+    fuzzy_cache.enable()                    # 스크립트 시작 시 (--score-cache일 때만)
+    cache = fuzzy_cache.active()            # 채점하는 곳에서 (꺼져 있으면 None)
+    scores = cache.pairs(left, right, compute) if cache else compute(left, right)
+    fuzzy_cache.close()                     # 끝날 때 통계 출력
+"""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CACHE_PATH_ENV = 'FUZZY_CACHE_PATH'
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'contract_crawler' / 'fuzzy_scores.sqlite'
+DEFAULT_MAX_MB = 512
+SCHEMA_VERSION = 1
+SCORER = 'fuzz.ratio'  # rapidfuzz(반올림)와 fuzzywuzzy 점수가 같으므로 한 이름으로 공유
+
+# 항목 하나의 대략적인 저장 크기 (키 + 실행 번호 + 크기 + SQLite 행 오버헤드)
+_ENTRY_OVERHEAD = 40
+# 한도를 넘으면 이 비율까지 줄여, 작은 기록마다 정리가 반복되지 않게 함
+_EVICT_TARGET = 0.9
+# IN (...) 조회 한 번에 넣는 키 수 (SQLite 변수 개수 제한 아래)
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL,
+    used INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_scores_used ON scores(used);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def default_path() -> Path:
+    return Path(os.getenv(CACHE_PATH_ENV) or DEFAULT_CACHE_PATH)
+
+
+def _digest(*parts: bytes) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, 'little'))  # 길이를 앞에 붙여 경계가 섞이지 않게
+        digest.update(part)
+    return digest.digest()
+
+
+def fingerprint(texts: Sequence[str]) -> bytes:
+    """문자열 목록 전체(순서 포함)의 해시 - 행 캐시에서 오른쪽 목록을 구분"""
+    return _digest(*(str(text).encode('utf-8', 'surrogatepass') for text in texts))
+
+
+class FuzzyCache:
+    """점수 캐시 파일 하나 (프로세스마다 따로 연결)"""
+
+    def __init__(self, path: Optional[Path] = None, max_mb: int = DEFAULT_MAX_MB, scorer: str = SCORER):
+        self.path = Path(path) if path else default_path()
+        self.max_bytes = max_mb * 1024 * 1024
+        self.scorer = scorer.encode('utf-8')
+        self.pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0     # 이번 연결에서 기록한 크기
+        self.skipped = 0    # 한도 때문에 기록하지 않은 항목 수
+        self.evicted = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        with self.conn:
+            version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if version is None or int(version[0]) != SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS scores")
+                self.conn.executescript(_SCHEMA)
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            # 실행 번호 (LRU 기준) - 연결할 때마다 1씩 증가하므로 나중에 쓴 항목일수록 큼
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            self.generation = (int(row[0]) if row else 0) + 1
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(self.generation),))
+        self.total = self._total_size()
+
+    def _total_size(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM scores").fetchone()[0]
+
+    def _lookup(self, keys: List[bytes]) -> Dict[bytes, bytes]:
+        found: Dict[bytes, bytes] = {}
+        stale: List[Tuple[int, bytes]] = []
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _LOOKUP_BATCH):
+            batch = unique[start:start + _LOOKUP_BATCH]
+            query = f"SELECT key, value, used FROM scores WHERE key IN ({', '.join('?' * len(batch))})"
+            for key, value, used in self.conn.execute(query, batch):
+                found[key] = value
+                if used != self.generation:
+                    stale.append((self.generation, key))
+        if stale:
+            with self.conn:
+                self.conn.executemany("UPDATE scores SET used = ? WHERE key = ?", stale)
+        return found
+
+    def _store(self, entries: Dict[bytes, bytes]) -> None:
+        if not entries:
+            return
+        # 이번 실행에서 쓴 양이 한도를 넘지 않는 만큼만 기록 (넘는 항목은 다음 실행에서 다시 계산)
+        budget = self.max_bytes - self.stored
+        rows = []
+        for key, value in entries.items():
+            size = len(value) + _ENTRY_OVERHEAD
+            if size > budget:
+                self.skipped += 1
+                continue
+            budget -= size
+            rows.append((key, value, self.generation, size))
+        if not rows:
+            return
+        written = sum(row[3] for row in rows)
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)", rows)
+        self.stored += written
+        self.total += written
+        if self.total > self.max_bytes:
+            self.evicted += self.evict()
+
+    def pairs(self, left: Sequence[str], right: Sequence[str],
+              compute: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> np.ndarray:
+        """(left[i], right[i]) 쌍별 점수 - 캐시에 없는 쌍만 compute로 채점"""
+        left = np.asarray(left, dtype=object)
+        right = np.asarray(right, dtype=object)
+        keys = [_digest(b'pair', self.scorer, str(a).encode('utf-8', 'surrogatepass'),
+                        str(b).encode('utf-8', 'surrogatepass'))
+                for a, b in zip(left.tolist(), right.tolist())]
+        found = self._lookup(keys)
+        scores = np.zeros(len(keys), dtype=np.int16)
+        missing = []
+        for i, key in enumerate(keys):
+            value = found.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                scores[i] = value[0]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            missing = np.array(missing, dtype=np.int64)
+            computed = np.asarray(compute(left[missing], right[missing]))
+            scores[missing] = computed
+            self._store({keys[i]: bytes([int(score)]) for i, score in zip(missing.tolist(), computed.tolist())})
+        return scores
+
+    def rows(self, left: Sequence[str], right: Sequence[str],
+             compute: Callable[[Sequence[str], Sequence[str]], np.ndarray],
+             right_key: Optional[bytes] = None) -> np.ndarray:
+        """left × right 점수 행렬 - 왼쪽 문자열마다 오른쪽 목록 전체 점수를 한 항목으로 저장
+
+        right_key: fingerprint(right) (같은 목록으로 여러 번 부르면 미리 계산해 넘김)
+        """
+        right_key = right_key or fingerprint(right)
+        left = list(left)
+        keys = [_digest(b'row', self.scorer, right_key, str(text).encode('utf-8', 'surrogatepass')) for text in left]
+        found = self._lookup(keys)
+        matrix = np.zeros((len(left), len(right)), dtype=np.int16)
+        missing = []
+        for i, key in enumerate(keys):
+            value = found.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                matrix[i] = np.frombuffer(value, dtype=np.uint8)
+        self.hits += len(left) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = np.asarray(compute([left[i] for i in missing], right))
+            matrix[missing] = computed
+            self._store({keys[i]: computed[row].astype(np.uint8).tobytes() for row, i in enumerate(missing)})
+        return matrix
+
+    def evict(self) -> int:
+        """전체 크기가 max_bytes를 넘으면 오래된 실행 번호 항목부터 max_bytes의 90%까지 삭제 → 삭제한 항목 수"""
+        total = self._total_size()  # 다른 프로세스가 쓴 양까지 반영
+        if total <= self.max_bytes:
+            self.total = total
+            return 0
+        excess = total - int(self.max_bytes * _EVICT_TARGET)
+        victims: List[Tuple[bytes]] = []
+        freed = 0
+        for key, size in self.conn.execute("SELECT key, size FROM scores ORDER BY used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        with self.conn:
+            self.conn.executemany("DELETE FROM scores WHERE key = ?", victims)
+        self.total = total - freed
+        return len(victims)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# 프로세스 전역 캐시 설정 (enable) 과 현재 프로세스의 연결 (active)
+_settings: Optional[Tuple[Path, int]] = None
+_instance: Optional[FuzzyCache] = None
+
+
+def enable(path: Optional[Path] = None, max_mb: int = DEFAULT_MAX_MB) -> None:
+    global _settings
+    _settings = (Path(path) if path else default_path(), max_mb)
+
+
+def settings() -> Optional[Tuple[Path, int]]:
+    """워커 프로세스 초기화에 넘길 설정 (spawn 워커는 전역 변수를 물려받지 않음)"""
+    return _settings
+
+
+def active() -> Optional[FuzzyCache]:
+    """켜져 있으면 현재 프로세스의 캐시 (fork된 워커는 부모 연결을 쓰지 않고 새로 연결)"""
+    global _instance
+    if _settings is None:
+        return None
+    if _instance is None or _instance.pid != os.getpid():
+        _instance = FuzzyCache(*_settings)
+    return _instance
+
+
+def close() -> None:
+    """통계 출력 후 연결 종료 (캐시를 켠 프로세스에서 마지막에 호출)"""
+    global _instance
+    if _instance is None or _instance.pid != os.getpid():
+        _instance = None
+        return
+    cache, _instance = _instance, None
+    try:
+        if cache.hits or cache.misses:
+            note = f", 오래된 항목 {cache.evicted:,}개 정리" if cache.evicted else ""
+            if cache.skipped:
+                note += f", 크기 한도로 {cache.skipped:,}개 저장 생략"
+            print(f"ℹ 점수 캐시: 재사용 {cache.hits:,}건 / 새로 계산 {cache.misses:,}건 ({cache.path}{note})")
+    finally:
+        cache.close()
@@ -0,0 +1,174 @@
+"""raw_data 폴더의 selectDetail.json 들을 SQLite 한 파일에 색인해 두는 저장소.
+
+개요
+- 파일마다 (상대 경로, mtime_ns, size, SignedContractUUID, ManageNo, 기업 폴더명, CCName, JSON 원문)을 기록
+- 다음 실행부터는 stat 값만 비교해 새로 생기거나 바뀐 파일만 다시 파싱, 사라진 파일은 색인에서 삭제
+- 파싱은 스레드 풀 + (설치되어 있으면) orjson 으로 처리
+- load_map()은 check_json_to_excel.load_json_data 와 같은 형태의 {UUID/ManageNo: dict} 를 반환
+  (companies를 주면 해당 기업 폴더의 레코드만 로드)
+
+기본 색인 위치: <raw_data>/.selectDetail_index.sqlite
+"""
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+INDEX_FILENAME = ".selectDetail_index.sqlite"
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    uuid TEXT,
+    manage_no TEXT,
+    company TEXT,
+    cc_name TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_uuid ON files(uuid);
+CREATE INDEX IF NOT EXISTS idx_files_manage_no ON files(manage_no);
+CREATE INDEX IF NOT EXISTS idx_files_company ON files(company);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def _dumps(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _parse_file(path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(dict 데이터, 오류 메시지) - dict가 아닌 JSON은 색인만 하고 로드하지 않음"""
+    try:
+        with open(path, 'rb') as f:
+            data = _loads(f.read())
+    except Exception as e:
+        return None, str(e)
+    if not isinstance(data, dict):
+        return None, None
+    return data, None
+
+
+class JsonIndexStore:
+    def __init__(self, raw_data_path: Path, db_path: Optional[Path] = None,
+                 pattern: str = "selectDetail.json", max_workers: int = 8):
+        self.root = Path(raw_data_path)
+        self.db_path = Path(db_path) if db_path else self.root / INDEX_FILENAME
+        self.pattern = pattern
+        self.max_workers = max_workers
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(_SCHEMA)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None or int(version[0]) != SCHEMA_VERSION:
+            # 스키마가 바뀌었으면 색인을 새로 만듦 (컬럼 구성이 달라질 수 있으므로 테이블째 재생성)
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'JsonIndexStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _company_of(self, rel_path: str) -> str:
+        """raw_data/<기업명>/... 의 첫 폴더명"""
+        parts = Path(rel_path).parts
+        return parts[0] if len(parts) > 1 else ''
+
+    def refresh(self) -> Dict[str, int]:
+        """디스크와 색인을 비교해 신규/변경 파일만 다시 파싱하고 삭제된 파일은 제거"""
+        indexed = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.conn.execute("SELECT path, mtime_ns, size FROM files")
+        }
+
+        on_disk: Dict[str, Tuple[Path, int, int]] = {}
+        for json_file in self.root.rglob(self.pattern):
+            try:
+                st = json_file.stat()
+            except OSError:
+                continue
+            rel_path = json_file.relative_to(self.root).as_posix()
+            on_disk[rel_path] = (json_file, st.st_mtime_ns, st.st_size)
+
+        changed = [
+            (rel_path, info) for rel_path, info in on_disk.items()
+            if indexed.get(rel_path) != (info[1], info[2])
+        ]
+        removed = [path for path in indexed if path not in on_disk]
+
+        rows = []
+        if changed:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                parsed = list(executor.map(lambda item: _parse_file(item[1][0]), changed))
+            for (rel_path, (json_file, mtime_ns, size)), (data, error) in zip(changed, parsed):
+                if error:
+                    print(f"  경고: {json_file} 읽기 실패: {error}")
+                uuid = manage_no = cc_name = None
+                text = None
+                if data is not None:
+                    uuid = str(data.get('SignedContractUUID', '')).strip() or None
+                    manage_no = str(data.get('ManageNo', '')).strip() or None
+                    cc_name = str(data.get('CCName') or '').strip() or None
+                    text = _dumps(data)
+                rows.append((rel_path, mtime_ns, size, uuid, manage_no, self._company_of(rel_path), cc_name, text))
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+
+        stats = {'total': len(on_disk), 'parsed': len(changed), 'removed': len(removed)}
+        print(f"  색인 갱신: 파일 {stats['total']}개 (재파싱 {stats['parsed']}개, 삭제 {stats['removed']}개)")
+        return stats
+
+    def companies(self) -> Dict[str, Set[str]]:
+        """기업 폴더명 → 그 폴더 레코드들의 CCName 집합"""
+        result: Dict[str, Set[str]] = {}
+        query = "SELECT DISTINCT company, cc_name FROM files WHERE data IS NOT NULL"
+        for company, cc_name in self.conn.execute(query):
+            names = result.setdefault(company or '', set())
+            if cc_name:
+                names.add(cc_name)
+        return result
+
+    def iter_records(self, companies: Optional[Iterable[str]] = None):
+        """(uuid, manage_no, dict) 를 경로 순으로 반환 (companies: 기업 폴더명 목록, None이면 전체)"""
+        query = "SELECT uuid, manage_no, data FROM files WHERE data IS NOT NULL"
+        params: List[str] = []
+        if companies is not None:
+            params = list(companies)
+            query += f" AND company IN ({', '.join('?' * len(params))})"
+        for uuid, manage_no, text in self.conn.execute(query + " ORDER BY path", params):
+            yield uuid, manage_no, _loads(text.encode('utf-8'))
+
+    def load_map(self, companies: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """SignedContractUUID 우선, ManageNo는 UUID 키와 겹치지 않을 때만 추가 (기존 load_json_data 규칙)"""
+        json_data_map: Dict[str, Dict[str, Any]] = {}
+        for uuid, manage_no, data in self.iter_records(companies):
+            if uuid:
+                json_data_map[uuid] = data
+            if manage_no and manage_no not in json_data_map:
+                json_data_map[manage_no] = data
+        return json_data_map
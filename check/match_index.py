@@ -0,0 +1,179 @@
+"""엑셀 관리번호 → JSON 레코드 매칭용 보조 색인.
+
+개요
+- 1차: json_data_map 키(SignedContractUUID/ManageNo) 직접 조회
+- 2차: 정규화한 ManageNo 딕셔너리 조회 (기존: 전체 레코드 선형 탐색)
+- 3차: fuzz.ratio 최고점 키 (contract_matcher의 'blocked' 전략과 같은 방식)
+  - 문자 n-gram 블로킹으로 후보 top_k개만 채점
+    - 공유 n-gram은 희귀할수록 가중치(IDF)를 크게, 거의 모든 키에 있는 n-gram은 무시
+    - 길이 차이로 기준 점수에 도달할 수 없는 키는 미리 제외
+  - 후보 최고점이 min_score 이상이면 그 후보를 그대로 채택 (전체 키는 보지 않음)
+    → 블록 밖에 더 높은 점수의 키가 있으면 기존 전체 키 선형 탐색과 다른 키를 고를 수 있음
+  - 후보가 없거나 최고점이 min_score 미만이면 전체 키를 score_cutoff=min_score로 다시 채점
+    (rapidfuzz - C 구현, 기준 미만 키는 조기 종료 / rapidfuzz가 없으면 길이상 도달 가능한 키만 fuzzywuzzy로 순차 채점)
+- 점수는 fuzzywuzzy와 같은 정수(반올림), 동점이면 json_data_map 순서상 앞선 키를 선택
+"""
+
+import hashlib
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+except Exception:  # pragma: no cover
+    rf_process = None  # type: ignore
+
+
+def _fuzz_pairs(left, right) -> List[int]:
+    return [fuzz.ratio(a, b) for a, b in zip(left, right)]
+
+
+def normalize_key(value: Any) -> str:
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _ngrams(text: str, n: int) -> set:
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class MatchIndex:
+    def __init__(self, json_data_map: Dict[str, Dict[str, Any]], ngram: int = 3, top_k: int = 200,
+                 max_block_ratio: float = 0.2):
+        self.json_data_map = json_data_map
+        self.ngram = ngram
+        self.top_k = top_k
+        self.max_block_ratio = max_block_ratio
+        self.keys: List[str] = list(json_data_map)
+        self._fingerprint: Optional[bytes] = None
+
+        # 정규화 ManageNo → 레코드 (map 순서상 처음 것 유지)
+        self.by_manage_no: Dict[str, Dict[str, Any]] = {}
+        for data in json_data_map.values():
+            manage_no = normalize_key(data.get('ManageNo'))
+            if manage_no and manage_no not in self.by_manage_no:
+                self.by_manage_no[manage_no] = data
+
+        # n-gram → 키 위치 배열
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for position, key in enumerate(self.keys):
+            for gram in _ngrams(key, ngram):
+                blocks[gram].append(position)
+        # 너무 흔한 n-gram(예: 'CL', '20')은 후보를 좁히지 못하므로 제외하고 나머지는 IDF 가중치 부여
+        max_block = max(1, int(len(self.keys) * max_block_ratio))
+        self.blocks = {gram: np.array(positions, dtype=np.int64)
+                       for gram, positions in blocks.items() if len(positions) <= max_block}
+        self.key_lengths = np.array([len(key) for key in self.keys], dtype=np.int64)
+        self.weights = {gram: math.log(len(self.keys) / len(positions)) + 1
+                        for gram, positions in self.blocks.items()}
+
+    def _candidates(self, query: str, min_score: int) -> List[int]:
+        """query와 희귀 n-gram을 많이 공유하고 길이상 min_score 도달이 가능한 키 위치 top_k개 (map 순서 정렬)"""
+        postings, weights = [], []
+        for gram in _ngrams(query, self.ngram):
+            positions = self.blocks.get(gram)
+            if positions is not None:
+                postings.append(positions)
+                weights.append(np.full(len(positions), self.weights[gram]))
+        if not postings:
+            return []
+        # 위치별 가중치 합 (bincount - 파이썬 루프 없이 키 수에 비례하는 한 번의 배열 연산)
+        shared = np.bincount(np.concatenate(postings), weights=np.concatenate(weights), minlength=len(self.keys))
+        found = np.flatnonzero(shared)
+        # ratio = 2*M/(la+lb) ≤ 2*min(la,lb)/(la+lb) 이므로 길이만으로 걸러낼 수 있음 (반올림 포함)
+        lengths = self.key_lengths[found]
+        query_len = len(query)
+        found = found[2 * np.minimum(query_len, lengths) / (query_len + lengths) >= (min_score - 0.5) / 100]
+        if len(found) > self.top_k:
+            found = found[np.argpartition(-shared[found], self.top_k - 1)[:self.top_k]]
+        return np.sort(found).tolist()
+
+    def _reachable(self, query_len: int, key: str, min_score: int) -> bool:
+        # ratio = 2*M/(la+lb) ≤ 2*min(la,lb)/(la+lb) 이므로 길이만으로 걸러낼 수 있음
+        return 2 * min(query_len, len(key)) / (query_len + len(key)) >= (min_score - 0.5) / 100  # 반올림 포함
+
+    def _score_candidates(self, query: str, candidates: List[str]) -> np.ndarray:
+        """후보 키 fuzz.ratio (fuzzywuzzy와 같은 정수 점수)"""
+        if rf_process is not None:
+            return np.rint(rf_process.cdist([query], candidates, scorer=rf_fuzz.ratio)[0]).astype(int)
+        return np.array(_fuzz_pairs([query] * len(candidates), candidates), dtype=int)
+
+    def best_fuzzy(self, query: str, min_score: int = 80) -> Tuple[Optional[str], int]:
+        """fuzz.ratio 최고점 키와 점수 (min_score 미만이면 (None, 블록 후보 최고점))
+
+        블록 후보 최고점이 min_score 이상이면 후보 안에서 고르고, 아니면 전체 키를 다시 채점
+        """
+        positions = self._candidates(query, min_score)
+        best_score = 0
+        if positions:
+            scores = self._score_candidates(query, [self.keys[p] for p in positions])
+            best_score = int(scores.max())
+            if best_score >= min_score:
+                return self.keys[positions[int(np.argmax(scores))]], best_score  # 후보는 map 순서 정렬
+        found = self._full_scan(query, min_score)
+        if found is None:
+            return None, best_score
+        return found
+
+    def _full_scan(self, query: str, floor: int) -> Optional[Tuple[str, int]]:
+        """전체 키 중 점수가 floor 이상인 최고점 키 (동점이면 map 순서상 앞선 키), 없으면 None"""
+        if rf_process is not None:
+            # 반올림 후 floor가 되는 점수까지 포함 (C 구현 + score_cutoff로 조기 종료)
+            found = rf_process.extract(query, self.keys, scorer=rf_fuzz.ratio, score_cutoff=floor - 0.5,
+                                       limit=None)
+            scored = [(int(np.rint(score)), index) for _, score, index in found]
+            scored = [(score, index) for score, index in scored if score >= floor]
+            if not scored:
+                return None
+            top = max(score for score, _ in scored)
+            return self.keys[min(index for score, index in scored if score == top)], top
+        best_key, best_score = None, floor - 1
+        query_len = len(query)
+        for key in self.keys:
+            if not self._reachable(query_len, key, floor):
+                continue
+            score = fuzz.ratio(query, key)
+            if score > best_score:
+                best_key, best_score = key, score
+        return None if best_key is None else (best_key, best_score)
+
+    def fingerprint(self) -> bytes:
+        """키 목록(순서 포함)과 블로킹 설정의 해시 - 같으면 같은 조회는 같은 fuzzy 결과 (row_cache 매칭 재사용)"""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(repr((self.ngram, self.top_k, self.max_block_ratio)).encode('utf-8'),
+                                     digest_size=16)
+            for key in self.keys:
+                digest.update(key.encode('utf-8', 'surrogatepass') + b'\x1f')
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def lookup(self, excel_key: str, min_score: int = 80, fuzzy_memo: Optional[Dict[str, Optional[str]]] = None
+               ) -> Tuple[Optional[Dict[str, Any]], str, Optional[str]]:
+        """(레코드, 매칭된 키, 방식) - 방식: 'key' / 'manage_no' / 'fuzzy' / None(실패)
+
+        fuzzy_memo: 엑셀 키 → fuzzy 매칭된 키(실패는 None) - 있으면 전체 키 채점 대신 재사용하고, 새 결과를 채워 넣음
+        """
+        data = self.json_data_map.get(excel_key)
+        if data is not None:
+            return data, excel_key, 'key'
+
+        data = self.by_manage_no.get(normalize_key(excel_key))
+        if data is not None:
+            return data, excel_key, 'manage_no'
+
+        if fuzzy_memo is not None and excel_key in fuzzy_memo:
+            best_key = fuzzy_memo[excel_key]
+        else:
+            best_key, _ = self.best_fuzzy(excel_key, min_score)
+            if fuzzy_memo is not None:
+                fuzzy_memo[excel_key] = best_key
+        if best_key is not None:
+            return self.json_data_map[best_key], best_key, 'fuzzy'
+        return None, excel_key, None
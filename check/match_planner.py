@@ -0,0 +1,148 @@
+"""표본으로 매칭 전략별 비용을 추정해 가장 싼 전략을 고르는 플래너 (reconcile --strategy auto).
+
+개요
+- 오른쪽 시트: 관리번호 고유값 수와 중복률 (ContractMatcher 색인에서 바로 계산)
+- 왼쪽 시트 표본(sample_size행, 고정 시드): ContractMatcher.profile()로 측정
+  - 관리번호 정확 일치율, 행당 후보 쌍 수, 전체 재채점으로 넘어가는 행 비율
+  - 후보 찾기/쌍 채점/전체 채점 셀 단위 시간
+  - 전체 재채점 대상 일부를 실제로 전체 채점해 블로킹 누락(후보 밖에 기준 이상 행) 확인
+- 전략별 예상 비교 쌍 수와 시간 (n: 왼쪽 행 수, m: 오른쪽 행 수, 시간은 워커 수로 나눔)
+  - full: n × m
+  - key: 관리번호 후보 + (관리번호 없음/기준 미만 비율) × n × m
+  - blocked: 관리번호/블로킹 후보 + 재채점 비율 × n × m
+  - blocked_only: 관리번호/블로킹 후보만 - 누락률 상한(Wilson)으로 구한 재현율이 min_recall 이상일 때만 후보
+- 선택: full 예상 시간이 small_seconds 이하면 full (작은 비교는 단순하고 정확하게),
+  아니면 재현율을 지키는 전략 중 예상 시간이 가장 짧은 것
+- 일대일 할당(edges)도 후보 구성이 같으므로 같은 추정치를 사용
+"""
+
+import math
+import os
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from contract_matcher import STRATEGIES, ContractMatcher
+from parallel_match import format_seconds
+
+# 재현율을 그대로 유지하는 전략 (기준 미만이면 전체 채점으로 확인)
+_EXACT_RECALL = ('full', 'key', 'blocked')
+
+
+def wilson_interval(successes: float, total: float, z: float = 1.96) -> Tuple[float, float]:
+    """비율의 Wilson 신뢰구간 (기본 95%) - 표본이 작거나 비율이 0/1에 가까워도 구간이 안정적
+
+    total: 표본 수 (가중 표본이면 유효 표본 수 - 소수여도 됨)
+    """
+    if total <= 0:
+        return 0.0, 1.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def _pad(text: str, width: int, right: bool = False) -> str:
+    """한글(전각) 문자를 2칸으로 세어 표 칸 맞춤"""
+    size = sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+    fill = ' ' * max(0, width - size)
+    return fill + text if right else text + fill
+
+
+def _duration(seconds: float) -> str:
+    return f"{seconds:.1f}초" if seconds < 10 else format_seconds(seconds)
+
+
+class MatchPlan:
+    """플래너 결과 - 선택한 전략과 전략별 추정치 (pairs, seconds, recall)"""
+
+    def __init__(self, strategy: str, reason: str, rows: int, right_rows: int, workers: int,
+                 right_stats: Dict[str, float], profile: Dict[str, float],
+                 estimates: Dict[str, Tuple[float, float, Optional[float]]], min_recall: float):
+        self.strategy = strategy
+        self.reason = reason
+        self.rows = rows
+        self.right_rows = right_rows
+        self.workers = workers
+        self.right_stats = right_stats
+        self.profile = profile
+        self.estimates = estimates
+        self.min_recall = min_recall
+
+    def explain(self) -> str:
+        profile, right = self.profile, self.right_stats
+        sample = int(profile['rows'])
+        lines = [
+            f"[매칭 계획] 왼쪽 {self.rows:,}행 × 오른쪽 {self.right_rows:,}행 (표본 {sample:,}행, 워커 {self.workers}개)",
+            f"  - 오른쪽 관리번호: 고유 {int(right['unique_keys']):,}개 / 값 있는 행 {int(right['keyed_rows']):,}개 "
+            f"(중복률 {right['duplicate_rate']:.1%})",
+            f"  - 표본 관리번호 정확 일치 {profile['key_hit']:.1%}, 행당 후보 쌍 "
+            f"{profile['key_pairs'] / max(sample, 1):.1f}(관리번호) + {profile['block_pairs'] / max(sample, 1):.1f}(블로킹), "
+            f"전체 재채점 비율 {profile['rescan_blocked']:.1%}",
+        ]
+        if profile['probed']:
+            lines.append(f"  - 블로킹 누락 확인: 재채점 대상 {int(profile['probed'])}행 중 "
+                         f"{int(profile['missed'])}행이 후보 밖에서 기준 이상")
+        lines.append(f"  {_pad('전략', 13)}{_pad('비교 쌍', 16, True)}  {_pad('예상 시간', 10, True)}  재현율")
+        for strategy, (pairs, seconds, recall) in self.estimates.items():
+            if recall is None:
+                recall_text = '유지'
+            else:
+                recall_text = f"≥ {recall:.1%}"
+                if recall < self.min_recall:
+                    recall_text += f" (기준 {self.min_recall:.0%} 미만, 제외)"
+            mark = '→ ' if strategy == self.strategy else '  '
+            lines.append(f"{mark}{strategy:<13}{int(pairs):>16,}  {_pad(_duration(seconds), 10, True)}  {recall_text}")
+        lines.append(f"  → {self.strategy} 선택 ({self.reason})")
+        return '\n'.join(lines)
+
+
+def _right_stats(matcher: ContractMatcher) -> Dict[str, float]:
+    keyed_rows = sum(len(positions) for positions in matcher.key_positions.values())
+    unique_keys = len(matcher.key_positions)
+    return {
+        'unique_keys': unique_keys,
+        'keyed_rows': keyed_rows,
+        'duplicate_rate': 1 - unique_keys / keyed_rows if keyed_rows else 0.0,
+    }
+
+
+def plan_match(matcher: ContractMatcher, left: pd.DataFrame, workers: int = 1, sample_size: int = 500,
+               probe_rows: int = 50, min_recall: float = 0.99, small_seconds: float = 1.0,
+               seed: int = 0) -> MatchPlan:
+    """왼쪽 시트 표본으로 전략별 비용을 추정해 MatchPlan 반환 (실제 매칭은 하지 않음)"""
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    n, m = len(left), matcher.size
+    rng = np.random.default_rng(seed)
+    positions = np.sort(rng.choice(n, size=min(sample_size, n), replace=False)) if n else np.zeros(0, dtype=int)
+    profile = matcher.profile(left.iloc[positions], probe_rows=probe_rows)
+    sample = max(int(profile['rows']), 1)
+
+    key_pairs = profile['key_pairs'] / sample * n
+    candidate_pairs = (profile['key_pairs'] + profile['block_pairs']) / sample * n
+    candidate_cost = n * profile['candidate_seconds'] + candidate_pairs * profile['pair_seconds']
+    cell = profile['cell_seconds']
+    estimates: Dict[str, Tuple[float, float, Optional[float]]] = {
+        'full': (n * m, n * m * cell, None),
+        'key': (key_pairs + profile['rescan_key'] * n * m,
+                key_pairs * profile['pair_seconds'] + profile['rescan_key'] * n * m * cell, None),
+        'blocked': (candidate_pairs + profile['rescan_blocked'] * n * m,
+                    candidate_cost + profile['rescan_blocked'] * n * m * cell, None),
+    }
+    # blocked_only 누락률: 재채점 대상 중 확인한 행의 누락 비율을 표본 전체 재채점 행 수로 환산해 상한 추정
+    rescan_rows = profile['rescan_blocked'] * sample
+    missed = profile['missed'] / profile['probed'] * rescan_rows if profile['probed'] else 0.0
+    recall = 1 - wilson_interval(missed, sample)[1]
+    estimates['blocked_only'] = (candidate_pairs, candidate_cost, recall)
+    estimates = {strategy: (pairs, seconds / workers, recall)
+                 for strategy, (pairs, seconds, recall) in estimates.items()}
+
+    if estimates['full'][1] <= small_seconds:
+        strategy, reason = 'full', f"전체 비교 예상 시간이 {_duration(small_seconds)} 이하라 단순 전수 비교"
+    else:
+        allowed = [s for s in STRATEGIES if s in _EXACT_RECALL or estimates[s][2] >= min_recall]
+        strategy = min(allowed, key=lambda s: estimates[s][1])
+        reason = "재현율 기준을 지키는 전략 중 예상 시간이 가장 짧음"
+    return MatchPlan(strategy, reason, n, m, workers, _right_stats(matcher), profile, estimates, min_recall)
@@ -0,0 +1,193 @@
+"""ContractMatcher 채점을 왼쪽 행 청크 단위로 나눠 프로세스 풀에서 실행하는 모듈.
+
+개요
+- 오른쪽 시트의 정규화 문자열(비교 컬럼/관리번호/블로킹 텍스트)은 공유 메모리에 한 번만 올림
+  - UTF-8 바이트 버퍼 + 오프셋(NumPy int64) 두 블록이라 작업마다 pickle 하지 않음
+  - 워커는 시작할 때 한 번 복원해 같은 설정의 ContractMatcher(관리번호/n-gram 색인 포함)를 만듦
+- 작업 단위: 왼쪽 행 chunk_size개 (매칭에 쓰는 열만 잘라 전달)
+  - 왼쪽 행끼리는 서로 영향이 없으므로 왼쪽 행 순서로 합친 결과가 순차 실행과 같음
+- 워커 안의 rapidfuzz 스레드는 1개로 제한 (워커 수 × 코어 수만큼 스레드가 생기지 않도록)
+- 청크가 끝날 때마다 처리 행 수/경과 시간/남은 시간(ETA) 출력 (1초에 한 번까지)
+
+사용 예시
+    matches = run_chunked(matcher, left, 'match', workers=16)
+    edges = run_chunked(matcher, left, 'edges', workers=0)  # 0: CPU 코어 수
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import contract_matcher
+import fuzzy_cache
+from contract_matcher import ContractMatcher, MatchColumn
+
+MATCH_KINDS = ('match', 'edges')
+
+
+class SharedTexts:
+    """이름 → 문자열 배열 묶음을 공유 메모리 두 블록(UTF-8 바이트, 오프셋)에 올림 (만든 프로세스가 close로 해제)"""
+
+    def __init__(self, texts: Dict[str, np.ndarray]):
+        self.layout: List[Tuple[str, int]] = [(name, len(values)) for name, values in texts.items()]
+        encoded = [str(text).encode('utf-8', 'surrogatepass') for values in texts.values() for text in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+
+        self.data = shared_memory.SharedMemory(create=True, size=max(1, int(offsets[-1])))
+        self.offsets = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+        self.data.buf[:int(offsets[-1])] = b''.join(encoded)
+        view = np.ndarray(offsets.shape, dtype=np.int64, buffer=self.offsets.buf)
+        view[:] = offsets
+        del view  # 버퍼를 참조하는 배열이 남아 있으면 close 불가
+
+    @property
+    def descriptor(self) -> Tuple[str, str, List[Tuple[str, int]]]:
+        """워커에 넘기는 정보 (공유 메모리 이름과 배열 구성만, 문자열은 포함하지 않음)"""
+        return self.data.name, self.offsets.name, self.layout
+
+    def close(self) -> None:
+        for block in (self.data, self.offsets):
+            block.close()
+            block.unlink()
+
+    @staticmethod
+    def load(descriptor: Tuple[str, str, List[Tuple[str, int]]]) -> Dict[str, np.ndarray]:
+        """공유 메모리에서 문자열 배열 묶음 복원 (워커에서 한 번 호출, 복원 후 블록은 바로 닫음)"""
+        data_name, offsets_name, layout = descriptor
+        total = sum(count for _, count in layout)
+        data_block, offsets_block = _attach(data_name), _attach(offsets_name)
+        try:
+            offsets = np.ndarray((total + 1,), dtype=np.int64, buffer=offsets_block.buf).copy()
+            data = bytes(data_block.buf[:int(offsets[-1])])
+        finally:
+            data_block.close()
+            offsets_block.close()
+
+        texts: Dict[str, np.ndarray] = {}
+        start = 0
+        for name, count in layout:
+            bounds = offsets[start:start + count + 1].tolist()
+            texts[name] = np.array(
+                [data[a:b].decode('utf-8', 'surrogatepass') for a, b in zip(bounds[:-1], bounds[1:])], dtype=object
+            )
+            start += count
+        return texts
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """기존 공유 메모리 블록 열기 (해제는 만든 프로세스 몫)
+
+    Python 3.12 이하는 열 때도 resource_tracker에 등록하지만, 풀 워커는 부모와 같은 tracker를 쓰므로
+    같은 이름이 한 번 더 등록될 뿐이고 부모의 unlink 때 함께 정리됨
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class _Progress:
+    """처리 행 수 기준 진행률/경과/남은 시간 출력"""
+
+    def __init__(self, label: str, total: int, interval: float = 1.0):
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.started = time.monotonic()
+        self.printed = 0.0
+
+    def update(self, rows: int) -> None:
+        self.done += rows
+        now = time.monotonic()
+        if now - self.printed < self.interval and self.done < self.total:
+            return
+        self.printed = now
+        elapsed = now - self.started
+        remaining = elapsed / self.done * (self.total - self.done) if self.done else 0
+        print(f"  [진행] {self.label} {self.done:,}/{self.total:,}행 ({self.done / self.total:.0%}) - "
+              f"경과 {format_seconds(elapsed)}, 남은 시간 약 {format_seconds(remaining)}")
+
+
+def format_seconds(seconds: float) -> str:
+    """초 → '42초' / '3분 05초' / '1시간 02분'"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}초"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}분 {seconds:02d}초"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}시간 {minutes:02d}분"
+
+
+# 워커 프로세스마다 한 번 만드는 매처 (_init_worker)
+_worker_matcher: Optional[ContractMatcher] = None
+
+
+def _init_worker(descriptor, columns: List[MatchColumn], options: Dict,
+                 score_cache: Optional[Tuple] = None) -> None:
+    global _worker_matcher
+    contract_matcher.RAPIDFUZZ_WORKERS = 1
+    if score_cache is not None:
+        fuzzy_cache.enable(*score_cache)
+    _worker_matcher = ContractMatcher.from_texts(SharedTexts.load(descriptor), columns, **options)
+
+
+def _run_chunk(kind: str, start: int, chunk: pd.DataFrame, exhaustive: bool, strategy: str) -> pd.DataFrame:
+    if kind == 'edges':
+        result = _worker_matcher.edges(chunk, exhaustive=exhaustive, strategy=strategy)
+        result['left_position'] += start
+        return result
+    return _worker_matcher.match(chunk, exhaustive=exhaustive, strategy=strategy)
+
+
+def run_chunked(matcher: ContractMatcher, left: pd.DataFrame, kind: str = 'match', exhaustive: bool = False,
+                workers: int = 0, chunk_size: int = 2000, strategy: str = 'blocked') -> pd.DataFrame:
+    """matcher.match(left) / matcher.edges(left)와 같은 결과를 워커 workers개로 나눠 계산
+
+    workers: 0이면 CPU 코어 수, 1이면 현재 프로세스에서 바로 실행
+    chunk_size: 작업 하나의 최대 왼쪽 행 수 (워커마다 청크가 4개 이상 돌아가도록 더 작게 나눔)
+    strategy: ContractMatcher 매칭 전략 (contract_matcher.STRATEGIES)
+    """
+    if kind not in MATCH_KINDS:
+        raise ValueError(f"지원하지 않는 매칭 종류: {kind} (가능: {', '.join(MATCH_KINDS)})")
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    chunk_size = max(1, min(chunk_size, math.ceil(len(left) / (workers * 4))))
+    if workers <= 1 or len(left) <= chunk_size:
+        return getattr(matcher, kind)(left, exhaustive=exhaustive, strategy=strategy)
+
+    # 매칭에 쓰는 왼쪽 열만 전달
+    left = left[list(dict.fromkeys(column.left for column in matcher.columns))].reset_index(drop=True)
+    starts = list(range(0, len(left), chunk_size))
+    print(f"[병렬 매칭] 워커 {workers}개, {len(starts)}개 청크 (청크당 최대 {chunk_size}행)")
+
+    shared = SharedTexts(matcher.texts)
+    results: Dict[int, pd.DataFrame] = {}
+    progress = _Progress('매칭' if kind == 'match' else '후보 채점', len(left))
+    try:
+        fork = 'fork' in multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context('fork') if fork else multiprocessing.get_context()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                                 initargs=(shared.descriptor, matcher.columns, matcher.options,
+                                           fuzzy_cache.settings())) as executor:
+            futures = {
+                executor.submit(_run_chunk, kind, start, left.iloc[start:start + chunk_size], exhaustive,
+                                strategy): start
+                for start in starts
+            }
+            for future in as_completed(futures):
+                start = futures[future]
+                results[start] = future.result()
+                progress.update(min(chunk_size, len(left) - start))
+    finally:
+        shared.close()
+    return pd.concat([results[start] for start in starts], ignore_index=True)
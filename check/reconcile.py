@@ -0,0 +1,354 @@
+"""TOML 비교 스펙으로 두 시트를 대조해 컬럼별 불일치 리포트를 만드는 공용 엔진.
+
+개요
+- 스펙(check/specs/*.toml): 입력 파일/시트, 비교 컬럼(왼쪽 열, 오른쪽 열, 가중치, 정규화), 매칭/불일치 기준, 결과 시트 구성
+- ReconcilePlan: 스펙을 검증해 실행 계획으로 컴파일
+  - 비교 컬럼 → contract_matcher.MatchColumn (정규화 함수 포함)
+  - 컬럼별 불일치 시트 이름/웹 데이터 컬럼명, 종합 불일치 시트 구성
+- 실행: 두 시트를 읽고 → 컬럼마다 한 번씩 정규화 → ContractMatcher로 행 짝짓기(컬럼별 일괄 채점)
+  → 불일치 시트를 컬럼 단위로 만들어 ReportWriter로 저장
+- 매칭 전략(match.strategy, --strategy): key / blocked / blocked_only / full 또는 auto(기본)
+  - auto: 왼쪽 시트 표본으로 전략별 비교 쌍/예상 시간을 추정해 가장 싼 전략 선택, 실행 전 explain 출력 (match_planner.py)
+- 짝짓기 방식
+  - 기본: 왼쪽 행마다 최고점 오른쪽 행 (여러 왼쪽 행이 같은 오른쪽 행에 붙을 수 있음, 기존 방식)
+  - 일대일 할당(match.assignment = greedy / hungarian, --assign): 후보 간선 그래프에서 일대일로 짝짓고
+    짝이 없는 양쪽 행을 '미매칭_<시트명>' 시트로 따로 기록 (assignment.py)
+- --workers N: 채점을 왼쪽 행 청크로 나눠 N개 프로세스에서 실행 (parallel_match.py, 결과는 같음)
+- --score-cache: 유사도 점수를 디스크 캐시(fuzzy_cache.py)에 남겨 다음 실행에서 재사용
+  (rapidfuzz가 없어 fuzzywuzzy로 순차 채점할 때만 효과가 있어 기본은 끔)
+- 새 비교가 필요하면 스크립트를 복사하지 말고 스펙 파일만 추가
+
+사용 예시
+    cd check
+    python reconcile.py specs/contract_data_migration.toml
+    python reconcile.py specs/contract_data_origin.toml --file 다른문서.xlsx --exhaustive
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import fuzzy_cache
+import numpy as np
+import pandas as pd
+from assignment import ASSIGNMENT_METHODS, assign
+from column_compare import normalize_array
+from contract_matcher import STRATEGIES, ContractMatcher, MatchColumn, rf_process, text_array
+from match_planner import plan_match
+from parallel_match import run_chunked
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10 이하
+    import tomli as tomllib  # type: ignore
+
+# 저장소 루트의 utils 패키지 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.excel_cache import read_workbook
+from utils.report_writer import SIDECAR_FORMATS, ReportWriter
+
+SPEC_DIR = Path(__file__).resolve().parent / 'specs'
+
+
+def _strip_array(values) -> np.ndarray:
+    return np.array([str(value).strip() if pd.notna(value) else '' for value in values], dtype=object)
+
+
+def _compact_array(values) -> np.ndarray:
+    return np.array([''.join(str(value).split()) if pd.notna(value) else '' for value in values], dtype=object)
+
+
+def _lower_array(values) -> np.ndarray:
+    return np.array([text.lower() for text in normalize_array(values)], dtype=object)
+
+
+# 스펙의 normalizer 이름 → 값 배열을 비교용 문자열 배열로 바꾸는 함수
+NORMALIZERS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'str': text_array,           # str() 그대로 (결측은 'nan', 기존 스크립트와 동일)
+    'strip': _strip_array,       # 양끝 공백 제거, 결측은 ''
+    'whitespace': normalize_array,  # 연속 공백을 한 칸으로, 결측은 '' (check_json_to_excel과 동일)
+    'compact': _compact_array,   # 공백 전부 제거, 결측은 ''
+    'lower': _lower_array,       # whitespace + 소문자
+}
+
+
+class SpecError(ValueError):
+    """스펙 파일 형식/내용 오류"""
+
+
+def _require(table: Dict[str, Any], key: str, where: str, kind=str):
+    value = table.get(key)
+    if value is None:
+        raise SpecError(f"{where}.{key} 항목이 없습니다")
+    if not isinstance(value, kind):
+        raise SpecError(f"{where}.{key} 형식이 올바르지 않습니다: {value!r}")
+    return value
+
+
+class SheetPlan:
+    """비교 컬럼 하나의 불일치 시트 구성"""
+
+    def __init__(self, column: MatchColumn, sheet: str, web_label: str, mismatch_below: float,
+                 missing_value: str):
+        self.column = column
+        self.sheet = sheet
+        self.web_label = web_label
+        self.mismatch_below = mismatch_below
+        self.missing_value = missing_value
+
+
+class ReconcilePlan:
+    """검증한 스펙 → 실행 계획 (매칭 컬럼, 시트 구성)"""
+
+    def __init__(self, spec: Dict[str, Any], name: str = ''):
+        self.name = spec.get('name') or name
+
+        source = _require(spec, 'source', 'spec', dict)
+        self.file = _require(source, 'file', 'source')
+        self.left_sheet = _require(source, 'left_sheet', 'source')
+        self.right_sheet = _require(source, 'right_sheet', 'source')
+        self.output = _require(_require(spec, 'output', 'spec', dict), 'file', 'output')
+
+        match = spec.get('match', {})
+        self.min_score = match.get('min_score', 80)
+        self.mismatch_below = match.get('mismatch_below', 100)
+        default_normalizer = match.get('normalizer', 'str')
+        self.assignment = match.get('assignment')  # None: 최고점 매칭 / greedy / hungarian
+        if self.assignment is not None and self.assignment not in ASSIGNMENT_METHODS:
+            raise SpecError(f"match.assignment 를 알 수 없습니다: {self.assignment} (가능: {', '.join(ASSIGNMENT_METHODS)})")
+        self.assign_min_score = match.get('assign_min_score', self.min_score)
+        self.min_recall = match.get('min_recall', 0.99)  # auto 전략에서 blocked_only를 허용할 재현율 하한
+        self.strategy = match.get('strategy', 'auto')
+        if self.strategy not in ('auto', *STRATEGIES):
+            raise SpecError(f"match.strategy 를 알 수 없습니다: {self.strategy} (가능: auto, {', '.join(STRATEGIES)})")
+
+        self.sheets: List[SheetPlan] = []
+        columns = _require(spec, 'columns', 'spec', list)
+        for i, column in enumerate(columns):
+            where = f'columns[{i}]'
+            column_name = _require(column, 'name', where)
+            normalizer = column.get('normalizer', default_normalizer)
+            if normalizer not in NORMALIZERS:
+                raise SpecError(f"{where}.normalizer 를 알 수 없습니다: {normalizer} (가능: {', '.join(NORMALIZERS)})")
+            weight = _require(column, 'weight', where, (int, float))
+            match_column = MatchColumn(column_name, _require(column, 'left', where), column.get('right'), weight,
+                                       NORMALIZERS[normalizer])
+            self.sheets.append(SheetPlan(
+                match_column,
+                sheet=column.get('sheet', f'{column_name}_불일치'),
+                web_label=column.get('web_label', f'웹 데이터 {column_name}'),
+                mismatch_below=column.get('mismatch_below', self.mismatch_below),
+                missing_value=column.get('missing_value', '해당 컬럼 없음'),
+            ))
+        if not self.sheets:
+            raise SpecError("columns 가 비어 있습니다")
+        self.columns = [sheet.column for sheet in self.sheets]
+
+        names = [column.name for column in self.columns]
+        self.key = match.get('key')
+        self.block_on = match.get('block_on', [])
+        for column_name in ([self.key] if self.key else []) + list(self.block_on):
+            if column_name not in names:
+                raise SpecError(f"match 에 쓴 컬럼 이름이 columns 에 없습니다: {column_name}")
+
+        report = spec.get('report', {})
+        self.base_columns: Dict[str, Any] = report.get('base_columns') or {c.name: c.left for c in self.columns}
+        self.score_label = report.get('score_label', '유사성 점수')
+        self.overall_sheet = report.get('overall_sheet', '종합_불일치')
+        self.overall_label = report.get('overall_label', '종합 유사성 점수')
+        self.column_score_suffix = report.get('column_score_suffix', ' 유사성')
+        self.unmatched_left_sheet = report.get('unmatched_left_sheet', f'미매칭_{self.left_sheet}')
+        self.unmatched_right_sheet = report.get('unmatched_right_sheet', f'미매칭_{self.right_sheet}')
+        self.candidate_label = report.get('candidate_label', '최고 후보 점수')
+
+        total_weight = sum(column.weight for column in self.columns)
+        if not math.isclose(total_weight, 1.0):
+            print(f"⚠ [{self.name}] 가중치 합이 1이 아닙니다 ({total_weight:g}) - 종합 점수 최대값이 100이 아닙니다.")
+
+    @classmethod
+    def from_file(cls, path) -> 'ReconcilePlan':
+        path = Path(path)
+        with open(path, 'rb') as f:
+            try:
+                spec = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise SpecError(f"{path.name}: TOML 형식 오류 - {e}") from e
+        try:
+            return cls(spec, name=path.stem)
+        except SpecError as e:
+            raise SpecError(f"{path.name}: {e}") from e
+
+    def _check_columns(self, left: pd.DataFrame, right: pd.DataFrame) -> None:
+        missing = [f"{self.left_sheet}.{col}" for col in
+                   [c.left for c in self.columns] + list(self.base_columns.values()) if col not in left.columns]
+        missing += [f"{self.right_sheet}.{c.right}" for c in self.columns
+                    if c.right is not None and c.right not in right.columns]
+        if missing:
+            raise SpecError(f"엑셀에 없는 열: {', '.join(dict.fromkeys(missing))}")
+
+    def matcher(self, right: pd.DataFrame) -> ContractMatcher:
+        return ContractMatcher(right, self.columns, key=self.key, block_on=self.block_on, min_score=self.min_score)
+
+    def _strategy(self, matcher: ContractMatcher, left: pd.DataFrame, exhaustive: bool, strategy: Optional[str],
+                  workers: int) -> str:
+        """실행할 매칭 전략 (--exhaustive → full, auto면 표본으로 비용을 추정해 선택하고 explain 출력)"""
+        if exhaustive:
+            return 'full'
+        strategy = strategy or self.strategy
+        if strategy != 'auto':
+            return strategy
+        match_plan = plan_match(matcher, left, workers=workers, min_recall=self.min_recall)
+        print(match_plan.explain())
+        return match_plan.strategy
+
+    def _assign(self, matcher: ContractMatcher, left: pd.DataFrame, right: pd.DataFrame, strategy: str,
+                assignment: str, workers: int = 1):
+        """일대일 할당 → (왼쪽 행 순서 매칭 결과(미매칭은 right_position -1), 왼쪽/오른쪽 최고 후보 점수)"""
+        edges = run_chunked(matcher, left, 'edges', workers=workers, strategy=strategy)
+        chosen, stats = assign(edges, assignment, min_score=self.assign_min_score)
+
+        arrays = {'right_position': np.full(len(left), -1, dtype=np.int64), 'overall_score': np.zeros(len(left))}
+        for column in self.columns:
+            arrays[column.name] = np.zeros(len(left), dtype=np.int16)
+        rows = chosen['left_position'].to_numpy()
+        for name, array in arrays.items():
+            array[rows] = chosen[name].to_numpy()
+        matches = pd.DataFrame(arrays)
+
+        # 미매칭 행 참고용: 할당과 무관하게 후보 중 가장 높았던 종합 점수
+        left_best = edges.groupby('left_position')['overall_score'].max().reindex(range(len(left)))
+        right_best = edges.groupby('right_position')['overall_score'].max().reindex(range(len(right)))
+
+        unmatched_left = len(left) - len(chosen)
+        unmatched_right = len(right) - len(chosen)
+        print(f"일대일 할당({assignment}): {len(chosen)}쌍 매칭, 미매칭 {self.left_sheet} {unmatched_left}행 / "
+              f"{self.right_sheet} {unmatched_right}행 (후보 간선 {stats['edges']}개, 기준 {self.assign_min_score}점 이상)")
+        if stats['greedy_fallback']:
+            print(f"  ⚠ 너무 큰 연결 요소 {stats['greedy_fallback']}개는 greedy로 할당했습니다.")
+        return matches, left_best.to_numpy(), right_best.to_numpy()
+
+    def reconcile(self, left: pd.DataFrame, right: pd.DataFrame, exhaustive: bool = False,
+                  assignment: Optional[str] = None, workers: int = 1,
+                  strategy: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """두 시트를 대조해 {시트명: 불일치 DataFrame} 반환 (스펙의 컬럼 순서 + 종합 시트 [+ 미매칭 시트])
+
+        assignment: 'greedy' / 'hungarian' 이면 일대일 할당 (기본: 스펙의 match.assignment)
+        workers: 채점 프로세스 수 (0이면 CPU 코어 수, 1이면 현재 프로세스에서)
+        strategy: 매칭 전략 (기본: 스펙의 match.strategy, exhaustive=True면 full)
+        """
+        self._check_columns(left, right)
+        assignment = assignment or self.assignment
+        matcher = self.matcher(right)
+        strategy = self._strategy(matcher, left, exhaustive, strategy, workers)
+        if assignment:
+            matches, left_best, right_best = self._assign(matcher, left, right, strategy, assignment, workers)
+        else:
+            matches = run_chunked(matcher, left, 'match', workers=workers, strategy=strategy)
+            print(f"매칭 방식: {matches['method'].value_counts().to_dict()}")
+        positions = matches['right_position'].to_numpy()
+        matched = positions >= 0
+
+        original = left.astype(object).reset_index(drop=True)  # iterrows 와 같은 파이썬 객체 값
+        web = right.astype(object).iloc[np.where(matched, positions, 0)].reset_index(drop=True)
+        base = pd.DataFrame({label: original[column] for label, column in self.base_columns.items()})
+
+        results: Dict[str, pd.DataFrame] = {}
+        for plan in self.sheets:
+            scores = matches[plan.column.name].to_numpy()
+            mask = matched & (scores < plan.mismatch_below)
+            frame = base[mask].copy()
+            frame[self.score_label] = scores[mask].astype(int)
+            if plan.column.right is None:
+                frame[plan.web_label] = plan.missing_value
+            else:
+                frame[plan.web_label] = web[plan.column.right].to_numpy()[mask]
+            results[plan.sheet] = frame
+
+        overall = matches['overall_score'].to_numpy()
+        mask = matched & (overall < self.mismatch_below)
+        frame = base[mask].copy()
+        frame[self.overall_label] = [round(score, 2) for score in overall[mask].tolist()]
+        for column in self.columns:
+            frame[f'{column.name}{self.column_score_suffix}'] = matches[column.name].to_numpy()[mask].astype(int)
+        results[self.overall_sheet] = frame
+
+        if assignment:
+            # 짝이 없는 행 (왼쪽: 기본 정보, 오른쪽: 원본 행 전체) + 후보 중 최고 점수
+            frame = base[~matched].copy()
+            frame[self.candidate_label] = [None if pd.isna(score) else round(score, 2) for score in left_best[~matched]]
+            results[self.unmatched_left_sheet] = frame
+            assigned = np.zeros(len(right), dtype=bool)
+            assigned[positions[matched]] = True
+            frame = right.astype(object)[~assigned].copy()
+            frame[self.candidate_label] = [None if pd.isna(score) else round(score, 2) for score in right_best[~assigned]]
+            results[self.unmatched_right_sheet] = frame
+        return results
+
+    def run(self, file_path: Optional[str] = None, output_path: Optional[str] = None,
+            exhaustive: bool = False, sidecar: Optional[str] = None,
+            assignment: Optional[str] = None, workers: int = 1, strategy: Optional[str] = None) -> Dict[str, int]:
+        """엑셀을 읽어 대조하고 결과 파일 저장 → {시트명: 불일치 건수}"""
+        file_path = file_path or self.file
+        output_path = output_path or self.output
+        print(f"[{self.name}] {file_path} ({self.left_sheet} ↔ {self.right_sheet})")
+        sheets = read_workbook(file_path, sheet_name=[self.left_sheet, self.right_sheet])
+        results = self.reconcile(sheets[self.left_sheet], sheets[self.right_sheet], exhaustive=exhaustive,
+                                 assignment=assignment, workers=workers, strategy=strategy)
+
+        # 결과를 여러 시트로 나누어 엑셀 파일로 저장 (불일치가 없는 시트는 빈 시트)
+        with ReportWriter(output_path, sidecar=sidecar) as writer:
+            for sheet, frame in results.items():
+                writer.write_frame(sheet, frame)
+
+        print(f"{self.left_sheet} 시트와 {self.right_sheet} 시트 비교 결과가 '{output_path}' 파일로 저장되었습니다.")
+        missing = {plan.sheet for plan in self.sheets if plan.column.right is None}
+        for sheet, frame in results.items():
+            note = f" ({self.right_sheet} 시트에 해당 컬럼 없음)" if sheet in missing else ""
+            print(f"{sheet.replace('_', ' ')}: {len(frame)}개{note}")
+        print("각 시트별로 불일치 데이터를 확인할 수 있습니다.")
+        return {sheet: len(frame) for sheet, frame in results.items()}
+
+
+def main(argv: List[str]) -> int:
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="TOML 스펙 기반 시트 대조 리포트")
+    parser.add_argument("spec", help=f"비교 스펙 파일 (.toml, 예: {SPEC_DIR.name}/contract_data_migration.toml)")
+    parser.add_argument("--file", help="입력 엑셀 파일 (기본: 스펙의 source.file)")
+    parser.add_argument("--output", help="결과 엑셀 파일 (기본: 스펙의 output.file)")
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="관리번호 조인/블로킹 없이 모든 행 쌍을 비교 (기존 전수 비교와 같은 결과, --strategy full과 같음)")
+    parser.add_argument("--strategy", choices=('auto', *STRATEGIES),
+                        help="매칭 전략 (기본: 스펙의 match.strategy, 없으면 auto = 표본으로 비용을 추정해 선택)")
+    parser.add_argument("--sidecar", choices=SIDECAR_FORMATS, help="결과 시트별 CSV/Parquet 파일도 함께 저장")
+    parser.add_argument("--assign", choices=ASSIGNMENT_METHODS,
+                        help="일대일 할당으로 짝짓고 미매칭 행을 따로 기록 (기본: 스펙의 match.assignment, 없으면 최고점 매칭)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="채점을 왼쪽 행 청크로 나눠 N개 프로세스에서 실행 (0이면 CPU 코어 수, 기본 1)")
+    parser.add_argument("--score-cache", action="store_true",
+                        help="유사도 점수를 디스크 캐시(~/.cache/contract_crawler/fuzzy_scores.sqlite)에 남겨 재사용 "
+                             "(rapidfuzz가 없어 fuzzywuzzy로 채점할 때만 빨라짐)")
+    parser.add_argument("--score-cache-mb", type=int, default=fuzzy_cache.DEFAULT_MAX_MB,
+                        help=f"점수 캐시 최대 크기 MB (넘으면 오래 쓰지 않은 항목부터 삭제, 기본 {fuzzy_cache.DEFAULT_MAX_MB})")
+    args = parser.parse_args(argv[1:])
+
+    if args.score_cache:
+        if rf_process is not None:
+            print("ℹ rapidfuzz 일괄 채점이 캐시 조회보다 빨라 점수 캐시를 쓰지 않습니다")
+        else:
+            fuzzy_cache.enable(max_mb=args.score_cache_mb)
+    try:
+        plan = ReconcilePlan.from_file(args.spec)
+        plan.run(args.file, args.output, exhaustive=args.exhaustive, sidecar=args.sidecar, assignment=args.assign,
+                 workers=args.workers, strategy=args.strategy)
+    except (SpecError, FileNotFoundError) as e:
+        print(f"✗ 오류: {e}")
+        return 1
+    finally:
+        fuzzy_cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
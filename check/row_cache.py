@@ -0,0 +1,262 @@
+"""통합본 워크북을 다시 비교할 때 바뀐 행만 비교하는 행 지문 캐시 (check_json_to_excel 증분 비교).
+
+개요
+- 행 지문: blake2b(엑셀 행의 모든 셀 값 + 매칭된 엑셀 관리번호 + 매칭된 JSON 레코드 해시)
+  - 셀 값은 타입 이름 + str() (결과 시트에 원본값이 그대로 들어가므로 정규화 전 값 기준)
+  - JSON 레코드는 키 정렬 직렬화의 해시 (레코드 내용이 바뀌거나 다른 레코드에 매칭되면 지문이 바뀜)
+- 워크북(파일명)마다 지문 → 그 행의 비교 결과 [(시트명, 결과 dict), ...] (pickle) 저장
+- 다시 실행하면 관리번호 매칭(match_rows)은 모든 행에 하고, 지문이 캐시에 없는 행만 compare_rows로 비교
+  - 직접 조회(키/ManageNo)로 못 찾은 관리번호의 fuzzy 매칭 결과(엑셀 키 → JSON 키)도 워크북별로 저장해
+    JSON 키 목록(MatchIndex.fingerprint)이 같으면 전체 키 채점 없이 재사용 (키 목록이 바뀌면 비움)
+  - 레코드 내용 변경은 지문의 레코드 해시로 잡으므로 매칭 재사용과 무관
+  - 행 결과는 다른 행과 무관하므로 캐시 결과와 합쳐 행 위치 순으로 펼치면 전체 비교 결과와 같음
+  - 같은 내용의 행이 여러 개면 지문이 같아 결과 하나를 같이 씀
+- 비교 조건(컬럼 구성, 컬럼 → 필드 매핑 후보, 기준 점수, 캐시 버전)이 바뀌면 그 워크북의 캐시를 비움
+- 실행이 끝나면 이번에 나오지 않은 지문/관리번호는 삭제 (워크북당 현재 행 수만큼만 유지)
+- 워커 프로세스는 워크북마다 따로 연결 (WAL 모드 + 잠금 대기)
+
+기본 위치: <비교결과>/.row_cache.sqlite
+
+사용 예시
+    with RowCache(output_dir / ROW_CACHE_FILENAME) as cache:
+        results, first_row = compare_incremental(cache, excel_path.name, df, key_col, ...)
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+from column_compare import MATCH_SCORE, collect_results, compare_rows, first_row_mismatches, match_rows
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+ROW_CACHE_FILENAME = ".row_cache.sqlite"
+SCHEMA_VERSION = 2
+# 비교 규칙(column_compare)이 바뀌어 저장된 결과를 쓸 수 없게 되면 올림
+COMPARE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workbooks (
+    name TEXT PRIMARY KEY,
+    context BLOB NOT NULL,
+    key_set BLOB
+);
+CREATE TABLE IF NOT EXISTS rows (
+    workbook TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    outputs BLOB NOT NULL,
+    PRIMARY KEY (workbook, fingerprint)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fuzzy_matches (
+    workbook TEXT NOT NULL,
+    excel_key TEXT NOT NULL,
+    matched TEXT,
+    PRIMARY KEY (workbook, excel_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# 셀 경계 / 결측 셀 표시 (셀 값에 나오지 않는 제어 문자)
+_SEPARATOR = '\x1f'
+_MISSING = '\x00'
+
+
+def _digest(*parts: bytes) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, 'little'))  # 길이를 앞에 붙여 경계가 섞이지 않게
+        digest.update(part)
+    return digest.digest()
+
+
+def _record_bytes(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8', 'surrogatepass')
+
+
+def _column_text(column: pd.Series) -> np.ndarray:
+    """셀 값 → '타입 이름:str(값)' (결측은 _MISSING) - 단일 타입 컬럼은 타입 이름을 한 번만 구함"""
+    present = column.notna().to_numpy()
+    text = np.full(len(column), _MISSING, dtype=object)
+    if present.any():
+        values = column[present]
+        if values.dtype != object:
+            kind = type(values.astype(object).iat[0]).__name__
+            text[present] = (kind + ':' + values.astype(object).map(str)).to_numpy()
+        elif infer_dtype(values, skipna=False) == 'string':
+            text[present] = 'str:' + values.to_numpy()
+        else:
+            text[present] = values.map(lambda value: f"{type(value).__name__}:{value}").to_numpy()
+    return text
+
+
+def row_fingerprints(df: pd.DataFrame, matches) -> List[Optional[bytes]]:
+    """행마다 지문 (관리번호가 비어 비교하지 않는 행은 None)
+
+    matches: column_compare.match_rows 결과
+    """
+    row_text = np.full(len(df), '', dtype=object)
+    for col in df.columns:
+        row_text = row_text + _column_text(df[col]) + _SEPARATOR
+    record_hash: Dict[int, bytes] = {}  # 여러 행이 같은 레코드에 매칭되면 한 번만 직렬화
+    fingerprints: List[Optional[bytes]] = []
+    for pos, match in enumerate(matches):
+        if match is None:
+            fingerprints.append(None)
+            continue
+        record, excel_key = match
+        if record is None:
+            json_part = b''
+        else:
+            json_part = record_hash.get(id(record))
+            if json_part is None:
+                json_part = record_hash[id(record)] = _digest(_record_bytes(record))
+        fingerprints.append(_digest(str(row_text[pos]).encode('utf-8', 'surrogatepass'),
+                                    str(excel_key).encode('utf-8', 'surrogatepass'), json_part))
+    return fingerprints
+
+
+def compare_context(df: pd.DataFrame, key_col: Any, contract_name_col: Optional[Any], status_col: Optional[Any],
+                    manager_col: Optional[Any], plan, min_score: int = 80) -> bytes:
+    """행 결과에 영향을 주는 비교 조건의 해시 (다르면 저장된 결과를 쓰지 않음)"""
+    text = repr((
+        COMPARE_VERSION, MATCH_SCORE, min_score,
+        [str(col) for col in df.columns], str(key_col), str(contract_name_col), str(status_col), str(manager_col),
+        [(str(col), plan.mapped[col], plan.fallback_norm[col]) for col in plan.columns],
+    ))
+    return _digest(text.encode('utf-8', 'surrogatepass'))
+
+
+class RowCache:
+    """워크북별 행 지문 → 행 비교 결과 저장소 (SQLite 파일 하나)"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        with self.conn:
+            version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if version is None or int(version[0]) != SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS rows")
+                self.conn.execute("DROP TABLE IF EXISTS fuzzy_matches")
+                self.conn.execute("DROP TABLE IF EXISTS workbooks")
+                self.conn.executescript(_SCHEMA)
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'RowCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def load(self, workbook: str, context: bytes) -> Dict[bytes, bytes]:
+        """저장된 지문 → 결과(pickle) - 비교 조건이 바뀌었으면 (fuzzy 매칭까지) 비우고 빈 dict"""
+        row = self.conn.execute("SELECT context FROM workbooks WHERE name = ?", (workbook,)).fetchone()
+        if row is None or bytes(row[0]) != context:
+            with self.conn:
+                self.conn.execute("DELETE FROM rows WHERE workbook = ?", (workbook,))
+                self.conn.execute("DELETE FROM fuzzy_matches WHERE workbook = ?", (workbook,))
+                self.conn.execute("INSERT OR REPLACE INTO workbooks VALUES (?, ?, NULL)", (workbook, context))
+            return {}
+        return {bytes(fingerprint): outputs for fingerprint, outputs in
+                self.conn.execute("SELECT fingerprint, outputs FROM rows WHERE workbook = ?", (workbook,))}
+
+    def load_matches(self, workbook: str, key_set: bytes) -> Dict[str, Optional[str]]:
+        """저장된 엑셀 키 → fuzzy 매칭 키 - JSON 키 목록이 바뀌었으면 비우고 빈 dict (load 다음에 호출)"""
+        row = self.conn.execute("SELECT key_set FROM workbooks WHERE name = ?", (workbook,)).fetchone()
+        if row is None or row[0] is None or bytes(row[0]) != key_set:
+            with self.conn:
+                self.conn.execute("DELETE FROM fuzzy_matches WHERE workbook = ?", (workbook,))
+                self.conn.execute("UPDATE workbooks SET key_set = ? WHERE name = ?", (key_set, workbook))
+            return {}
+        return dict(self.conn.execute("SELECT excel_key, matched FROM fuzzy_matches WHERE workbook = ?", (workbook,)))
+
+    def save_matches(self, workbook: str, added: Dict[str, Optional[str]], stale: Iterable[str]) -> None:
+        """새로 계산한 fuzzy 매칭 추가 + 이번에 나오지 않은 엑셀 키 삭제"""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO fuzzy_matches VALUES (?, ?, ?)",
+                                  [(workbook, excel_key, matched) for excel_key, matched in added.items()])
+            self.conn.executemany("DELETE FROM fuzzy_matches WHERE workbook = ? AND excel_key = ?",
+                                  [(workbook, excel_key) for excel_key in stale])
+
+    def save(self, workbook: str, added: Dict[bytes, bytes], stale: Iterable[bytes]) -> None:
+        """새로 비교한 행 결과 추가 + 이번에 나오지 않은 지문 삭제"""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?, ?)",
+                                  [(workbook, fingerprint, outputs) for fingerprint, outputs in added.items()])
+            self.conn.executemany("DELETE FROM rows WHERE workbook = ? AND fingerprint = ?",
+                                  [(workbook, fingerprint) for fingerprint in stale])
+
+
+def compare_incremental(
+    cache: RowCache,
+    workbook: str,
+    df: pd.DataFrame,
+    key_col: Any,
+    contract_name_col: Optional[Any],
+    status_col: Optional[Any],
+    manager_col: Optional[Any],
+    plan,
+    match_index,
+    min_score: int = 80,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]:
+    """column_compare.compare_frame과 같은 결과 - 지문이 캐시에 있는 행은 저장된 결과를 재사용
+
+    관리번호 fuzzy 매칭도 JSON 키 목록이 같으면 지난 실행 결과를 재사용
+    """
+    stored = cache.load(workbook, compare_context(df, key_col, contract_name_col, status_col, manager_col, plan,
+                                                  min_score))
+    stored_matches = cache.load_matches(workbook, match_index.fingerprint())
+    fuzzy_memo = dict(stored_matches)
+    matches = match_rows(df, key_col, match_index, min_score, fuzzy_memo)
+    fingerprints = row_fingerprints(df, matches)
+
+    outputs: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
+    reused: Dict[bytes, List[Tuple[str, Dict[str, Any]]]] = {}
+    changed: List[int] = []
+    for pos, fingerprint in enumerate(fingerprints):
+        if fingerprint is None:
+            continue
+        if fingerprint not in reused and fingerprint in stored:
+            reused[fingerprint] = pickle.loads(stored[fingerprint])
+        if fingerprint in reused:
+            outputs[pos] = reused[fingerprint]
+        else:
+            changed.append(pos)
+
+    compared = compare_rows(df, matches, contract_name_col, status_col, manager_col, plan, changed) if changed else {}
+    outputs.update(compared)
+    added: Dict[bytes, bytes] = {}
+    for pos, output in compared.items():
+        if fingerprints[pos] not in added:
+            added[fingerprints[pos]] = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+    current = set(fingerprint for fingerprint in fingerprints if fingerprint is not None)
+    cache.save(workbook, added, [fingerprint for fingerprint in stored if fingerprint not in current])
+    current_keys = set(df[key_col].dropna().map(str).str.strip())
+    new_matches = {key: matched for key, matched in fuzzy_memo.items() if key not in stored_matches}
+    cache.save_matches(workbook, new_matches, [key for key in stored_matches if key not in current_keys])
+
+    keyed = sum(fingerprint is not None for fingerprint in fingerprints)
+    print(f"  ℹ 증분 비교: 비교 대상 {keyed:,}행 중 바뀐 {len(changed):,}행만 다시 비교 "
+          f"(이전 결과 재사용 {keyed - len(changed):,}행, 관리번호 fuzzy 매칭 재사용 "
+          f"{len(stored_matches.keys() & current_keys):,}건 / 새로 계산 {len(new_matches):,}건)")
+    return collect_results(outputs), first_row_mismatches(matches, outputs)
@@ -0,0 +1,216 @@
+"""통합본 워크북 표본 점검 - 전체 비교 전에 컬럼별 불일치율을 몇 초 안에 추정 (check_json_to_excel --sample).
+
+개요
+- 층(stratum): 기업(계열사명 컬럼, 없으면 워크북 전체) × 진행상태
+  - 층마다 최대 per_stratum행을 고정 시드로 무작위 추출 (작은 층도 빠지지 않음)
+  - 층별 추출 비율이 다르므로 행 가중치 = 층 행 수 / 층 표본 수 로 워크북 전체 비율을 추정
+- 표본 행만 column_compare.match_rows / compare_rows로 실제 비교 (전체 비교와 같은 규칙)
+- 항목별 불일치율과 95% 신뢰구간 (Wilson, 가중 표본은 유효 표본 수 Kish n_eff 사용)
+  - JSON 매칭 실패: 관리번호가 있는 표본 행 중 레코드를 못 찾은 비율
+  - 관리번호/계약명/진행상태/담당자 시트, 엑셀 컬럼별 전체 필드 비교: 매칭된 표본 행 중 불일치 비율
+- 체계적 문제: 신뢰구간 하한이 systematic 이상인 항목 (거의 모든 행이 불일치 → 매핑/파티션 문제일 가능성)
+  - 컬럼은 가장 많은 사유와 JSON 필드, 예시 값을 함께 표시해 FIELD_MAPPINGS를 바로 고칠 수 있게 함
+  - 표본 행이 모두 JSON 매칭에 실패한 층도 표시 (기업 파티션/관리번호 형식 문제)
+
+사용 예시
+    report = sample_frame(df, key_col, contract_col, status_col, manager_col, company_col, plan, match_index)
+    print(report.explain())
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from column_compare import compare_rows, match_rows, normalize_array
+from match_planner import wilson_interval
+
+DEFAULT_PER_STRATUM = 20
+# 신뢰구간 하한이 이 값 이상이면 체계적 문제로 표시
+SYSTEMATIC_RATE = 0.9
+# 층 전체 매칭 실패를 표시할 최소 표본 행 수
+_MIN_STRATUM_ROWS = 5
+
+# 기존 방식 비교 시트 (행당 한 번) - 컬럼별 전체 필드 비교는 엑셀 컬럼명으로 따로 집계
+_SUMMARY_SHEETS = ('관리번호_불일치', '계약명_불일치', '진행상태_불일치', '담당자_불일치')
+
+
+def stratified_positions(strata: pd.Series, per_stratum: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """층 값마다 최대 per_stratum행 무작위 추출 → (행 위치 오름차순, 행 가중치 = 층 행 수 / 층 표본 수)"""
+    rng = np.random.default_rng(seed)
+    positions: List[np.ndarray] = []
+    weights: List[np.ndarray] = []
+    for members in strata.groupby(strata.to_numpy(), sort=True).indices.values():
+        chosen = rng.choice(members, size=min(per_stratum, len(members)), replace=False)
+        positions.append(chosen)
+        weights.append(np.full(len(chosen), len(members) / len(chosen)))
+    if not positions:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    positions_arr = np.concatenate(positions)
+    order = np.argsort(positions_arr)
+    return positions_arr[order], np.concatenate(weights)[order]
+
+
+class RateEstimate:
+    """가중 표본으로 추정한 불일치율 하나 (항목, 표본 행 수, 불일치 행 수, 비율, 신뢰구간, 사유/필드/예시)"""
+
+    def __init__(self, item: str, weights: np.ndarray, hits: np.ndarray, reason: str = '', field: str = '',
+                 example: str = ''):
+        self.item = item
+        self.rows = int(len(weights))
+        self.hits = int(hits.sum())
+        total = float(weights.sum())
+        self.rate = float(weights[hits].sum() / total) if total else 0.0
+        n_eff = total * total / float((weights * weights).sum()) if total else 0.0
+        self.low, self.high = wilson_interval(self.rate * n_eff, n_eff) if n_eff else (0.0, 1.0)
+        self.reason = reason
+        self.field = field
+        self.example = example
+
+    def systematic(self, threshold: float) -> bool:
+        return self.rows > 0 and self.low >= threshold
+
+    def line(self) -> str:
+        text = (f"{self.rate:>6.1%} [{self.low:.1%} ~ {self.high:.1%}] "
+                f"({self.hits}/{self.rows}행)  {self.item}")
+        if self.reason:
+            text += f" - {self.reason}"
+        if self.field:
+            text += f", JSON 필드 {self.field}"
+        return text
+
+
+class SampleReport:
+    """워크북 하나의 표본 점검 결과"""
+
+    def __init__(self, rows: int, sample_rows: int, strata: int, keyed: RateEstimate,
+                 estimates: List[RateEstimate], failed_strata: List[Tuple[str, int]], systematic: float):
+        self.rows = rows
+        self.sample_rows = sample_rows
+        self.strata = strata
+        self.keyed = keyed
+        self.estimates = estimates
+        self.failed_strata = failed_strata
+        self.systematic = systematic
+
+    def problems(self) -> List[RateEstimate]:
+        return [estimate for estimate in [self.keyed, *self.estimates] if estimate.systematic(self.systematic)]
+
+    def explain(self) -> str:
+        lines = [
+            f"  표본 {self.sample_rows:,}행 / 전체 {self.rows:,}행 (층 {self.strata}개: 기업 × 진행상태)",
+            "  추정 불일치율 [95% 신뢰구간] (표본 불일치/표본 행)",
+            f"    {self.keyed.line()}",
+        ]
+        shown = [estimate for estimate in self.estimates if estimate.hits]
+        lines.extend(f"    {estimate.line()}" for estimate in shown)
+        if len(shown) < len(self.estimates):
+            lines.append(f"    (표본에서 불일치가 없는 항목 {len(self.estimates) - len(shown)}개 생략)")
+        for estimate in self.problems():
+            note = f"⚠ 체계적 문제 의심: {estimate.item} - 신뢰구간 하한 {estimate.low:.1%}"
+            if estimate is self.keyed:
+                note += " (관리번호 컬럼/기업 파티션 확인)"
+            elif estimate.reason == 'JSON에 해당 필드 없음':
+                note += " (FIELD_MAPPINGS에 대응 필드 추가 필요)"
+            elif estimate.field:
+                note += f" (컬럼 → {estimate.field} 매핑 확인)"
+            lines.append(f"  {note}")
+            if estimate.example:
+                lines.append(f"      예: {estimate.example}")
+        for stratum, rows in self.failed_strata:
+            lines.append(f"  ⚠ 층 '{stratum}': 표본 {rows}행 모두 JSON 매칭 실패 (기업 파티션 확인)")
+        if not self.problems() and not self.failed_strata:
+            lines.append(f"  ✓ 체계적 문제 없음 (모든 항목의 신뢰구간 하한이 {self.systematic:.0%} 미만)")
+        return '\n'.join(lines)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """요약 파일용 항목별 행"""
+        return [{
+            '항목': estimate.item,
+            '표본_행수': estimate.rows,
+            '표본_불일치': estimate.hits,
+            '추정_불일치율': round(estimate.rate, 4),
+            '신뢰구간_하한': round(estimate.low, 4),
+            '신뢰구간_상한': round(estimate.high, 4),
+            '주된_사유': estimate.reason,
+            'JSON_필드': estimate.field,
+            '예시': estimate.example,
+            '판정': '체계적 문제 의심' if estimate.systematic(self.systematic) else '',
+        } for estimate in [self.keyed, *self.estimates]]
+
+
+def sample_frame(
+    df: pd.DataFrame,
+    key_col: Any,
+    contract_name_col: Optional[Any],
+    status_col: Optional[Any],
+    manager_col: Optional[Any],
+    company_col: Optional[Any],
+    plan,
+    match_index,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    seed: int = 0,
+    systematic: float = SYSTEMATIC_RATE,
+) -> SampleReport:
+    """df를 기업 × 진행상태 층별로 표본 추출해 비교하고 항목별 불일치율 추정
+
+    plan: check_json_to_excel.ComparisonPlan (컬럼 → JSON 필드)
+    """
+    def stratum_text(col) -> np.ndarray:
+        if col is None:
+            return np.full(len(df), '', dtype=object)
+        text = normalize_array(df[col].to_numpy())
+        return np.where(text == '', '(없음)', text)
+
+    status = stratum_text(status_col)
+    strata = pd.Series(status if company_col is None else stratum_text(company_col) + ' / ' + status, dtype=object)
+    positions, weights = stratified_positions(strata, per_stratum, seed)
+    sample = df.iloc[positions].reset_index(drop=True)
+    matches = match_rows(sample, key_col, match_index)
+    outputs = compare_rows(sample, matches, contract_name_col, status_col, manager_col, plan)
+
+    # 관리번호가 있는 표본 행 중 매칭 실패
+    keyed = np.array([match is not None for match in matches], dtype=bool)
+    matched = np.array([match is not None and match[0] is not None for match in matches], dtype=bool)
+    keyed_estimate = RateEstimate('JSON_매칭_실패', weights[keyed], ~matched[keyed])
+
+    failed_strata: List[Tuple[str, int]] = []
+    sample_strata = strata.to_numpy()[positions]
+    for stratum in pd.unique(sample_strata):
+        members = (sample_strata == stratum) & keyed
+        if members.sum() >= _MIN_STRATUM_ROWS and not matched[members].any():
+            failed_strata.append((str(stratum), int(members.sum())))
+
+    # 매칭된 행 기준: 시트별 / 엑셀 컬럼별 불일치 행
+    matched_rows = np.flatnonzero(matched)
+    row_index = {pos: i for i, pos in enumerate(matched_rows.tolist())}
+    sheet_hits = {sheet: np.zeros(len(matched_rows), dtype=bool) for sheet in _SUMMARY_SHEETS}
+    column_hits = {col: np.zeros(len(matched_rows), dtype=bool) for col in plan.columns}
+    column_details: Dict[Any, Counter] = {col: Counter() for col in plan.columns}
+    column_example: Dict[Any, str] = {}
+    for pos, output in outputs.items():
+        i = row_index.get(pos)
+        if i is None:
+            continue
+        for sheet, entry in output:
+            if sheet in sheet_hits:
+                sheet_hits[sheet][i] = True
+            elif sheet == '전체필드_불일치':
+                col = entry['엑셀_컬럼명']
+                column_hits[col][i] = True
+                field = entry['JSON_필드명'] if entry['JSON_필드명'] != '(매칭 실패)' else ''
+                column_details[col][(entry['비고'], field)] += 1
+                column_example.setdefault(
+                    col, f"엑셀 '{entry['엑셀_값']}' / JSON '{entry['JSON_값']}' (관리번호 {entry['엑셀_관리번호']})"
+                )
+
+    matched_weights = weights[matched_rows]
+    estimates = [RateEstimate(sheet, matched_weights, hits) for sheet, hits in sheet_hits.items()]
+    for col in plan.columns:
+        details = column_details[col].most_common(1)
+        reason, field = details[0][0] if details else ('', '')
+        estimates.append(RateEstimate(f"컬럼 '{col}'", matched_weights, column_hits[col], reason, field,
+                                      column_example.get(col, '')))
+    estimates.sort(key=lambda estimate: -estimate.rate)
+    return SampleReport(len(df), len(positions), int(strata.nunique()), keyed_estimate, estimates, failed_strata,
+                        systematic)
@@ -21,6 +21,10 @@ from typing import List, Optional
 
 import pandas as pd
 
+# 저장소 루트의 utils 패키지 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.excel_cache import read_workbook
+
 
 def read_excel_sheets(excel_path: Path) -> dict:
     """
@@ -32,7 +36,7 @@ def read_excel_sheets(excel_path: Path) -> dict:
       - "인적정보등록"
       - "CLM계약처첨부파일"
     """
-    xls = pd.ExcelFile(excel_path)
+    all_sheets = read_workbook(excel_path)
 
     required = [
         "CLM등록",
@@ -42,11 +46,11 @@ def read_excel_sheets(excel_path: Path) -> dict:
         "CLM계약처첨부파일",
     ]
 
-    missing = [s for s in required if s not in xls.sheet_names]
+    missing = [s for s in required if s not in all_sheets]
     if missing:
         raise ValueError(f"필수 시트 누락: {', '.join(missing)}")
 
-    sheets = {name: xls.parse(name) for name in required}
+    sheets = {name: all_sheets[name] for name in required}
     return sheets
 
 
@@ -25,6 +25,10 @@ from typing import Dict, List
 
 import pandas as pd
 
+# 저장소 루트의 utils 패키지 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.excel_cache import read_workbook
+
 
 def _normalize_colname(name: str) -> str:
     return (
@@ -65,13 +69,13 @@ def resolve_key_with_fallback(df: pd.DataFrame) -> str | None:
     ])
 
 
-def resolve_sheet(xls: pd.ExcelFile, candidates: List[str]) -> str | None:
+def resolve_sheet(sheet_names: List[str], candidates: List[str]) -> str | None:
     # 정확 매칭
-    for name in xls.sheet_names:
+    for name in sheet_names:
         if name in candidates:
             return name
     # 정규화 매칭
-    norm_map = {_normalize_colname(n): n for n in xls.sheet_names}
+    norm_map = {_normalize_colname(n): n for n in sheet_names}
     for c in candidates:
         key = _normalize_colname(c)
         if key in norm_map:
@@ -80,8 +84,7 @@ def resolve_sheet(xls: pd.ExcelFile, candidates: List[str]) -> str | None:
 
 
 def read_all_sheets(input_path: Path) -> Dict[str, pd.DataFrame]:
-    xls = pd.ExcelFile(input_path)
-    return {name: xls.parse(name) for name in xls.sheet_names}
+    return read_workbook(input_path)
 
 
 def frame_from_A1_as_header(df_raw: pd.DataFrame) -> pd.DataFrame:
@@ -105,25 +108,25 @@ def frame_from_A1_as_header(df_raw: pd.DataFrame) -> pd.DataFrame:
 
 
 def consolidate_by_no(input_excel: Path, output_excel: Path) -> None:
-    xls = pd.ExcelFile(input_excel)
+    # 모든 시트를 한 번에 헤더 없이 로드 (내용이 같은 파일은 캐시에서 로드)
+    raw_sheets: Dict[str, pd.DataFrame] = read_workbook(input_excel, header=None)
+    sheet_names = list(raw_sheets)
 
     # 베이스 시트: CLM
-    base_sheet = resolve_sheet(xls, [
+    base_sheet = resolve_sheet(sheet_names, [
         "CLM",
     ])
     if base_sheet is None:
         raise ValueError("베이스 시트(예: 'CLM')를 찾지 못했습니다.")
 
-    # 모든 시트를 미리 읽되, 각 시트를 헤더 없이 로드하여 A1을 헤더로 변환
-    xls_all = pd.ExcelFile(input_excel)
-    raw_sheets: Dict[str, pd.DataFrame] = {name: xls_all.parse(name, header=None) for name in xls_all.sheet_names}
+    # 각 시트의 A1을 헤더로 변환
     sheets: Dict[str, pd.DataFrame] = {name: frame_from_A1_as_header(df) for name, df in raw_sheets.items()}
 
     # 특수 처리: 상대계약자 시트에 인적정보등록의 "기업명(법인명)" 매핑 및 CLM NO. 기준 콤마 병합
-    rel_sheet_name = resolve_sheet(xls, [
+    rel_sheet_name = resolve_sheet(sheet_names, [
         "CLM_CUSTOMER",
     ])
-    person_sheet_name = resolve_sheet(xls, [
+    person_sheet_name = resolve_sheet(sheet_names, [
         "CLM_USER_CONTACT",
     ])
     if rel_sheet_name and person_sheet_name:
@@ -230,7 +233,7 @@ def consolidate_by_no(input_excel: Path, output_excel: Path) -> None:
         pass
 
     # CLM카테고리 매핑: 대분류/분류 컬럼에 카테고리이름 매핑 (요구사항 1)
-    category_sheet_name = resolve_sheet(xls, [
+    category_sheet_name = resolve_sheet(sheet_names, [
         "CLM_CATEGORY",
     ])
     if category_sheet_name:
@@ -0,0 +1,240 @@
+"""체결 계약서 사본 / 첨부·별첨 파일을 실제로 내려받아 보관하는 모듈.
+
+개요
+- 상세 페이지에서 수집한 첨부 링크를 브라우저 세션 쿠키로 다운로드
+- requests.Session 커넥션 풀 + 스레드 풀로 동시 다운로드 수 제한
+- 스트리밍 저장, HTTP Range 기반 이어받기(.part 파일 유지)
+- SHA-256 기준 콘텐츠 주소 저장소(objects/ab/<sha256>.<ext>)로 중복 제거
+- index.csv 및 by_manage_no/<관리번호>/ 폴더로 관리번호와 파일을 연결
+"""
+
+import csv
+import hashlib
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 첨부 링크를 수집할 상세 페이지 항목명
+ATTACHMENT_FIELDS = ['체결 계약서 사본', '체결계약서 사본', '첨부/별첨']
+
+INDEX_COLUMNS = ['관리번호', '필드', '파일명', 'url', 'sha256', 'size', 'path', 'status']
+
+
+def _safe_filename(name: str) -> str:
+    """파일 시스템에 안전한 파일명으로 변환"""
+    name = re.sub(r'[\\/:*?"<>|\r\n\t]', '_', name).strip()
+    return name or 'attachment'
+
+
+def _filename_from_response(response: requests.Response, fallback: str) -> str:
+    """Content-Disposition → 링크 텍스트 → URL 경로 순으로 파일명 결정"""
+    disposition = response.headers.get('Content-Disposition', '')
+    match = re.search(r"filename\*=(?:UTF-8'')?([^;]+)", disposition, re.IGNORECASE)
+    if match:
+        return _safe_filename(unquote(match.group(1).strip('"')))
+    match = re.search(r'filename="?([^";]+)"?', disposition, re.IGNORECASE)
+    if match:
+        return _safe_filename(match.group(1))
+    if fallback:
+        return _safe_filename(fallback)
+    return _safe_filename(unquote(os.path.basename(urlparse(response.url).path)))
+
+
+class AttachmentHarvester:
+    def __init__(self, store_dir: str = 'attachments', max_workers: int = 4,
+                 chunk_size: int = 1 << 16, timeout: int = 60, max_retries: int = 3):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / 'objects'
+        self.partial_dir = self.store_dir / 'partial'
+        self.view_dir = self.store_dir / 'by_manage_no'
+        self.index_path = self.store_dir / 'index.csv'
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+        for d in (self.objects_dir, self.partial_dir, self.view_dir):
+            d.mkdir(parents=True, exist_ok=True)
+
+        # 커넥션 풀 크기를 동시 작업 수에 맞춤 (요청마다 새 연결을 맺지 않도록)
+        self.session = requests.Session()
+        retry = Retry(total=max_retries, backoff_factor=1,
+                      status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers,
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._done_urls = self._load_index()
+
+    def _load_index(self) -> Dict[str, str]:
+        """이전 실행에서 완료된 url → sha256 (재실행 시 재다운로드 방지)"""
+        done = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', newline='', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    if row.get('sha256'):
+                        done[row['url']] = row['sha256']
+        return done
+
+    def set_session_from_cookies(self, cookies: List[Dict[str, Any]], user_agent: Optional[str] = None) -> None:
+        """브라우저 쿠키(name/value/domain/path)와 User-Agent를 HTTP 세션에 복사"""
+        self.session.cookies.clear()
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+    def set_session_from_driver(self, driver) -> None:
+        """Selenium 드라이버의 쿠키/User-Agent를 HTTP 세션에 복사"""
+        try:
+            user_agent = driver.execute_script("return navigator.userAgent")
+        except Exception:
+            user_agent = None
+        self.set_session_from_cookies(driver.get_cookies(), user_agent)
+
+    def _object_path(self, sha256: str, filename: str) -> Path:
+        ext = Path(filename).suffix.lower()
+        return self.objects_dir / sha256[:2] / f"{sha256}{ext}"
+
+    def _download(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """단일 파일 다운로드 (Range 이어받기 → 해시 → 저장소 등록)"""
+        url = job['url']
+        part_path = self.partial_dir / (hashlib.sha1(url.encode('utf-8')).hexdigest() + '.part')
+        offset = part_path.stat().st_size if part_path.exists() else 0
+
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # 이미 끝까지 받은 .part 파일
+                pass
+            else:
+                response.raise_for_status()
+                # 서버가 Range를 무시하면(200) 처음부터 다시 받음
+                mode = 'ab' if offset and response.status_code == 206 else 'wb'
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        if chunk:
+                            f.write(chunk)
+            filename = _filename_from_response(response, job.get('name', ''))
+
+        sha256 = self._file_sha256(part_path)
+        size = part_path.stat().st_size
+
+        object_path = self._object_path(sha256, filename)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        if object_path.exists():
+            part_path.unlink()
+            status = 'duplicate'
+        else:
+            os.replace(part_path, object_path)
+            status = 'downloaded'
+
+        self._link_to_manage_no(job.get('관리번호', ''), filename, object_path, sha256)
+
+        return {
+            '관리번호': job.get('관리번호', ''),
+            '필드': job.get('field', ''),
+            '파일명': filename,
+            'url': url,
+            'sha256': sha256,
+            'size': size,
+            'path': str(object_path.relative_to(self.store_dir)),
+            'status': status,
+        }
+
+    def _file_sha256(self, path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _is_same_object(self, target: Path, object_path: Path, sha256: str) -> bool:
+        """target이 같은 저장소 객체인지 (하드링크면 inode 비교, 복사본이면 내용 sha256 비교)"""
+        try:
+            if os.path.samefile(target, object_path):
+                return True
+            return target.stat().st_size == object_path.stat().st_size and self._file_sha256(target) == sha256
+        except OSError:
+            return False
+
+    def _link_to_manage_no(self, manage_no: str, filename: str, object_path: Path, sha256: str) -> None:
+        """by_manage_no/<관리번호>/<파일명> 으로 저장소 객체를 연결 (하드링크, 실패 시 복사)
+
+        같은 이름의 다른 파일(다른 항목의 같은 파일명, 재업로드된 새 버전)이 이미 있으면
+        <이름>.<sha256 앞 8자리>.<확장자> 로 연결하고, 같은 객체면 건너뜀
+        """
+        if not manage_no:
+            return
+        target_dir = self.view_dir / _safe_filename(manage_no)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        name = Path(filename)
+        candidates = [target_dir / filename, target_dir / f"{name.stem}.{sha256[:8]}{name.suffix}"]
+        with self._lock:  # 같은 관리번호의 같은 파일명을 여러 스레드가 동시에 연결하지 않도록
+            for target in candidates:
+                if target.exists():
+                    if self._is_same_object(target, object_path, sha256):
+                        return
+                    continue
+                try:
+                    os.link(object_path, target)
+                except OSError:
+                    shutil.copy2(object_path, target)
+                return
+
+    def _append_index(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        write_header = not self.index_path.exists()
+        with open(self.index_path, 'a', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_COLUMNS)
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def harvest(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """첨부 목록을 동시에 다운로드하고 index.csv에 기록"""
+        pending = []
+        seen = set()
+        for job in jobs:
+            url = job.get('url')
+            if not url or url in seen or url in self._done_urls:
+                continue
+            seen.add(url)
+            pending.append(job)
+
+        if not pending:
+            return []
+
+        print(f"  📎 첨부 파일 {len(pending)}개 다운로드 시작 (동시 {self.max_workers}개)")
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._download, job): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"    ✗ 다운로드 실패: {job['url'][:80]} - {str(e)[:100]}")
+                    continue
+                results.append(result)
+                with self._lock:
+                    self._done_urls[result['url']] = result['sha256']
+                mark = '✓' if result['status'] == 'downloaded' else '='
+                print(f"    {mark} {result['관리번호']} {result['파일명']} ({result['size']:,} bytes)")
+
+        self._append_index(results)
+        duplicates = sum(1 for r in results if r['status'] == 'duplicate')
+        print(f"  ✓ 첨부 파일 {len(results)}개 처리 (중복 {duplicates}개)")
+        return results
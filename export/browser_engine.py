@@ -0,0 +1,431 @@
+"""체결 계약서 크롤러용 브라우저 엔진 추상화 모듈.
+
+개요
+- BrowserEngine / EnginePage: navigate, wait_for, evaluate, cookies 만으로 크롤링에 필요한 동작을 표현
+- SeleniumEngine: 기존 chromedriver 세션을 그대로 감싸는 구현 (동기 호출은 스레드로 넘김)
+- PlaywrightEngine: asyncio Playwright로 브라우저 프로세스 1개에 여러 컨텍스트를 띄우는 구현
+  - 이미지/폰트/미디어 요청 차단(request interception), networkidle 대기
+- run_engine_crawl: 목록 페이지는 순서대로, 상세 페이지는 N개 동시 추출
+  → 결과 dict 구성은 ContractComparator.build_details_from_tables 를 그대로 사용
+
+Playwright는 선택 의존성입니다.
+    pip install playwright && playwright install chromium
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List
+
+from utils.base_url import BASE_URL
+from attachment_harvester import ATTACHMENT_FIELDS
+
+try:
+    from playwright.async_api import async_playwright
+except Exception:  # pragma: no cover
+    async_playwright = None  # type: ignore
+
+ENGINES = ('selenium', 'playwright')
+
+NO_DATA_TEXT = "등록된 내용이 없습니다"
+
+# Playwright 컨텍스트에서 차단할 리소스 (텍스트 추출에 불필요)
+BLOCKED_RESOURCE_TYPES = ('image', 'font', 'media')
+
+# 목록 페이지: 첫 번째 테이블의 헤더/행 텍스트 + 행별 첫 링크
+LIST_PAGE_JS = """() => {
+    const table = document.querySelector('table');
+    if (!table) return {noData: document.body.innerText.includes('%s'), rows: []};
+    const trs = Array.from(table.querySelectorAll('tr'));
+    if (trs.length <= 1) return {noData: document.body.innerText.includes('%s'), rows: []};
+    const headers = Array.from(trs[0].querySelectorAll('th, td')).map(c => c.innerText.trim());
+    const rows = [];
+    for (const tr of trs.slice(1)) {
+        const cells = Array.from(tr.querySelectorAll('td'));
+        if (!cells.length) continue;
+        const row = {};
+        cells.forEach((c, j) => { if (j < headers.length) row[headers[j]] = c.innerText.trim(); });
+        const a = tr.querySelector('a');
+        row.link = a ? a.href : null;
+        rows.push(row);
+    }
+    return {noData: document.body.innerText.includes('%s'), rows};
+}""" % (NO_DATA_TEXT, NO_DATA_TEXT, NO_DATA_TEXT)
+
+# 상세 페이지: 앞의 두 테이블의 (th, td) 쌍, 첨부 링크, 제목(h1/h2)
+DETAIL_PAGE_JS = """(attachmentFields) => {
+    const tables = Array.from(document.querySelectorAll('table')).slice(0, 2);
+    const pairs = [];
+    const attachments = [];
+    for (const table of tables) {
+        const kv = [];
+        for (const tr of table.querySelectorAll('tr')) {
+            const th = tr.querySelector('th');
+            const td = tr.querySelector('td');
+            if (!th || !td) continue;
+            const key = th.innerText.trim();
+            kv.push([key, td.innerText.trim()]);
+            if (attachmentFields.includes(key)) {
+                for (const a of td.querySelectorAll('a[href]')) {
+                    if (!a.href.startsWith('javascript')) {
+                        attachments.push({field: key, name: a.innerText.trim(), url: a.href});
+                    }
+                }
+            }
+        }
+        pairs.push(kv);
+    }
+    const headings = Array.from(document.querySelectorAll('main h1, main h2, h1, h2')).map(h => h.innerText);
+    return {tables: pairs, attachments, headings};
+}"""
+
+
+class EnginePage(ABC):
+    """엔진별 탭/컨텍스트 1개 (추상 메서드를 모두 구현해야 생성 가능)"""
+
+    @abstractmethod
+    async def navigate(self, url: str) -> None:
+        """url로 이동 (로드 완료까지 대기)"""
+
+    @abstractmethod
+    async def wait_for(self, selector: str, timeout: float = 10) -> bool:
+        """selector 요소가 나타날 때까지 최대 timeout초 대기 → 나타났으면 True"""
+
+    @abstractmethod
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        """페이지에서 JS 함수 문자열 script를 arg로 실행한 결과"""
+
+    @abstractmethod
+    async def cookies(self) -> List[Dict[str, Any]]:
+        """현재 세션 쿠키 목록 (name/value/domain 등을 담은 dict)"""
+
+    async def close(self) -> None:
+        pass
+
+
+class BrowserEngine(ABC):
+    """브라우저 엔진 공통 인터페이스 (추상 메서드를 모두 구현해야 생성 가능)"""
+
+    @abstractmethod
+    async def start(self) -> None:
+        """브라우저(와 필요한 프로세스) 시작"""
+
+    @abstractmethod
+    async def new_page(self) -> EnginePage:
+        """새 탭/컨텍스트"""
+
+    @abstractmethod
+    async def login(self, username: str, password: str) -> bool:
+        """로그인 → 성공하면 True"""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """브라우저와 열린 페이지 모두 종료"""
+
+
+class SeleniumPage(EnginePage):
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def navigate(self, url: str) -> None:
+        await asyncio.to_thread(self.driver.get, url)
+
+    async def wait_for(self, selector: str, timeout: float = 10) -> bool:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        def _wait():
+            try:
+                WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+                return True
+            except Exception:
+                return False
+        return await asyncio.to_thread(_wait)
+
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        return await asyncio.to_thread(
+            self.driver.execute_script, "return (" + script + ")(arguments[0]);", arg)
+
+    async def cookies(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.driver.get_cookies)
+
+
+class SeleniumEngine(BrowserEngine):
+    """기존 ContractComparator의 드라이버 설정/로그인을 재사용
+
+    로컬 드라이버는 하나뿐이라 동시성 1이고, driver_factory가 원격 풀이면
+    추가 페이지마다 세션을 대여해 로그인 쿠키를 복사합니다.
+    """
+
+    def __init__(self, comparator):
+        self.comparator = comparator
+        self._extra_drivers = []
+        self._pages_created = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.comparator.driver_factory.capacity
+
+    async def start(self) -> None:
+        if not await asyncio.to_thread(self.comparator.setup_driver):
+            raise RuntimeError("Chrome 드라이버 설정 실패")
+
+    def _lease_with_cookies(self):
+        driver = self.comparator.driver_factory.create()
+        driver.get(BASE_URL.PRODUCTION)
+        for cookie in self.comparator.driver.get_cookies():
+            cookie = dict(cookie)
+            if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                cookie.pop('sameSite', None)
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                continue
+        return driver
+
+    async def new_page(self) -> EnginePage:
+        # 첫 페이지(목록)는 주 드라이버, 이후 상세 작업자는 남은 원격 슬롯에서 대여
+        self._pages_created += 1
+        if self._pages_created > 1 and len(self._extra_drivers) + 1 < self.capacity:
+            driver = await asyncio.to_thread(self._lease_with_cookies)
+            self._extra_drivers.append(driver)
+            return SeleniumPage(driver)
+        return SeleniumPage(self.comparator.driver)
+
+    async def login(self, username: str, password: str) -> bool:
+        return await asyncio.to_thread(self.comparator.login, username, password)
+
+    async def close(self) -> None:
+        for driver in self._extra_drivers:
+            await asyncio.to_thread(self.comparator.driver_factory.dispose, driver)
+        self._extra_drivers = []
+        if self.comparator.driver:
+            await asyncio.to_thread(self.comparator.quit_driver)
+
+
+class PlaywrightPage(EnginePage):
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+
+    async def navigate(self, url: str) -> None:
+        await self.page.goto(url, wait_until='networkidle', timeout=180_000)
+
+    async def wait_for(self, selector: str, timeout: float = 10) -> bool:
+        try:
+            await self.page.wait_for_selector(selector, timeout=timeout * 1000)
+            return True
+        except Exception:
+            return False
+
+    async def evaluate(self, script: str, arg: Any = None) -> Any:
+        return await self.page.evaluate(script, arg)
+
+    async def cookies(self) -> List[Dict[str, Any]]:
+        return await self.context.cookies()
+
+    async def close(self) -> None:
+        await self.context.close()
+
+
+class PlaywrightEngine(BrowserEngine):
+    """Chromium 프로세스 1개 + 페이지마다 가벼운 BrowserContext (로그인 상태는 storage_state로 공유)"""
+
+    def __init__(self, headless: bool = True):
+        if async_playwright is None:
+            raise RuntimeError("playwright가 설치되어 있지 않습니다: "
+                               "pip install playwright && playwright install chromium")
+        self.headless = headless
+        self._playwright = None
+        self.browser = None
+        self.storage_state = None
+
+    async def start(self) -> None:
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(
+            headless=self.headless, args=["--no-sandbox", "--disable-dev-shm-usage"])
+        print("✓ Playwright Chromium 실행")
+
+    async def _block_resources(self, route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def new_page(self) -> EnginePage:
+        context = await self.browser.new_context(
+            storage_state=self.storage_state, viewport={'width': 1920, 'height': 1080})
+        await context.route('**/*', self._block_resources)
+        page = await context.new_page()
+        return PlaywrightPage(context, page)
+
+    async def login(self, username: str, password: str) -> bool:
+        print("로그인 시도 중... (Playwright)")
+        page = await self.new_page()
+        try:
+            await page.navigate(BASE_URL.PRODUCTION)
+            await page.page.fill("input[type='email']", username)
+            await page.page.fill("input[type='password']", password)
+            await page.page.click("button[type='submit']")
+            await page.page.wait_for_load_state('networkidle')
+            current = page.page.url.lower()
+            if 'login' in current or 'signin' in current:
+                print(f"✗ 로그인 실패 - 현재 URL: {page.page.url}")
+                return False
+            # 이후 생성하는 모든 컨텍스트가 같은 로그인 상태로 시작
+            self.storage_state = await page.context.storage_state()
+            print("✓ 로그인이 성공적으로 완료되었습니다.")
+            return True
+        except Exception as e:
+            print(f"✗ 로그인 실패: {str(e)[:200]}")
+            return False
+        finally:
+            await page.close()
+
+    async def close(self) -> None:
+        if self.browser is not None:
+            await self.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        print("브라우저가 종료되었습니다.")
+
+
+async def _extract_detail(comparator, pool: asyncio.Queue, contract: Dict[str, Any],
+                          max_retries: int = 3) -> Dict[str, Any]:
+    """풀에서 페이지 하나를 빌려 상세 테이블을 JS 한 번으로 수집"""
+    page = await pool.get()
+    try:
+        for attempt in range(1, max_retries + 1):
+            try:
+                await page.navigate(contract['link'])
+                await page.wait_for('table', timeout=10)
+                payload = await page.evaluate(DETAIL_PAGE_JS, ATTACHMENT_FIELDS)
+                details = comparator.build_details_from_tables(payload)
+                if comparator.harvester is not None:
+                    for link in payload.get('attachments') or []:
+                        link['관리번호'] = details.get('관리번호', '')
+                        comparator.attachment_links.append(link)
+                return details
+            except Exception as e:
+                print(f"  ✗ 상세 추출 실패: {str(e)[:100]} (시도 {attempt}/{max_retries})")
+        return {'content': f'추출 실패 (재시도 {max_retries}회 초과)'}
+    finally:
+        pool.put_nowait(page)
+
+
+async def _crawl(comparator, engine: BrowserEngine, username: str, password: str,
+                 concurrency: int) -> bool:
+    await engine.start()
+    try:
+        if not await engine.login(username, password):
+            return False
+        if comparator.supervisor is not None:
+            comparator.supervisor.credentials = (username, password)
+
+        list_page = await engine.new_page()
+        pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(concurrency):
+            pool.put_nowait(await engine.new_page())
+
+        shard = comparator.shard
+        page_num = shard.first_page if shard is not None else 0
+        all_contracts = []
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        while True:
+            print(f"\n{'='*60}")
+            print(f"--- page={page_num} 처리 중 (동시 {concurrency}개) ---")
+            await list_page.navigate(f"{BASE_URL.PRODUCTION}/clm/complete?page={page_num}")
+            await list_page.wait_for('table', timeout=10)
+            listing = await list_page.evaluate(LIST_PAGE_JS)
+
+            if listing.get('noData'):
+                print(f"⚠ '{NO_DATA_TEXT}' 메시지 발견. 추출 종료.")
+                break
+            current_contracts = listing.get('rows') or []
+            if not current_contracts:
+                print(f"⚠ page={page_num}에 계약서가 없습니다.")
+                break
+            print(f"✓ page={page_num}에서 {len(current_contracts)}개 계약서 발견")
+
+            page_rows = [
+                (row_index, contract)
+                for row_index, contract in enumerate(current_contracts)
+                if shard is None or shard.owns_contract(contract)
+            ]
+
+            with_link = [(i, c) for i, c in page_rows if c.get('link')]
+            results = await asyncio.gather(
+                *(_extract_detail(comparator, pool, c) for _, c in with_link))
+
+            success_count = 0
+            for (_, contract), details in zip(with_link, results):
+                contract.update(details)
+                if details and '추출 실패' not in details.get('content', ''):
+                    success_count += 1
+                    if comparator.reference_checker is not None:
+                        comparator.reference_checker.check(contract)
+            for _, contract in page_rows:
+                if not contract.get('link'):
+                    contract['content'] = "링크 없음"
+                all_contracts.append(contract)
+
+            print(f"  → page={page_num} 완료: 성공 {success_count}개, "
+                  f"실패 {len(page_rows) - success_count}개")
+
+            comparator.contract_data = all_contracts
+            if comparator.save_data(timestamp=timestamp, mode='w'):
+                print(f"  ✓ {len(all_contracts)}개 데이터 저장됨")
+            if comparator.part_writer is not None:
+                comparator.part_writer.append_page(page_num, page_rows)
+
+            if comparator.harvester is not None and comparator.attachment_links:
+                user_agent = await list_page.evaluate("() => navigator.userAgent")
+                comparator.harvester.set_session_from_cookies(await list_page.cookies(), user_agent)
+                await asyncio.to_thread(comparator.harvester.harvest, comparator.attachment_links)
+                comparator.attachment_links = []
+
+            page_num = shard.next_page(page_num) if shard is not None else page_num + 1
+            if page_num >= 100:
+                print("⚠ 최대 페이지 수 도달")
+                break
+
+        print(f"\n{'='*60}")
+        print(f"✓ 총 {len(all_contracts)}개 계약서 추출 완료")
+        print(f"{'='*60}")
+
+        comparator.contract_data = all_contracts
+        comparator.save_snapshot(timestamp)
+        if comparator.part_writer is not None:
+            comparator.part_writer.finish()
+            print(f"✓ 샤드 파트 저장 완료: {comparator.part_writer.part_path}")
+        return True
+    finally:
+        await engine.close()
+
+
+def create_engine(name: str, comparator, headless: bool = True) -> BrowserEngine:
+    if name == 'playwright':
+        return PlaywrightEngine(headless=headless)
+    if name == 'selenium':
+        return SeleniumEngine(comparator)
+    raise ValueError(f"지원하지 않는 엔진: {name} ({', '.join(ENGINES)})")
+
+
+def run_engine_crawl(comparator, engine: BrowserEngine, username: str, password: str,
+                     concurrency: int = 8) -> bool:
+    """엔진 기반 전체 크롤링 (Selenium 엔진은 드라이버 팩토리 용량만큼으로 동시성 제한)"""
+    if isinstance(engine, SeleniumEngine):
+        concurrency = min(concurrency, max(1, engine.capacity - 1)) if engine.capacity > 1 else 1
+    try:
+        return asyncio.run(_crawl(comparator, engine, username, password, max(1, concurrency)))
+    except Exception as e:
+        print(f"✗ 프로세스 실행 중 오류: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if comparator.reference_checker is not None:
+            comparator.reference_checker.close()
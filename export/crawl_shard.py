@@ -0,0 +1,175 @@
+"""체결 계약서 크롤링을 여러 프로세스/머신으로 나누어 실행하기 위한 샤딩 모듈.
+
+개요
+- 샤드 지정: "i/n" (0 ≤ i < n)
+  - page 모드: page 번호 % n == i 인 목록 페이지만 처리
+  - hash 모드: 모든 목록 페이지를 보되, 상세 링크 해시 % n == i 인 계약서만 처리
+- 각 샤드는 part-<i>-of-<n>.jsonl(레코드) + .manifest.json(메타데이터)을 기록
+- merge_parts: 모든 파트를 (page, row) 순으로 정렬 후 관리번호 기준 중복 제거
+  → 단일 노드 실행과 동일한 순서의 레코드 목록 반환
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SHARD_MODES = ('page', 'hash')
+
+
+def _stable_hash(text: str) -> int:
+    """프로세스/머신이 달라도 동일한 값을 주는 해시 (내장 hash()는 실행마다 달라짐)"""
+    return int(hashlib.sha1(text.encode('utf-8')).hexdigest(), 16)
+
+
+class ShardSpec:
+    def __init__(self, index: int, total: int, mode: str = 'page'):
+        if total < 1 or not 0 <= index < total:
+            raise ValueError(f"잘못된 샤드 지정: {index}/{total} (0 ≤ i < n)")
+        if mode not in SHARD_MODES:
+            raise ValueError(f"지원하지 않는 샤드 모드: {mode} ({', '.join(SHARD_MODES)})")
+        self.index = index
+        self.total = total
+        self.mode = mode
+
+    @classmethod
+    def parse(cls, text: str, mode: str = 'page') -> 'ShardSpec':
+        """'i/n' 형식 문자열을 ShardSpec으로 변환"""
+        try:
+            index, total = (int(part) for part in text.split('/', 1))
+        except ValueError:
+            raise ValueError(f"샤드 형식은 'i/n' 이어야 합니다: {text}")
+        return cls(index, total, mode)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.total} ({self.mode})"
+
+    @property
+    def first_page(self) -> int:
+        return self.index if self.mode == 'page' else 0
+
+    def next_page(self, page_num: int) -> int:
+        return page_num + (self.total if self.mode == 'page' else 1)
+
+    def owns_contract(self, contract: Dict[str, Any]) -> bool:
+        """hash 모드에서 이 샤드가 처리할 계약서인지 판단 (page 모드는 항상 True)"""
+        if self.mode != 'hash':
+            return True
+        key = contract.get('link') or json.dumps(contract, ensure_ascii=False, sort_keys=True)
+        return _stable_hash(key) % self.total == self.index
+
+    @property
+    def part_stem(self) -> str:
+        return f"part-{self.index}-of-{self.total}"
+
+
+class PartWriter:
+    """샤드 결과를 페이지 단위로 jsonl에 추가하고 manifest를 갱신"""
+
+    def __init__(self, parts_dir: str, spec: ShardSpec):
+        self.spec = spec
+        self.parts_dir = Path(parts_dir)
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        self.part_path = self.parts_dir / f"{spec.part_stem}.jsonl"
+        self.manifest_path = self.parts_dir / f"{spec.part_stem}.manifest.json"
+        self.pages: List[int] = []
+        self.record_count = 0
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        # 재실행 시 이전 파트를 덮어씀
+        self.part_path.write_text('', encoding='utf-8')
+        self._write_manifest(complete=False)
+
+    def append_page(self, page_num: int, rows: List[tuple]) -> None:
+        """rows: [(row_index, contract_dict), ...]"""
+        with open(self.part_path, 'a', encoding='utf-8') as f:
+            for row_index, contract in rows:
+                line = {'page': page_num, 'row': row_index, 'record': contract}
+                f.write(json.dumps(line, ensure_ascii=False, default=str) + '\n')
+        self.pages.append(page_num)
+        self.record_count += len(rows)
+        self._write_manifest(complete=False)
+
+    def finish(self) -> None:
+        self._write_manifest(complete=True)
+
+    def _write_manifest(self, complete: bool) -> None:
+        digest = hashlib.sha256(self.part_path.read_bytes()).hexdigest()
+        manifest = {
+            'shard_index': self.spec.index,
+            'shard_total': self.spec.total,
+            'mode': self.spec.mode,
+            'part_file': self.part_path.name,
+            'pages': self.pages,
+            'record_count': self.record_count,
+            'sha256': digest,
+            'started_at': self.started_at,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'complete': complete,
+        }
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_path, self.manifest_path)
+
+
+def _dedupe_key(record: Dict[str, Any]) -> Optional[str]:
+    manage_no = str(record.get('관리번호') or record.get('관리 번호') or '').strip()
+    return manage_no or record.get('link')
+
+
+def merge_parts(parts_dir: str, allow_incomplete: bool = False) -> List[Dict[str, Any]]:
+    """모든 샤드 파트를 읽어 (page, row) 순으로 정렬하고 관리번호 기준 중복 제거"""
+    parts_path = Path(parts_dir)
+    manifests = []
+    for manifest_file in sorted(parts_path.glob('part-*-of-*.manifest.json')):
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifests.append(json.load(f))
+
+    if not manifests:
+        raise FileNotFoundError(f"manifest 파일을 찾을 수 없습니다: {parts_path}")
+
+    totals = {m['shard_total'] for m in manifests}
+    modes = {m['mode'] for m in manifests}
+    if len(totals) != 1 or len(modes) != 1:
+        raise ValueError(f"서로 다른 샤드 구성이 섞여 있습니다: n={sorted(totals)}, mode={sorted(modes)}")
+
+    total = totals.pop()
+    found = {m['shard_index'] for m in manifests}
+    missing = sorted(set(range(total)) - found)
+    incomplete = sorted(m['shard_index'] for m in manifests if not m.get('complete'))
+    if missing or incomplete:
+        message = f"누락 샤드: {missing}, 미완료 샤드: {incomplete}"
+        if not allow_incomplete:
+            raise ValueError(message)
+        print(f"⚠ {message} (불완전 병합 진행)")
+
+    entries = []
+    for manifest in manifests:
+        part_file = parts_path / manifest['part_file']
+        digest = hashlib.sha256(part_file.read_bytes()).hexdigest()
+        if digest != manifest['sha256']:
+            print(f"⚠ 체크섬 불일치: {part_file.name} (manifest 기록 이후 변경됨)")
+        with open(part_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+
+    # 단일 노드 실행과 같은 순서: 페이지 → 페이지 내 행 순서
+    entries.sort(key=lambda e: (e['page'], e['row']))
+
+    merged = []
+    seen = set()
+    duplicates = 0
+    for entry in entries:
+        record = entry['record']
+        key = _dedupe_key(record)
+        if key is not None:
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+        merged.append(record)
+
+    print(f"✓ {len(manifests)}개 샤드 병합: {len(merged)}개 레코드 (중복 제거 {duplicates}개)")
+    return merged
@@ -0,0 +1,133 @@
+"""크롤링 결과 스냅샷 저장 및 실행 간 변경 비교 도구.
+
+개요
+- 스냅샷: 관리번호 → 정규화된 _original_data의 해시 + 필드 값(JSON)을 Parquet(열 지향)으로 저장
+- 비교: 두 스냅샷을 관리번호 정렬 순서로 한 번만 훑어 추가/삭제/변경 계약과 필드 단위 변경을 산출
+
+사용 예시
+    python crawl_snapshot.py contract_snapshot_20250101_090000.parquet contract_snapshot_20250108_090000.parquet
+    python crawl_snapshot.py OLD.parquet NEW.parquet -o snapshot_diff.xlsx
+"""
+
+import argparse
+import hashlib
+import json
+from typing import Any, Dict, List
+
+import pandas as pd
+
+SNAPSHOT_COLUMNS = ['관리번호', 'content_hash', 'fields']
+
+
+def _normalize_fields(record: Dict[str, Any]) -> Dict[str, str]:
+    """_original_data(없으면 내부 키 제외 레코드)의 값을 공백 정리된 문자열로 통일"""
+    source = record.get('_original_data')
+    if not isinstance(source, dict):
+        source = {k: v for k, v in record.items() if not k.startswith('_') and k != 'link'}
+    fields = {}
+    for key, value in source.items():
+        if value is None:
+            value = ''
+        fields[str(key).strip()] = ' '.join(str(value).split())
+    return fields
+
+
+def build_snapshot(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """레코드 목록 → 관리번호 정렬된 스냅샷 DataFrame (중복 관리번호는 처음 것 유지)"""
+    rows = {}
+    for record in records:
+        manage_no = str(record.get('관리번호') or record.get('관리 번호') or '').strip()
+        if not manage_no or manage_no in rows:
+            continue
+        fields_json = json.dumps(_normalize_fields(record), ensure_ascii=False, sort_keys=True)
+        content_hash = hashlib.sha256(fields_json.encode('utf-8')).hexdigest()
+        rows[manage_no] = (manage_no, content_hash, fields_json)
+    snapshot = pd.DataFrame([rows[k] for k in sorted(rows)], columns=SNAPSHOT_COLUMNS)
+    return snapshot
+
+
+def save_snapshot(records: List[Dict[str, Any]], path: str) -> pd.DataFrame:
+    snapshot = build_snapshot(records)
+    snapshot.to_parquet(path, index=False)
+    print(f"✓ 스냅샷 저장: {path} ({len(snapshot)}건)")
+    return snapshot
+
+
+def load_snapshot(path: str) -> pd.DataFrame:
+    snapshot = pd.read_parquet(path, columns=SNAPSHOT_COLUMNS)
+    # 이전 버전/외부에서 만든 파일도 정렬 보장
+    if not snapshot['관리번호'].is_monotonic_increasing:
+        snapshot = snapshot.sort_values('관리번호', kind='stable').reset_index(drop=True)
+    return snapshot
+
+
+def _field_changes(manage_no: str, old_json: str, new_json: str) -> List[Dict[str, str]]:
+    old_fields = json.loads(old_json)
+    new_fields = json.loads(new_json)
+    changes = []
+    for field in sorted(set(old_fields) | set(new_fields)):
+        old_value = old_fields.get(field)
+        new_value = new_fields.get(field)
+        if old_value != new_value:
+            changes.append({
+                '관리번호': manage_no,
+                '필드': field,
+                '이전_값': '(없음)' if old_value is None else old_value,
+                '현재_값': '(없음)' if new_value is None else new_value,
+            })
+    return changes
+
+
+def diff_snapshots(old: pd.DataFrame, new: pd.DataFrame) -> Dict[str, List[Dict[str, str]]]:
+    """정렬된 두 스냅샷을 병합 순회(two-pointer)하여 추가/삭제/변경 목록 반환"""
+    old_keys = old['관리번호'].tolist()
+    old_hashes = old['content_hash'].tolist()
+    old_fields = old['fields'].tolist()
+    new_keys = new['관리번호'].tolist()
+    new_hashes = new['content_hash'].tolist()
+    new_fields = new['fields'].tolist()
+
+    added, removed, changed, field_changes = [], [], [], []
+    i = j = 0
+    while i < len(old_keys) or j < len(new_keys):
+        if j >= len(new_keys) or (i < len(old_keys) and old_keys[i] < new_keys[j]):
+            removed.append({'관리번호': old_keys[i]})
+            i += 1
+        elif i >= len(old_keys) or new_keys[j] < old_keys[i]:
+            added.append({'관리번호': new_keys[j]})
+            j += 1
+        else:
+            if old_hashes[i] != new_hashes[j]:
+                changes = _field_changes(old_keys[i], old_fields[i], new_fields[j])
+                changed.append({'관리번호': old_keys[i], '변경_필드_수': len(changes)})
+                field_changes.extend(changes)
+            i += 1
+            j += 1
+
+    return {'추가': added, '삭제': removed, '변경': changed, '필드_변경': field_changes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="두 크롤링 스냅샷의 추가/삭제/변경 계약 비교")
+    parser.add_argument("old", help="이전 스냅샷 (.parquet)")
+    parser.add_argument("new", help="현재 스냅샷 (.parquet)")
+    parser.add_argument("-o", "--output", help="결과 Excel 경로 (미지정 시 콘솔 요약만 출력)")
+    args = parser.parse_args()
+
+    result = diff_snapshots(load_snapshot(args.old), load_snapshot(args.new))
+
+    print(f"추가: {len(result['추가'])}건")
+    print(f"삭제: {len(result['삭제'])}건")
+    print(f"변경: {len(result['변경'])}건 (필드 변경 {len(result['필드_변경'])}개)")
+    for change in result['필드_변경'][:20]:
+        print(f"  • {change['관리번호']} {change['필드']}: {change['이전_값'][:40]} → {change['현재_값'][:40]}")
+
+    if args.output:
+        with pd.ExcelWriter(args.output, engine='openpyxl') as writer:
+            for sheet_name, rows in result.items():
+                pd.DataFrame(rows).to_excel(writer, sheet_name=sheet_name, index=False)
+        print(f"✓ 비교 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
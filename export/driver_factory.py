@@ -0,0 +1,179 @@
+"""Chrome 드라이버 생성을 한 곳에서 담당하는 팩토리 모듈.
+
+개요
+- 로컬 실행: 기존과 동일하게 webdriver.Chrome 생성
+- 원격 실행: Selenium Grid/standalone 노드(여러 개 가능)의 Remote WebDriver 세션을 풀에서 대여
+  - 대여 전 노드 /status 확인, 생성 직후 execute_script("return 1")로 세션 확인
+  - 실패한 노드는 일정 시간 제외(cooldown)하고 다음 노드로 넘어감
+- warm-start: 상주 Chrome에 연결 (warm_start.WarmStart)
+- 설정: SELENIUM_REMOTE_URL 환경변수 또는 --remote 옵션 (쉼표로 여러 노드 지정)
+    SELENIUM_REMOTE_URL=http://grid-a:4444,http://grid-b:4444
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+REMOTE_URL_ENV = 'SELENIUM_REMOTE_URL'
+
+
+def build_chrome_options(headless: bool = False) -> Options:
+    """로컬/원격 공통 Chrome 옵션"""
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    # 헤드리스 모드는 기본 비활성화 (디버깅을 위해)
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    return chrome_options
+
+
+def parse_remote_endpoints(value: Optional[str]) -> List[str]:
+    """'http://a:4444,http://b:4444' → ['http://a:4444', 'http://b:4444']"""
+    if not value:
+        return []
+    return [part.strip().rstrip('/') for part in value.split(',') if part.strip()]
+
+
+def _session_alive(driver) -> bool:
+    try:
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+
+class RemoteDriverPool:
+    """여러 Remote WebDriver 노드에 세션을 분배하는 대여(lease) 풀"""
+
+    def __init__(self, endpoints: List[str], sessions_per_endpoint: int = 1,
+                 health_timeout: float = 5, cooldown: float = 60, headless: bool = False):
+        if not endpoints:
+            raise ValueError("Remote WebDriver 주소가 지정되지 않았습니다.")
+        self.endpoints = endpoints
+        self.sessions_per_endpoint = sessions_per_endpoint
+        self.health_timeout = health_timeout
+        self.cooldown = cooldown
+        self.headless = headless
+        self._active: Dict[str, int] = {url: 0 for url in endpoints}
+        self._unhealthy_until: Dict[str, float] = {}
+        self._leases: Dict[int, str] = {}  # id(driver) → endpoint
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return len(self.endpoints) * self.sessions_per_endpoint
+
+    def _endpoint_ready(self, url: str) -> bool:
+        """Grid/노드 /status 의 value.ready 확인 (구버전 Grid는 /wd/hub/status)"""
+        for path in ('/status', '/wd/hub/status'):
+            try:
+                with urllib.request.urlopen(url + path, timeout=self.health_timeout) as response:
+                    status = json.loads(response.read().decode('utf-8'))
+                return bool(status.get('value', {}).get('ready', True))
+            except Exception:
+                continue
+        return False
+
+    def _mark_unhealthy(self, url: str, reason: str) -> None:
+        reason = reason.strip().splitlines()[0] if reason.strip() else '알 수 없음'
+        print(f"  ⚠ 원격 노드 제외 ({self.cooldown:.0f}초): {url} - {reason[:100]}")
+        self._unhealthy_until[url] = time.monotonic() + self.cooldown
+
+    def _candidates(self) -> List[str]:
+        """여유가 있고 제외 기간이 아닌 노드를 활성 세션이 적은 순으로"""
+        now = time.monotonic()
+        with self._lock:
+            available = [
+                url for url in self.endpoints
+                if self._active[url] < self.sessions_per_endpoint
+                and self._unhealthy_until.get(url, 0) <= now
+            ]
+            return sorted(available, key=lambda url: self._active[url])
+
+    def lease(self):
+        """건강한 노드에서 새 세션을 만들어 반환 (모두 실패 시 예외)"""
+        candidates = self._candidates()
+        if not candidates:
+            raise RuntimeError("사용 가능한 Remote WebDriver 노드가 없습니다 (모두 사용 중이거나 제외됨).")
+
+        for url in candidates:
+            if not self._endpoint_ready(url):
+                self._mark_unhealthy(url, "status 확인 실패")
+                continue
+            try:
+                driver = webdriver.Remote(command_executor=url,
+                                          options=build_chrome_options(self.headless))
+            except Exception as e:
+                self._mark_unhealthy(url, str(e))
+                continue
+            if not _session_alive(driver):
+                self._mark_unhealthy(url, "세션 응답 없음")
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                continue
+            with self._lock:
+                self._active[url] += 1
+                self._leases[id(driver)] = url
+            print(f"✓ 원격 드라이버 세션 대여: {url} (활성 {self._active[url]}/{self.sessions_per_endpoint})")
+            return driver
+
+        raise RuntimeError("모든 Remote WebDriver 노드에서 세션 생성에 실패했습니다.")
+
+    def release(self, driver) -> None:
+        """세션 종료 후 노드 슬롯 반납 (세션이 이미 죽었어도 슬롯은 반납)"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            url = self._leases.pop(id(driver), None)
+            if url is not None:
+                self._active[url] = max(0, self._active[url] - 1)
+
+
+class DriverFactory:
+    """ContractComparator.setup_driver 가 사용하는 드라이버 생성기 (로컬 또는 원격 풀)"""
+
+    def __init__(self, remote_endpoints: Optional[List[str]] = None, sessions_per_endpoint: int = 1,
+                 headless: bool = False, warm_start=None):
+        self.warm_start = warm_start  # WarmStart (상주 Chrome에 연결 시)
+        if remote_endpoints is None:
+            remote_endpoints = parse_remote_endpoints(os.getenv(REMOTE_URL_ENV))
+        self.headless = headless
+        self.pool = (RemoteDriverPool(remote_endpoints, sessions_per_endpoint, headless=headless)
+                     if remote_endpoints else None)
+
+    @property
+    def is_remote(self) -> bool:
+        return self.pool is not None
+
+    @property
+    def capacity(self) -> int:
+        return self.pool.capacity if self.pool is not None else 1
+
+    def create(self):
+        if self.pool is not None:
+            return self.pool.lease()
+        if self.warm_start is not None:
+            return self.warm_start.attach()
+        return webdriver.Chrome(options=build_chrome_options(self.headless))
+
+    def dispose(self, driver) -> None:
+        if driver is None:
+            return
+        if self.pool is not None:
+            self.pool.release(driver)
+        elif self.warm_start is not None:
+            self.warm_start.detach(driver)
+        else:
+            driver.quit()
@@ -0,0 +1,234 @@
+"""장시간 크롤링 시 Chrome 드라이버 메모리 증가를 억제하는 감시 모듈.
+
+개요
+- 주기적으로 브라우저 JS 힙(performance.memory)과 Chrome 프로세스 트리 RSS를 측정
+  - 일반 실행: chromedriver 프로세스 트리 (Chrome이 그 자식), warm-start: 상주 Chrome pid의 트리
+- N건마다 또는 메모리 임계값 초과 시 드라이버를 재생성(쿠키 복원 → 실패 시 재로그인)
+  - warm-start는 chromedriver만 바꾸면 같은 브라우저에 다시 붙으므로 상주 Chrome도 새로 띄움
+- 세션이 죽은 드라이버(크래시)는 즉시 교체하여 진행 중인 계약을 이어서 처리
+- 재생성(드라이버 생성/세션 복원)이 실패하면 새 드라이버로 한 번 더 시도하고, 그래도 실패하면 예외로 크롤링 중단
+  (드라이버 없이/로그아웃 상태로 계속 진행해 로그인 페이지를 계약 데이터로 기록하지 않도록)
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from utils.base_url import BASE_URL
+
+try:
+    import psutil
+except Exception:  # pragma: no cover
+    psutil = None  # type: ignore
+
+# 세션 종료/브라우저 크래시로 판단하는 WebDriverException 메시지
+_CRASH_MARKERS = (
+    'invalid session id',
+    'chrome not reachable',
+    'disconnected',
+    'session deleted',
+    'tab crashed',
+    'no such window',
+)
+
+
+def _proc_children_rss_mb(root_pid: int) -> Optional[float]:
+    """psutil이 없을 때 /proc을 직접 읽어 프로세스 트리 RSS 합계 계산 (Linux 전용)"""
+    if not os.path.isdir('/proc'):
+        return None
+    parents: Dict[int, int] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # comm에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 이후를 파싱
+                fields = f.read().rsplit(')', 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except Exception:
+            continue
+
+    tree = [root_pid]
+    frontier = [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        children = [p for p, ppid in parents.items() if ppid == pid]
+        tree.extend(children)
+        frontier.extend(children)
+
+    total_kb = 0
+    for pid in tree:
+        try:
+            with open(f'/proc/{pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except Exception:
+            continue
+    return total_kb / 1024
+
+
+class DriverSupervisor:
+    def __init__(self, comparator, recycle_every: int = 50, sample_every: int = 5,
+                 max_js_heap_mb: float = 1024, max_rss_mb: float = 3072):
+        self.comparator = comparator
+        self.recycle_every = recycle_every
+        self.sample_every = sample_every
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_rss_mb = max_rss_mb
+        self.credentials = None  # (username, password) - 쿠키 복원 실패 시 재로그인용
+        self.processed_since_recycle = 0
+        self.recycle_count = 0
+        self.crash_count = 0
+
+    @property
+    def driver(self):
+        return self.comparator.driver
+
+    def sample(self) -> Dict[str, Optional[float]]:
+        """현재 드라이버의 JS 힙 사용량과 프로세스 트리 RSS(MB) 측정"""
+        js_heap_mb = None
+        try:
+            used = self.driver.execute_script(
+                "return (performance.memory && performance.memory.usedJSHeapSize) || null")
+            if used:
+                js_heap_mb = used / (1024 * 1024)
+        except Exception:
+            pass
+
+        rss_mb = None
+        try:
+            pid = self._browser_pid()
+            if pid is not None and psutil is not None:
+                proc = psutil.Process(pid)
+                rss = proc.memory_info().rss
+                for child in proc.children(recursive=True):
+                    try:
+                        rss += child.memory_info().rss
+                    except psutil.Error:
+                        continue
+                rss_mb = rss / (1024 * 1024)
+            elif pid is not None:
+                rss_mb = _proc_children_rss_mb(pid)
+        except Exception:
+            pass
+
+        return {'js_heap_mb': js_heap_mb, 'rss_mb': rss_mb}
+
+    @property
+    def warm_start(self):
+        """상주 Chrome에 붙어 실행 중이면 WarmStart, 아니면 None"""
+        factory = getattr(self.comparator, 'driver_factory', None)
+        return getattr(factory, 'warm_start', None)
+
+    def _browser_pid(self) -> Optional[int]:
+        """RSS를 잴 프로세스 트리의 루트 (warm-start는 상주 Chrome, 그 외는 Chrome을 띄운 chromedriver)"""
+        if self.warm_start is not None:
+            return self.warm_start.browser_pid()
+        return self.driver.service.process.pid
+
+    def after_contract(self) -> None:
+        """계약서 1건 처리 후 호출: 주기/메모리 기준으로 재생성 여부 판단"""
+        self.processed_since_recycle += 1
+
+        if self.recycle_every and self.processed_since_recycle >= self.recycle_every:
+            self._recycle_or_raise(f"{self.processed_since_recycle}건 처리")
+            return
+
+        if self.sample_every and self.processed_since_recycle % self.sample_every == 0:
+            stats = self.sample()
+            js_heap_mb = stats['js_heap_mb']
+            rss_mb = stats['rss_mb']
+            print(f"    ℹ 드라이버 메모리: JS 힙 {js_heap_mb or 0:.0f}MB, RSS {rss_mb or 0:.0f}MB")
+            if js_heap_mb is not None and js_heap_mb >= self.max_js_heap_mb:
+                self._recycle_or_raise(f"JS 힙 {js_heap_mb:.0f}MB ≥ {self.max_js_heap_mb:.0f}MB")
+            elif rss_mb is not None and rss_mb >= self.max_rss_mb:
+                self._recycle_or_raise(f"RSS {rss_mb:.0f}MB ≥ {self.max_rss_mb:.0f}MB")
+
+    def _recycle_or_raise(self, reason: str) -> None:
+        """재생성 실패 시 새 드라이버 + 재로그인으로 한 번 더 시도, 그래도 실패하면 RuntimeError (페이지 루프 중단)"""
+        if self.recycle(reason):
+            return
+        print("  ⚠ 드라이버 재생성/세션 복원 실패 - 새 드라이버로 다시 시도합니다.")
+        if self.replace_crashed():
+            return
+        raise RuntimeError(f"드라이버 재생성 실패 ({reason}): 로그인된 세션을 복구하지 못해 크롤링을 중단합니다")
+
+    def is_crash(self, error: Exception) -> bool:
+        """예외가 드라이버 세션 종료/크래시에 의한 것인지 판단"""
+        if isinstance(error, InvalidSessionIdException):
+            return True
+        if isinstance(error, WebDriverException):
+            message = str(error).lower()
+            return any(marker in message for marker in _CRASH_MARKERS)
+        return False
+
+    def recycle(self, reason: str) -> bool:
+        """현재 세션 쿠키를 보존한 채 드라이버를 새로 띄움"""
+        print(f"  ♻ 드라이버 재생성 ({reason})")
+        cookies: List[dict] = []
+        current_url = None
+        try:
+            cookies = self.driver.get_cookies()
+            current_url = self.driver.current_url
+        except Exception:
+            pass
+        self._quit_quietly()
+        if not self.comparator.setup_driver():
+            return False
+        self.recycle_count += 1
+        self.processed_since_recycle = 0
+        return self._restore_session(cookies, current_url)
+
+    def replace_crashed(self) -> bool:
+        """크래시된 드라이버를 폐기하고 새 드라이버로 재로그인"""
+        print("  ⚠ 드라이버 세션이 종료되어 교체합니다.")
+        self.crash_count += 1
+        self._quit_quietly()
+        if not self.comparator.setup_driver():
+            return False
+        self.processed_since_recycle = 0
+        return self._restore_session([], None)
+
+    def _quit_quietly(self) -> None:
+        try:
+            if self.driver:
+                self.comparator.quit_driver()
+        except Exception:
+            pass
+        # warm-start는 quit_driver가 chromedriver만 멈추므로 상주 Chrome을 새로 띄워야 메모리가 회수됨
+        if self.warm_start is not None:
+            try:
+                self.warm_start.restart_browser()
+            except Exception as e:
+                print(f"  ⚠ 상주 Chrome 재시작 실패: {str(e)[:100]}")
+
+    def _restore_session(self, cookies: List[dict], return_url: Optional[str]) -> bool:
+        """쿠키 주입으로 로그인 상태 복원, 실패 시 자격증명으로 재로그인"""
+        if cookies:
+            try:
+                self.driver.get(BASE_URL.PRODUCTION)
+                for cookie in cookies:
+                    cookie = dict(cookie)
+                    if 'expiry' in cookie:
+                        cookie['expiry'] = int(cookie['expiry'])
+                    if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                        cookie.pop('sameSite', None)
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except Exception:
+                        continue
+                self.driver.get(return_url or BASE_URL.PRODUCTION)
+                time.sleep(1)
+                current = self.driver.current_url.lower()
+                if 'login' not in current and 'signin' not in current:
+                    print("  ✓ 쿠키로 세션 복원 완료")
+                    return True
+            except Exception as e:
+                print(f"  ⚠ 쿠키 복원 실패: {str(e)[:100]}")
+
+        if self.credentials:
+            return self.comparator.login(*self.credentials)
+        return False
@@ -0,0 +1,152 @@
+"""크롤링 중 수집한 계약서를 기준 엑셀(로아이_통합파일.xlsx)과 즉시 비교하는 모듈.
+
+개요
+- 기준 워크북의 모든 회사 시트를 한 번만 읽어 관리번호로 색인
+- 상세 추출이 끝난 계약서 1건마다 같은 이름(정규화 기준)의 컬럼 값을 비교
+- 불일치는 CSV 리포트에 바로 한 줄씩 추가(flush)하여 크롤링 중에도 확인 가능
+"""
+
+import csv
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+KEY_COLUMN_CANDIDATES = ['관리 번호', '관리번호', 'CLM NO.', 'CLM NO', 'NO.']
+
+# 비교에서 제외할 레코드 키 (내부용/링크)
+SKIP_RECORD_KEYS = {'link', 'content', '_original_data'}
+
+REPORT_COLUMNS = ['관리번호', '시트', '컬럼', '웹_값', '엑셀_값', '유사성_점수', '비고']
+
+
+def _normalize_colname(name: Any) -> str:
+    return str(name).strip().lower().replace(" ", "").replace(".", "").replace("_", "")
+
+
+def _normalize_value(value: Any) -> str:
+    """공백/줄바꿈 정리, 날짜는 YYYY-MM-DD, 숫자 천단위 콤마 제거"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = ' '.join(str(value).split())
+    if re.fullmatch(r'\d{4}[./]\d{1,2}[./]\d{1,2}', text):
+        text = re.sub(r'[./]', '-', text)
+    if re.fullmatch(r'-?[\d,]+(\.\d+)?', text):
+        text = text.replace(',', '')
+    return text
+
+
+class ReferenceChecker:
+    def __init__(self, workbook_path: str, report_path: Optional[str] = None, threshold: int = 95):
+        self.workbook_path = Path(workbook_path)
+        self.threshold = threshold
+        if report_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = f"reference_mismatch_{timestamp}.csv"
+        self.report_path = Path(report_path)
+
+        # 관리번호 → (시트명, 행 dict), 시트명 → {정규화 컬럼명: 원본 컬럼명}
+        self.index: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.sheet_columns: Dict[str, Dict[str, str]] = {}
+        self.checked = 0
+        self.mismatched = 0
+        self.not_found = 0
+
+        self._load()
+        self._report_file = open(self.report_path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._report_file, fieldnames=REPORT_COLUMNS)
+        self._writer.writeheader()
+        self._report_file.flush()
+
+    def _load(self) -> None:
+        print(f"기준 엑셀 로딩: {self.workbook_path}")
+        sheets = pd.read_excel(self.workbook_path, sheet_name=None)
+        duplicates = 0
+        for sheet_name, df in sheets.items():
+            norm_map = {_normalize_colname(c): c for c in df.columns}
+            key_col = next(
+                (norm_map[_normalize_colname(c)] for c in KEY_COLUMN_CANDIDATES
+                 if _normalize_colname(c) in norm_map),
+                None,
+            )
+            if key_col is None:
+                print(f"  ⚠ {sheet_name}: 관리번호 컬럼 없음 (건너뜀)")
+                continue
+            self.sheet_columns[sheet_name] = {k: v for k, v in norm_map.items() if v != key_col}
+            for row in df.to_dict('records'):
+                key = _normalize_value(row.get(key_col))
+                if not key:
+                    continue
+                if key in self.index:
+                    duplicates += 1
+                    continue
+                self.index[key] = (sheet_name, row)
+        print(f"✓ 기준 데이터 {len(self.index)}건 색인 ({len(self.sheet_columns)}개 시트, 중복 {duplicates}건)")
+
+    def check(self, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """계약서 1건을 기준 데이터와 비교하고 불일치를 리포트에 즉시 기록"""
+        manage_no = _normalize_value(record.get('관리번호') or record.get('관리 번호'))
+        if not manage_no:
+            return []
+        self.checked += 1
+
+        found = self.index.get(manage_no)
+        if found is None:
+            self.not_found += 1
+            rows = [{'관리번호': manage_no, '비고': '기준 엑셀에 관리번호 없음'}]
+            self._write(rows)
+            return rows
+
+        sheet_name, ref_row = found
+        columns = self.sheet_columns[sheet_name]
+        rows = []
+        for key, web_value in record.items():
+            if key in SKIP_RECORD_KEYS or key.startswith('_'):
+                continue
+            ref_col = columns.get(_normalize_colname(key))
+            if ref_col is None:
+                continue
+            web_val = _normalize_value(web_value)
+            ref_val = _normalize_value(ref_row.get(ref_col))
+            if web_val == ref_val:
+                continue
+            if web_val and ref_val:
+                score = fuzz.ratio(web_val, ref_val)
+                if score >= self.threshold:
+                    continue
+                note = '값 불일치'
+            else:
+                score = 0
+                note = '한쪽 값만 존재'
+            rows.append({
+                '관리번호': manage_no,
+                '시트': sheet_name,
+                '컬럼': ref_col,
+                '웹_값': web_val,
+                '엑셀_값': ref_val,
+                '유사성_점수': score,
+                '비고': note,
+            })
+
+        if rows:
+            self.mismatched += 1
+            self._write(rows)
+            print(f"    ⚠ 기준 엑셀과 {len(rows)}개 컬럼 불일치 ({sheet_name})")
+        return rows
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+        self._report_file.flush()
+
+    def close(self) -> None:
+        if not self._report_file.closed:
+            self._report_file.close()
+        print(f"✓ 기준 비교: {self.checked}건 중 불일치 {self.mismatched}건, "
+              f"관리번호 없음 {self.not_found}건 → {self.report_path}")
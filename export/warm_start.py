@@ -0,0 +1,191 @@
+"""상주(resident) Chrome에 붙어서 실행 준비 시간을 없애는 warm-start 모듈.
+
+개요
+- 최초 실행: Selenium Manager로 chromedriver/Chrome 경로를 한 번만 찾아 캐시 파일에 저장
+- Chrome을 --remote-debugging-port 로 띄워 두고 CLI 실행이 끝나도 종료하지 않음
+- 이후 실행: 캐시된 chromedriver 경로 + debugger_address 로 기존 브라우저에 바로 연결
+  → 드라이버 탐색, Chrome 기동, (세션이 살아 있으면) 로그인까지 생략
+- 종료 시 chromedriver 서비스만 멈추고 브라우저는 유지 (완전 종료는 stop_browser)
+  - 붙기만 한 chromedriver의 quit()은 브라우저를 닫지 않으므로 CDP Browser.close로 종료하고,
+    그래도 남아 있으면 ensure_browser가 기록한 browser_pid의 프로세스 그룹을 종료
+- 드라이버 재생성(메모리 회수)은 restart_browser로 상주 Chrome까지 새로 띄움 (driver_supervisor)
+"""
+
+import json
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+
+from driver_factory import build_chrome_options
+
+try:
+    import psutil
+except Exception:  # pragma: no cover
+    psutil = None  # type: ignore
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'contract_crawler' / 'warm_start.json'
+DEFAULT_PORT = 9222
+
+
+class WarmStart:
+    def __init__(self, port: int = DEFAULT_PORT, user_data_dir: Optional[str] = None,
+                 cache_path: Path = DEFAULT_CACHE_PATH, headless: bool = False):
+        self.port = port
+        self.cache_path = Path(cache_path)
+        self.user_data_dir = user_data_dir or str(self.cache_path.parent / f'chrome-profile-{port}')
+        self.headless = headless
+
+    @property
+    def debugger_address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Any]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_path, self.cache_path)
+
+    def resolve_paths(self) -> Dict[str, str]:
+        """캐시된 chromedriver/Chrome 경로 (파일이 없어졌으면 Selenium Manager로 다시 탐색)"""
+        cache = self._load_cache()
+        driver_path = cache.get('driver_path')
+        browser_path = cache.get('browser_path')
+        if driver_path and browser_path and os.path.isfile(driver_path) and os.path.isfile(browser_path):
+            return {'driver_path': driver_path, 'browser_path': browser_path}
+
+        print("  → chromedriver/Chrome 경로 탐색 중 (최초 1회)")
+        finder = DriverFinder(Service(), build_chrome_options())
+        cache['driver_path'] = finder.get_driver_path()
+        cache['browser_path'] = finder.get_browser_path()
+        self._save_cache(cache)
+        print(f"  ✓ 경로 캐시 저장: {self.cache_path}")
+        return {'driver_path': cache['driver_path'], 'browser_path': cache['browser_path']}
+
+    def is_running(self) -> bool:
+        """디버깅 포트의 /json/version 응답으로 상주 Chrome 확인"""
+        try:
+            with urllib.request.urlopen(f"http://{self.debugger_address}/json/version", timeout=0.5):
+                return True
+        except Exception:
+            return False
+
+    def ensure_browser(self, timeout: float = 15) -> None:
+        """상주 Chrome이 없으면 디버깅 포트를 열고 새 세션(프로세스 그룹)으로 실행"""
+        if self.is_running():
+            return
+        browser_path = self.resolve_paths()['browser_path']
+        args = [browser_path, f"--remote-debugging-port={self.port}", f"--user-data-dir={self.user_data_dir}"]
+        args += build_chrome_options(self.headless).arguments
+        print(f"  → 상주 Chrome 실행 (포트 {self.port})")
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   start_new_session=True)
+        cache = self._load_cache()
+        cache['browser_pid'] = process.pid
+        cache['port'] = self.port
+        self._save_cache(cache)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.is_running():
+                return
+            time.sleep(0.2)
+        raise RuntimeError(f"상주 Chrome이 {timeout:.0f}초 안에 응답하지 않습니다 (포트 {self.port})")
+
+    def attach(self):
+        """상주 Chrome에 붙는 드라이버 생성 (Selenium Manager 탐색 없음)"""
+        self.ensure_browser()
+        options = webdriver.ChromeOptions()
+        options.debugger_address = self.debugger_address
+        service = Service(executable_path=self.resolve_paths()['driver_path'])
+        return webdriver.Chrome(service=service, options=options)
+
+    def detach(self, driver) -> None:
+        """chromedriver만 종료하고 브라우저(로그인 세션 포함)는 유지"""
+        try:
+            driver.service.stop()
+        except Exception:
+            pass
+
+    def browser_pid(self) -> Optional[int]:
+        """ensure_browser가 띄운 상주 Chrome의 pid (이 포트로 띄운 기록이 없거나 이미 종료됐으면 None)"""
+        cache = self._load_cache()
+        pid = cache.get('browser_pid')
+        if not pid or cache.get('port') != self.port:
+            return None
+        if psutil is not None:
+            return pid if psutil.pid_exists(pid) else None
+        if os.name == 'nt':
+            return pid  # Windows의 os.kill(pid, 0)은 확인이 아니라 프로세스 종료
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return None
+        return pid
+
+    def _wait_stopped(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.is_running():
+                return True
+            time.sleep(0.2)
+        return not self.is_running()
+
+    def _kill_browser(self, pid: int) -> None:
+        """상주 Chrome 프로세스 그룹 종료 (start_new_session으로 띄웠으므로 그룹 id = pid)"""
+        try:
+            if os.name == 'nt':
+                subprocess.run(['taskkill', '/PID', str(pid), '/T', '/F'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.killpg(pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+    def stop_browser(self, timeout: float = 5) -> bool:
+        """상주 Chrome 완전 종료 (CDP Browser.close → 응답이 남아 있으면 프로세스 그룹 종료)"""
+        if not self.is_running():
+            print("ℹ 실행 중인 상주 Chrome이 없습니다.")
+            return False
+        pid = self.browser_pid()
+        try:
+            driver = self.attach()
+            try:
+                driver.execute_cdp_cmd('Browser.close', {})
+            except Exception:
+                pass  # 브라우저가 닫히면서 연결이 끊겨 오류가 날 수 있음
+            finally:
+                self.detach(driver)
+        except Exception as e:
+            print(f"  ⚠ CDP 종료 요청 실패: {str(e)[:100]}")
+        if not self._wait_stopped(timeout) and pid is not None:
+            self._kill_browser(pid)
+            self._wait_stopped(timeout)
+        if self.is_running():
+            print(f"✗ 상주 Chrome을 종료하지 못했습니다 (포트 {self.port})")
+            return False
+        cache = self._load_cache()
+        cache.pop('browser_pid', None)
+        self._save_cache(cache)
+        print(f"✓ 상주 Chrome 종료 (포트 {self.port})")
+        return True
+
+    def restart_browser(self) -> None:
+        """상주 Chrome을 종료하고 새로 띄움 (메모리 회수용, 로그인 쿠키는 user-data-dir에 남음)"""
+        if self.is_running():
+            self.stop_browser()
+        self.ensure_browser()
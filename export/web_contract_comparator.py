@@ -11,18 +11,35 @@ import time
 # import json
 import csv
 import re
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import os
+import argparse
 from datetime import datetime
 from utils.account_env import load_account_env
 from utils.base_url import BASE_URL
+from attachment_harvester import AttachmentHarvester, ATTACHMENT_FIELDS
+from driver_supervisor import DriverSupervisor
+from crawl_shard import ShardSpec, PartWriter, merge_parts, SHARD_MODES
+from reference_checker import ReferenceChecker
+from crawl_snapshot import save_snapshot
+from browser_engine import ENGINES, create_engine, run_engine_crawl
+from driver_factory import DriverFactory, parse_remote_endpoints
+from warm_start import WarmStart, DEFAULT_PORT
 
-account = load_account_env()
+_account_cache = None
+
+def _get_account():
+    """계정 JSON은 자격증명이 실제로 필요할 때 한 번만 로드"""
+    global _account_cache
+    if _account_cache is None:
+        _account_cache = load_account_env()
+    return _account_cache
+
+# 계약명 값으로 보기 어려운 패턴 (다른 항목명이 섞여 들어온 경우)
+SUSPICIOUS_TITLE_KEYWORDS = ['요청자', '검토 요청', '참조', '수신자']
 
 def _get_env_key() -> str:
     env_value = os.getenv("ENV", "prod").strip().lower()
@@ -35,7 +52,7 @@ def _get_credentials():
     env_key = _get_env_key()  # "PROD" 또는 "DEV"
     role_key = _get_role_key()  # 기본 "master"
     try:
-        cred = account[env_key][role_key]
+        cred = _get_account()[env_key][role_key]
         return cred.get("id", ""), cred.get("password", "")
     except Exception:
         return "", ""
@@ -44,25 +61,29 @@ class ContractComparator:
     def __init__(self):
         self.driver = None
         self.contract_data = []
+        self.harvester = None  # AttachmentHarvester (첨부 다운로드 사용 시)
+        self.attachment_links = []  # 현재 페이지에서 수집한 첨부 링크
+        self.supervisor = None  # DriverSupervisor (드라이버 메모리 감시/재생성)
+        self.shard = None  # ShardSpec (샤드 실행 시)
+        self.part_writer = None  # PartWriter (샤드 결과 파트 파일 기록)
+        self.reference_checker = None  # ReferenceChecker (기준 엑셀 실시간 비교)
+        self.driver_factory = DriverFactory()  # 로컬 Chrome 또는 Remote WebDriver 풀
         
     def setup_driver(self):
-        """Chrome 드라이버 설정"""
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        # 헤드리스 모드 비활성화 (디버깅을 위해)
-        # chrome_options.add_argument("--headless")
-        
+        """Chrome 드라이버 설정 (driver_factory가 원격 풀이면 세션 대여)"""
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = self.driver_factory.create()
             print("✓ Chrome 드라이버가 성공적으로 설정되었습니다.")
             return True
         except Exception as e:
             print(f"✗ Chrome 드라이버 설정 실패: {str(e)}")
             return False
     
+    def quit_driver(self):
+        """드라이버 종료 (원격 풀이면 세션 반납)"""
+        driver, self.driver = self.driver, None
+        self.driver_factory.dispose(driver)
+    
     def login(self, username, password):
         """웹사이트 로그인"""
         try:
@@ -219,6 +240,15 @@ class ContractComparator:
             print(f"✗ 로그인 실패: {str(e)}")
             return False
     
+    def is_authenticated(self):
+        """warm-start 시 기존 브라우저 세션이 이미 로그인되어 있는지 확인 (체결 계약서 페이지 접근 여부)"""
+        try:
+            self.driver.get(BASE_URL.PRODUCTION + "/clm/complete?page=0")
+            current_url = self.driver.current_url.lower()
+            return "clm/complete" in current_url and "login" not in current_url and "signin" not in current_url
+        except Exception:
+            return False
+    
     def navigate_to_contracts(self):
         """체결 계약서 조회 메뉴로 이동"""
         try:
@@ -628,6 +658,29 @@ class ContractComparator:
             pass
         return result
     
+    def _extract_attachment_links(self, table_element):
+        """테이블에서 체결 계약서 사본/첨부·별첨 행의 다운로드 링크 추출"""
+        links = []
+        try:
+            rows = table_element.find_elements(By.XPATH, ".//tr")
+            for row in rows:
+                try:
+                    th_elements = row.find_elements(By.XPATH, ".//th")
+                    if not th_elements:
+                        continue
+                    field = th_elements[0].text.strip()
+                    if field not in ATTACHMENT_FIELDS:
+                        continue
+                    for a in row.find_elements(By.XPATH, ".//td//a[@href]"):
+                        href = a.get_attribute('href')
+                        if href and not href.startswith('javascript'):
+                            links.append({'field': field, 'name': a.text.strip(), 'url': href})
+                except Exception:
+                    continue
+        except Exception:
+            pass
+        return links
+    
     def _map_to_template_format(self, data):
         """추출된 데이터를 양식 파일 구조에 맞게 매핑"""
         if not data:
@@ -708,6 +761,50 @@ class ContractComparator:
         
         return mapped
     
+    def _has_suspicious_title(self, details):
+        """계약명에 '요청자' 등 다른 항목 텍스트가 섞여 들어왔는지 확인"""
+        title_val = details.get('계약명')
+        return bool(title_val) and any(kw in title_val for kw in SUSPICIOUS_TITLE_KEYWORDS)
+    
+    def _correct_contract_title(self, details, heading_texts):
+        """페이지 제목(h1/h2) 중 정상적인 첫 번째 텍스트로 계약명 교체"""
+        for txt in heading_texts:
+            txt = (txt or '').strip()
+            if txt and not any(kw in txt for kw in SUSPICIOUS_TITLE_KEYWORDS):
+                details['계약명'] = txt
+                break
+    
+    def _finalize_details(self, details):
+        """양식 매핑 결과를 합치고 원본 추출값을 _original_data로 보존"""
+        mapped_details = self._map_to_template_format(details)
+        
+        # 원본 데이터를 _original에 저장하고 매핑된 데이터를 추가
+        if details:
+            original_data = {k: v for k, v in details.items()}
+            details.update(mapped_details)
+            details['_original_data'] = original_data
+        return details
+    
+    def build_details_from_tables(self, payload):
+        """브라우저 엔진이 JS로 수집한 테이블 Key/Value(DETAIL_PAGE_JS 결과)로 상세 데이터 구성"""
+        details = {}
+        tables = payload.get('tables') or []
+        
+        # 첫 번째 테이블: 계약 정보
+        if len(tables) >= 1:
+            details.update({k: v for k, v in tables[0] if k})
+            details.update(self._parse_contract_info_special(details))
+        
+        # 두 번째 테이블: 상세 정보
+        if len(tables) >= 2:
+            details.update({k: v for k, v in tables[1] if k})
+            details.update(self._parse_detail_info_special(details))
+        
+        if self._has_suspicious_title(details):
+            self._correct_contract_title(details, payload.get('headings') or [])
+        
+        return self._finalize_details(details)
+    
     def extract_contract_details(self, contract):
         """개별 계약서 상세 내용 추출 (재시도 로직 포함, 불필요한 텍스트 제거)"""
         if not contract.get('link'):
@@ -831,35 +928,31 @@ class ContractComparator:
                     import traceback
                     traceback.print_exc()
                 
+                # 첨부 링크 수집 (다운로드는 페이지 단위로 일괄 처리)
+                attachments = []
+                if self.harvester is not None:
+                    for table in all_tables[:2]:
+                        attachments.extend(self._extract_attachment_links(table))
+                
                 # 페이지로 돌아가기
                 self.driver.back()
                 time.sleep(2)
                 
                 # 양식 파일 구조에 맞게 매핑 (계약명 안전 보정 포함)
                 # 계약명 보정: '요청자' 등 잘못 들어가는 경우 방지
-                if '계약명' in details and details.get('계약명'):
-                    title_val = details['계약명']
-                    # 비정상 패턴 필터링
-                    suspicious_keywords = ['요청자', '검토 요청', '참조', '수신자']
-                    if any(kw in title_val for kw in suspicious_keywords):
-                        # 대안: 페이지 타이틀 혹은 링크 텍스트 재시도
-                        try:
-                            h_candidates = self.driver.find_elements(By.XPATH, "//main//h1 | //main//h2 | //h1 | //h2")
-                            for h in h_candidates:
-                                txt = h.text.strip()
-                                if txt and not any(kw in txt for kw in suspicious_keywords):
-                                    details['계약명'] = txt
-                                    break
-                        except Exception:
-                            pass
+                if self._has_suspicious_title(details):
+                    # 대안: 페이지 타이틀 혹은 링크 텍스트 재시도
+                    try:
+                        h_candidates = self.driver.find_elements(By.XPATH, "//main//h1 | //main//h2 | //h1 | //h2")
+                        self._correct_contract_title(details, (h.text for h in h_candidates))
+                    except Exception:
+                        pass
                 
-                mapped_details = self._map_to_template_format(details)
+                details = self._finalize_details(details)
                 
-                # 원본 데이터를 _original에 저장하고 매핑된 데이터를 추가
-                if details:
-                    original_data = {k: v for k, v in details.items()}
-                    details.update(mapped_details)
-                    details['_original_data'] = original_data
+                for link in attachments:
+                    link['관리번호'] = details.get('관리번호', '')
+                    self.attachment_links.append(link)
                 
                 return details
                 
@@ -868,6 +961,11 @@ class ContractComparator:
                 error_msg = str(e)
                 print(f"  ✗ 상세 추출 실패: {error_msg[:100]} (시도 {retry_count}/{max_retries})")
                 
+                # 드라이버 크래시면 새 드라이버로 교체 후 같은 계약을 재시도
+                if self.supervisor is not None and self.supervisor.is_crash(e):
+                    if self.supervisor.replace_crashed() and retry_count < max_retries:
+                        continue
+                
                 if retry_count >= max_retries:
                     print(f"  ⚠ 최대 재시도 횟수 초과. 스킵합니다.")
                     try:
@@ -955,6 +1053,19 @@ class ContractComparator:
             traceback.print_exc()
             return False
     
+    def save_snapshot(self, timestamp=None):
+        """관리번호별 내용 해시 스냅샷 저장 (실행 간 변경 비교용)"""
+        if not self.contract_data:
+            return False
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            save_snapshot(self.contract_data, f"contract_snapshot_{timestamp}.parquet")
+            return True
+        except Exception as e:
+            print(f"⚠ 스냅샷 저장 실패: {e}")
+            return False
+    
     def run_full_process(self, username, password):
         """전체 프로세스 실행 - 페이지별로 계약서 상세 추출"""
         try:
@@ -964,16 +1075,21 @@ class ContractComparator:
             if not self.setup_driver():
                 return False
             
-            # 2. 로그인
-            if not self.login(username, password):
+            # 2. 로그인 (warm-start로 붙은 브라우저가 이미 로그인 상태면 생략)
+            warm_session = self.driver_factory.warm_start is not None and self.is_authenticated()
+            if warm_session:
+                print("✓ 기존 브라우저 세션 사용 (로그인 생략)")
+            elif not self.login(username, password):
                 return False
+            if self.supervisor is not None:
+                self.supervisor.credentials = (username, password)
             
             # 3. 계약서 조회 페이지로 이동
-            if not self.navigate_to_contracts():
+            if not warm_session and not self.navigate_to_contracts():
                 return False
             
             # 4. 페이지별로 계약서 링크 추출 및 상세 내용 추출 (실시간 저장)
-            page_num = 0
+            page_num = self.shard.first_page if self.shard is not None else 0
             all_contracts = []
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             is_first_page = True
@@ -984,7 +1100,14 @@ class ContractComparator:
                 
                 # 현재 페이지 URL로 이동
                 current_url = f"{BASE_URL.PRODUCTION}/clm/complete?page={page_num}"
-                self.driver.get(current_url)
+                try:
+                    self.driver.get(current_url)
+                except Exception as e:
+                    if self.supervisor is None or not self.supervisor.is_crash(e):
+                        raise
+                    if not self.supervisor.replace_crashed():
+                        raise
+                    self.driver.get(current_url)
                 time.sleep(3)
                 
                 print(f"URL: {current_url}")
@@ -1007,13 +1130,22 @@ class ContractComparator:
                 
                 print(f"✓ page={page_num}에서 {len(current_contracts)}개 계약서 발견")
                 
+                # 샤드 실행 시 이 샤드가 담당하는 계약서만 처리 (행 위치는 병합 정렬용으로 보존)
+                page_rows = [
+                    (row_index, contract)
+                    for row_index, contract in enumerate(current_contracts)
+                    if self.shard is None or self.shard.owns_contract(contract)
+                ]
+                if self.shard is not None:
+                    print(f"  → 샤드 {self.shard} 담당: {len(page_rows)}개")
+                
                 # 각 계약서 상세 내용 추출
                 page_contracts = []
                 success_count = 0
                 fail_count = 0
                 
-                for i, contract in enumerate(current_contracts, 1):
-                    print(f"\n  [{i}/{len(current_contracts)}] 계약서 상세 추출 중...")
+                for i, (row_index, contract) in enumerate(page_rows, 1):
+                    print(f"\n  [{i}/{len(page_rows)}] 계약서 상세 추출 중...")
                     
                     if contract.get('link'):
                         try:
@@ -1027,6 +1159,9 @@ class ContractComparator:
                                 if len(details) > 0:
                                     print(f"  ✓ 상세 정보 추출 완료")
                                     success_count += 1
+                                    # 기준 엑셀과 즉시 비교 (불일치는 리포트에 바로 기록)
+                                    if self.reference_checker is not None:
+                                        self.reference_checker.check(contract)
                                 else:
                                     print(f"  ⚠ 데이터가 비어있음 (계속 진행)")
                                     fail_count += 1
@@ -1042,8 +1177,11 @@ class ContractComparator:
                         contract['content'] = "링크 없음"
                         fail_count += 1
                     
-                    page_contracts.append(contract)
+                    page_contracts.append((row_index, contract))
                     all_contracts.append(contract)
+                    
+                    if self.supervisor is not None:
+                        self.supervisor.after_contract()
                 
                 print(f"\n  → page={page_num} 완료: 성공 {success_count}개, 실패 {fail_count}개")
                 
@@ -1059,8 +1197,17 @@ class ContractComparator:
                 if self.save_data(timestamp=timestamp, mode='w'):  # 전체 데이터 덮어쓰기
                     print(f"  ✓ {len(all_contracts)}개 데이터 저장됨")
                 
+                if self.part_writer is not None:
+                    self.part_writer.append_page(page_num, page_contracts)
+                
+                # 첨부 파일 다운로드 (현재 세션 쿠키 사용)
+                if self.harvester is not None and self.attachment_links:
+                    self.harvester.set_session_from_driver(self.driver)
+                    self.harvester.harvest(self.attachment_links)
+                    self.attachment_links = []
+                
                 # 다음 페이지로
-                page_num += 1
+                page_num = self.shard.next_page(page_num) if self.shard is not None else page_num + 1
                 
                 # 최대 100페이지 제한
                 if page_num >= 100:
@@ -1072,6 +1219,11 @@ class ContractComparator:
             print(f"{'='*60}")
             
             self.contract_data = all_contracts
+            self.save_snapshot(timestamp)
+            
+            if self.part_writer is not None:
+                self.part_writer.finish()
+                print(f"✓ 샤드 파트 저장 완료: {self.part_writer.part_path}")
             
             print("=== 프로세스 완료 ===")
             return True
@@ -1082,12 +1234,72 @@ class ContractComparator:
             traceback.print_exc()
             return False
         finally:
+            if self.reference_checker is not None:
+                self.reference_checker.close()
             if self.driver:
-                self.driver.quit()
+                self.quit_driver()
                 print("브라우저가 종료되었습니다.")
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="체결 계약서 목록/상세 추출")
+    parser.add_argument("--download-attachments", action="store_true",
+                        help="체결 계약서 사본 및 첨부/별첨 파일 다운로드")
+    parser.add_argument("--attachments-dir", default="attachments",
+                        help="첨부 파일 저장소 경로 (기본값: attachments)")
+    parser.add_argument("--download-workers", type=int, default=4,
+                        help="첨부 파일 동시 다운로드 수 (기본값: 4)")
+    parser.add_argument("--recycle-every", type=int, default=50,
+                        help="N건마다 드라이버 재생성 (0이면 주기 재생성 안 함, 기본값: 50)")
+    parser.add_argument("--max-js-heap-mb", type=float, default=1024,
+                        help="JS 힙이 이 값(MB)을 넘으면 드라이버 재생성 (기본값: 1024)")
+    parser.add_argument("--max-rss-mb", type=float, default=3072,
+                        help="Chrome 프로세스 RSS가 이 값(MB)을 넘으면 드라이버 재생성 (기본값: 3072)")
+    parser.add_argument("--shard", metavar="i/n",
+                        help="샤드 실행: n개 중 i번째(0부터) 샤드만 처리")
+    parser.add_argument("--shard-mode", choices=SHARD_MODES, default="page",
+                        help="page: 목록 페이지 단위 분할, hash: 상세 링크 해시 단위 분할 (기본값: page)")
+    parser.add_argument("--parts-dir", default="parts",
+                        help="샤드 파트/manifest 저장 경로 (기본값: parts)")
+    parser.add_argument("--merge", metavar="PARTS_DIR",
+                        help="크롤링 없이 샤드 파트를 병합해 최종 CSV/Excel 생성")
+    parser.add_argument("--allow-incomplete", action="store_true",
+                        help="--merge 시 누락/미완료 샤드가 있어도 병합")
+    parser.add_argument("--reference", metavar="XLSX",
+                        help="수집과 동시에 비교할 기준 엑셀 (예: 로아이_통합파일.xlsx)")
+    parser.add_argument("--reference-threshold", type=int, default=95,
+                        help="기준 비교 시 일치로 간주할 유사도 (기본값: 95)")
+    parser.add_argument("--engine", choices=ENGINES,
+                        help="브라우저 엔진 추상화 경로로 실행 (미지정 시 기존 Selenium 흐름)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="--engine playwright 사용 시 동시 상세 추출 수 (기본값: 8)")
+    parser.add_argument("--headless", action="store_true",
+                        help="헤드리스 모드로 실행")
+    parser.add_argument("--remote", metavar="URL[,URL...]",
+                        help="Remote WebDriver(Selenium Grid) 주소, 쉼표로 여러 노드 지정 "
+                             "(기본값: SELENIUM_REMOTE_URL 환경변수)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="디버깅 포트로 띄운 상주 Chrome에 연결 (없으면 실행 후 유지, 로그인 세션 재사용)")
+    parser.add_argument("--debug-port", type=int, default=DEFAULT_PORT,
+                        help=f"--warm-start 상주 Chrome 디버깅 포트 (기본값: {DEFAULT_PORT})")
+    parser.add_argument("--warm-stop", action="store_true",
+                        help="상주 Chrome을 종료하고 끝냄")
+    parser.add_argument("--remote-sessions", type=int, default=1,
+                        help="원격 노드당 최대 동시 세션 수 (기본값: 1)")
+    args = parser.parse_args()
+    
+    if args.warm_stop:
+        WarmStart(port=args.debug_port).stop_browser()
+        return
+    
+    if args.merge:
+        comparator = ContractComparator()
+        comparator.contract_data = merge_parts(args.merge, allow_incomplete=args.allow_incomplete)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        comparator.save_data(timestamp=timestamp)
+        comparator.save_snapshot(timestamp)
+        return
+    
     # 계정 JSON에서 자격증명 선택 (ENV=prod|dev, ROLE=master 등)
     username, password = _get_credentials()
     
@@ -1100,7 +1312,31 @@ def main():
     
     # 추출기 생성 및 실행
     comparator = ContractComparator()
-    success = comparator.run_full_process(username, password)
+    remote_endpoints = parse_remote_endpoints(args.remote) if args.remote else None
+    warm_start = WarmStart(port=args.debug_port, headless=args.headless) if args.warm_start else None
+    comparator.driver_factory = DriverFactory(remote_endpoints, sessions_per_endpoint=args.remote_sessions,
+                                              headless=args.headless, warm_start=warm_start)
+    if comparator.driver_factory.is_remote:
+        print(f"  - Remote WebDriver: {', '.join(comparator.driver_factory.pool.endpoints)}")
+    comparator.supervisor = DriverSupervisor(
+        comparator,
+        recycle_every=args.recycle_every,
+        max_js_heap_mb=args.max_js_heap_mb,
+        max_rss_mb=args.max_rss_mb,
+    )
+    if args.shard:
+        comparator.shard = ShardSpec.parse(args.shard, args.shard_mode)
+        comparator.part_writer = PartWriter(args.parts_dir, comparator.shard)
+        print(f"  - Shard: {comparator.shard}")
+    if args.reference:
+        comparator.reference_checker = ReferenceChecker(args.reference, threshold=args.reference_threshold)
+    if args.download_attachments:
+        comparator.harvester = AttachmentHarvester(args.attachments_dir, max_workers=args.download_workers)
+    if args.engine:
+        engine = create_engine(args.engine, comparator, headless=args.headless)
+        success = run_engine_crawl(comparator, engine, username, password, concurrency=args.concurrency)
+    else:
+        success = comparator.run_full_process(username, password)
     
     if success:
         print("\n✓ 모든 작업이 성공적으로 완료되었습니다!")
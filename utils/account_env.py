@@ -1,6 +1,7 @@
 import os
 import json
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -8,11 +9,21 @@ except Exception:  # pragma: no cover
     load_dotenv = None  # type: ignore
 
 
+_dotenv_loaded = False
+_lock = threading.Lock()
+# json 경로 → (mtime_ns, 데이터): 파일이 바뀌지 않았으면 다시 파싱하지 않음
+_account_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
 def _ensure_dotenv_loaded() -> None:
     """Load .env once if python-dotenv is available."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
     # load_dotenv가 없으면 조용히 패스 (컨테이너/배포 환경에서 이미 주입된 경우)
     if load_dotenv is not None:
         load_dotenv()
+    _dotenv_loaded = True
 
 
 def _workspace_root() -> str:
@@ -34,6 +45,7 @@ def load_account_env(account_key: str | None = None) -> Dict[str, Any]:
 
     - account_key가 None이면 .env의 ACCOUNT를 사용
     - 문자열/숫자/불리언 값만 환경변수로 주입(문자열화). 중첩 구조는 반환 dict로 직접 사용하세요.
+    - 같은 파일은 mtime이 바뀌기 전까지 캐시된 dict를 반환합니다(수정하지 말고 읽기만 하세요).
     """
     _ensure_dotenv_loaded()
 
@@ -42,11 +54,19 @@ def load_account_env(account_key: str | None = None) -> Dict[str, Any]:
         raise RuntimeError("ACCOUNT 환경변수가 필요합니다 (.env 또는 인자).")
 
     json_path = _resolve_account_json_path(key)
-    if not os.path.exists(json_path):
+    try:
+        mtime_ns = os.stat(json_path).st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"계정 파일을 찾을 수 없습니다: {json_path}")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data: Dict[str, Any] = json.load(f)
+    with _lock:
+        cached = _account_cache.get(json_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            data: Dict[str, Any] = json.load(f)
+        _account_cache[json_path] = (mtime_ns, data)
 
     for k, v in data.items():
         if isinstance(v, (str, int, float, bool)):
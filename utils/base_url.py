@@ -3,172 +3,243 @@
 용도
 - .env의 prod_BASE_URL/dev_BASE_URL 값을 읽어 기본 URL 결정
 - 로그인/CLM/대량생성/SEAL/자문/송무/법령/프로젝트/설정 등 페이지별 경로 상수 제공
+
+동작 방식
+- import 시점에는 파일을 읽지 않음. URL이 처음 필요할 때 .env / Account/<key>.json을 파싱하고
+  파일 mtime이 바뀌기 전까지 캐시를 재사용
+- get_urls(account_key, env)로 테넌트별 불변(namedtuple) URL 묶음을 받아 한 프로세스에서 여러 테넌트 사용 가능
+    get_urls('KMR', 'prod').CLM.COMPLETE
+- 기존 BASE_URL / CLM_URLS / URLS 등은 기본 테넌트(.env의 ACCOUNT, ENV)를 가리키는 지연 객체로 유지
+    BASE_URL.PRODUCTION, URLS.CLM.COMPLETE
 """
 
 import os
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
 from utils.account_env import load_account_env
 
-def parse_custom_env():
+_lock = threading.Lock()
+# .env 경로 → (mtime_ns, 파싱 결과)
+_env_cache: Dict[str, Tuple[Optional[int], Dict[str, str]]] = {}
+
+
+def parse_custom_env(path: str = '.env'):
     """.env 파일을 직접 파싱 (KEY : VALUE 형식 지원)"""
     env_vars = {}
-    
+
     try:
         # .env 파일 읽기
-        with open('.env', 'r', encoding='utf-8') as f:
+        with open(path, 'r', encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
-                
+
                 # 주석이나 빈 줄 무시
                 if not line or line.startswith('#'):
                     continue
-                
+
                 # KEY : VALUE 형식 파싱
                 if ':' in line:
                     key, value = line.split(':', 1)
                     key = key.strip()
                     value = value.strip()
-                    
+
                     # 따옴표 제거
                     value = value.strip('"').strip("'")
-                    
+
                     env_vars[key] = value
-                    
+
         return env_vars
     except Exception as e:
         print(f"⚠ .env 파일 읽기 실패: {e}")
         return {}
 
+
+def get_env_vars(path: str = '.env') -> Dict[str, str]:
+    """parse_custom_env 결과를 mtime 기준으로 캐시 (파일이 없으면 경고는 한 번만)"""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    with _lock:
+        cached = _env_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        env_vars = parse_custom_env(path)
+        _env_cache[path] = (mtime_ns, env_vars)
+        return env_vars
+
+
 """환경 변수(.env)와 Account JSON을 함께 고려하여 BASE_URL을 결정한다.
 우선순위: Account/<ACCOUNT>.json의 base_url (ENV에 따라 선택) → .env의 prod/dev_BASE_URL
 """
 
-# .env 파일 파싱 (폴백용)
-env_vars = parse_custom_env()
-
 # ENV 판별
-def _get_env_key() -> str:
-    env_value = os.getenv('ENV', 'prod').strip().lower()
+def _get_env_key(env: Optional[str] = None) -> str:
+    env_value = (env or os.getenv('ENV', 'prod')).strip().lower()
     return 'PROD' if env_value in ('prod', 'production') else 'DEV'
 
-# Account JSON에서 base_url 우선 사용
-try:
-    _account = load_account_env()
-    _env_key = _get_env_key()
-    _json_base_url = ''
+
+def resolve_base_url(account_key: Optional[str] = None, env: Optional[str] = None) -> str:
+    """테넌트(account_key)와 환경(env)에 해당하는 BASE URL"""
+    # Account JSON에서 base_url 우선 사용
     try:
-        _json_base_url = (_account.get(_env_key, {}) or {}).get('base_url', '')
+        _account = load_account_env(account_key)
+        _json_base_url = (_account.get(_get_env_key(env), {}) or {}).get('base_url', '') or ''
     except Exception:
         _json_base_url = ''
-except Exception:
-    _json_base_url = ''
-
-# 최종 BASE URL 결정: JSON 우선, 없으면 .env
-PRODUCTION_URL = (
-    _json_base_url.strip()
-    or env_vars.get('prod_BASE_URL', '').strip()
-    or env_vars.get('dev_BASE_URL', '').strip()
-)
-
-class BASE_URL:
-    PRODUCTION = PRODUCTION_URL
-
-
-# 로그인 관련 URL
-class LOGIN_URLS:
-    HOME = PRODUCTION_URL
-    LOGIN = f"{PRODUCTION_URL}/login"
-    DASHBOARD = f"{PRODUCTION_URL}/dashboard"
-
-
-# 계약서 생성 관련 URL
-class DRIVE_URLS:
-    DRIVE = f"{PRODUCTION_URL}/drive"  # My 계약서
-    TEAM = f"{PRODUCTION_URL}/team_standard_contract"  # 기업 표준 계약서
-    AUTO = f"{PRODUCTION_URL}/#documents_finder"  # 자동작성
-    CHECKLIST = f"{PRODUCTION_URL}/ai/dchecklist"  # AI 필수조항검토
-    GLD = "https://chatgld.io"
-
-
-# 대량생성 관련 URL
-class BULK_URLS:
-    BULK = f"{PRODUCTION_URL}/bulk"  # 대량 생성
-
-
-# CLM 관련 URL
-class CLM_URLS:
-    DRAFT = f"{PRODUCTION_URL}/clm/draft"  # 계약 검토 요청
-    PROCESS = f"{PRODUCTION_URL}/clm/process"
-    SEARCH = f"{PRODUCTION_URL}/clm/search"  # 통합검색
-    REVIEW = f"{PRODUCTION_URL}/clm/review"  # 검토 요청 조회
-    COMPLETE = f"{PRODUCTION_URL}/clm/complete?page=0"  # 체결 계약서 조회
-    COMPARE = f"{PRODUCTION_URL}/document_compare"  # AI 계약 내용 비교
-    PAUSE = f"{PRODUCTION_URL}/clm/complete?is_paused=2"  # 일시 중단 리스트
-
-
-# SEAL 관련 URL
-class SEAL_URLS:
-    DRAFT = f"{PRODUCTION_URL}/seal/draft"  # 인감 사용 신청
-    REVIEW = f"{PRODUCTION_URL}/seal"  # 인감 사용 신청 조회
-    LEDGER = f"{PRODUCTION_URL}/seal/ledger"  # 인감 관리 대장
-
-
-# Advice 관련 URL
-class ADVICE_URLS:
-    DRAFT = f"{PRODUCTION_URL}/advice/draft"  # 법률 지문 요청
-    PROCESS = f"{PRODUCTION_URL}/advice/process"
-    REVIEW = f"{PRODUCTION_URL}/advice"  # 법률 자문 조회
-
-
-# Litigation 관련 URL
-class LITIGATION_URLS:
-    DRAFT = f"{PRODUCTION_URL}/litigation/draft"  # 송무 등록
-    PROCESS = f"{PRODUCTION_URL}/litigation/process"
-    REVIEW = f"{PRODUCTION_URL}/litigation"  # 송무 조회
-    SCHEDULE = f"{PRODUCTION_URL}/litigation/schedule"  # 송무 전체 일정
-
-
-# 법령 정보 관련 URL
-class LAW_URLS:
-    SCHEDULE = f"{PRODUCTION_URL}/law"  # 법령 캘린더
-
-
-# 프로젝트 관련 URL
-class PROJECT_URLS:
-    PROJECT = f"{PRODUCTION_URL}/project"  # 프로젝트 조회
-
-
-# 계약 정보 관리 관련 URL
-class CONTRACT_URLS:
-    CONTRACT = f"{PRODUCTION_URL}/contact"  # 계약처 관리
-    STAMP = f"{PRODUCTION_URL}/template?type=stamp"  # 직인
-    LOGO = f"{PRODUCTION_URL}/template?type=logo"  # 로고
-    TEAM_STAMP = f"{PRODUCTION_URL}/template?type=team_stamp"  # 기업직인
-    WATERMARK = f"{PRODUCTION_URL}/template?type=watermark"  # 워터마크
-
-
-# 시스템 설정 관련 URL
-class SETTING_URLS:
-    TEAM = f"{PRODUCTION_URL}/teams"  # 구성원 관리
-    ACCOUNT = f"{PRODUCTION_URL}/profile?type=account"  # 회원정보_계정 설정
-    NOTIFICATION = f"{PRODUCTION_URL}/profile?type=notification"  # 회원정보_알림/이메일 수신 설정
-    LOG = f"{PRODUCTION_URL}/profile?type=log"  # 회원정보_로그인 기록
-    FAILEDLOG = f"{PRODUCTION_URL}/profile?type=failedLog"  # 회원정보_로그인 실패 기록
-    FA = f"{PRODUCTION_URL}/profile?type=twoFA"  # 2단계 인증
-    MANAGEMENT = f"{PRODUCTION_URL}/profile?type=deviceManagement"  # 회원정보_로그인 관리
-    SETUP = f"{PRODUCTION_URL}/setup"  # 설정
-
-
-# 모든 URL을 포함하는 통합 클래스
-class URLS:
-    BASE = BASE_URL
-    LOGIN = LOGIN_URLS
-    CLM = CLM_URLS
-    SEAL = SEAL_URLS
-    ADVICE = ADVICE_URLS
-    LITIGATION = LITIGATION_URLS
-    BULK = BULK_URLS
-    LAW = LAW_URLS
-    PROJECT = PROJECT_URLS
-    CONTRACT = CONTRACT_URLS
-    SETTING = SETTING_URLS
 
+    # 최종 BASE URL 결정: JSON 우선, 없으면 .env
+    env_vars = get_env_vars()
+    return (
+        _json_base_url.strip()
+        or env_vars.get('prod_BASE_URL', '').strip()
+        or env_vars.get('dev_BASE_URL', '').strip()
+    )
+
+
+# 섹션 → {이름: 경로}. 'http'로 시작하는 값은 BASE URL과 무관한 절대 주소
+_URL_SPEC = {
+    # 기본 URL
+    'BASE': {
+        'PRODUCTION': '',
+    },
+    # 로그인 관련 URL
+    'LOGIN': {
+        'HOME': '',
+        'LOGIN': '/login',
+        'DASHBOARD': '/dashboard',
+    },
+    # 계약서 생성 관련 URL
+    'DRIVE': {
+        'DRIVE': '/drive',  # My 계약서
+        'TEAM': '/team_standard_contract',  # 기업 표준 계약서
+        'AUTO': '/#documents_finder',  # 자동작성
+        'CHECKLIST': '/ai/dchecklist',  # AI 필수조항검토
+        'GLD': 'https://chatgld.io',
+    },
+    # 대량생성 관련 URL
+    'BULK': {
+        'BULK': '/bulk',  # 대량 생성
+    },
+    # CLM 관련 URL
+    'CLM': {
+        'DRAFT': '/clm/draft',  # 계약 검토 요청
+        'PROCESS': '/clm/process',
+        'SEARCH': '/clm/search',  # 통합검색
+        'REVIEW': '/clm/review',  # 검토 요청 조회
+        'COMPLETE': '/clm/complete?page=0',  # 체결 계약서 조회
+        'COMPARE': '/document_compare',  # AI 계약 내용 비교
+        'PAUSE': '/clm/complete?is_paused=2',  # 일시 중단 리스트
+    },
+    # SEAL 관련 URL
+    'SEAL': {
+        'DRAFT': '/seal/draft',  # 인감 사용 신청
+        'REVIEW': '/seal',  # 인감 사용 신청 조회
+        'LEDGER': '/seal/ledger',  # 인감 관리 대장
+    },
+    # Advice 관련 URL
+    'ADVICE': {
+        'DRAFT': '/advice/draft',  # 법률 지문 요청
+        'PROCESS': '/advice/process',
+        'REVIEW': '/advice',  # 법률 자문 조회
+    },
+    # Litigation 관련 URL
+    'LITIGATION': {
+        'DRAFT': '/litigation/draft',  # 송무 등록
+        'PROCESS': '/litigation/process',
+        'REVIEW': '/litigation',  # 송무 조회
+        'SCHEDULE': '/litigation/schedule',  # 송무 전체 일정
+    },
+    # 법령 정보 관련 URL
+    'LAW': {
+        'SCHEDULE': '/law',  # 법령 캘린더
+    },
+    # 프로젝트 관련 URL
+    'PROJECT': {
+        'PROJECT': '/project',  # 프로젝트 조회
+    },
+    # 계약 정보 관리 관련 URL
+    'CONTRACT': {
+        'CONTRACT': '/contact',  # 계약처 관리
+        'STAMP': '/template?type=stamp',  # 직인
+        'LOGO': '/template?type=logo',  # 로고
+        'TEAM_STAMP': '/template?type=team_stamp',  # 기업직인
+        'WATERMARK': '/template?type=watermark',  # 워터마크
+    },
+    # 시스템 설정 관련 URL
+    'SETTING': {
+        'TEAM': '/teams',  # 구성원 관리
+        'ACCOUNT': '/profile?type=account',  # 회원정보_계정 설정
+        'NOTIFICATION': '/profile?type=notification',  # 회원정보_알림/이메일 수신 설정
+        'LOG': '/profile?type=log',  # 회원정보_로그인 기록
+        'FAILEDLOG': '/profile?type=failedLog',  # 회원정보_로그인 실패 기록
+        'FA': '/profile?type=twoFA',  # 2단계 인증
+        'MANAGEMENT': '/profile?type=deviceManagement',  # 회원정보_로그인 관리
+        'SETUP': '/setup',  # 설정
+    },
+}
+
+_SECTION_TYPES = {
+    section: namedtuple(f"{section}_URLS", list(paths))
+    for section, paths in _URL_SPEC.items()
+}
+
+# 모든 URL을 포함하는 통합 묶음 (URLS.CLM.COMPLETE 형태)
+UrlBundle = namedtuple('UrlBundle', list(_URL_SPEC))
+
+
+@lru_cache(maxsize=None)
+def _build_urls(base_url: str) -> UrlBundle:
+    sections = {}
+    for section, paths in _URL_SPEC.items():
+        values = [path if path.startswith('http') else f"{base_url}{path}" for path in paths.values()]
+        sections[section] = _SECTION_TYPES[section](*values)
+    return UrlBundle(**sections)
+
+
+def get_urls(account_key: Optional[str] = None, env: Optional[str] = None) -> UrlBundle:
+    """테넌트별 불변 URL 묶음 (설정 파일이 바뀌지 않았으면 캐시 재사용)"""
+    return _build_urls(resolve_base_url(account_key, env))
+
+
+class _DefaultTenantURLs:
+    """기본 테넌트 URL 섹션을 속성 접근 시점에 조회하는 지연 객체 (기존 클래스 상수 호환용)"""
+
+    def __init__(self, section: Optional[str] = None):
+        self._section = section
+
+    def __getattr__(self, name: str) -> Any:
+        urls = get_urls()
+        if self._section is None:
+            return getattr(urls, name)
+        return getattr(getattr(urls, self._section), name)
+
+    def __repr__(self) -> str:
+        return f"<{self._section or 'URLS'} (기본 테넌트, 지연 로딩)>"
+
+
+BASE_URL = _DefaultTenantURLs('BASE')
+LOGIN_URLS = _DefaultTenantURLs('LOGIN')
+DRIVE_URLS = _DefaultTenantURLs('DRIVE')
+BULK_URLS = _DefaultTenantURLs('BULK')
+CLM_URLS = _DefaultTenantURLs('CLM')
+SEAL_URLS = _DefaultTenantURLs('SEAL')
+ADVICE_URLS = _DefaultTenantURLs('ADVICE')
+LITIGATION_URLS = _DefaultTenantURLs('LITIGATION')
+LAW_URLS = _DefaultTenantURLs('LAW')
+PROJECT_URLS = _DefaultTenantURLs('PROJECT')
+CONTRACT_URLS = _DefaultTenantURLs('CONTRACT')
+SETTING_URLS = _DefaultTenantURLs('SETTING')
+URLS = _DefaultTenantURLs()
+
+
+def __getattr__(name: str) -> Any:
+    # 예전 모듈 전역값 호환 (접근 시점에 계산)
+    if name == 'PRODUCTION_URL':
+        return get_urls().BASE.PRODUCTION
+    if name == 'env_vars':
+        return get_env_vars()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
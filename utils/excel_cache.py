@@ -0,0 +1,204 @@
+"""엑셀 워크북을 빠르게 읽고, 시트별 DataFrame을 파일 내용 해시 기준으로 캐시하는 공용 모듈.
+
+용도
+- check/combine/문서/대주산업 스크립트가 같은 대용량 .xlsx를 반복해서 읽는 시간을 줄임
+
+동작 방식
+- 엔진: python-calamine이 설치되어 있으면 calamine(pandas 2.2+), 없으면 openpyxl
+  (EXCEL_READ_ENGINE 환경변수나 engine 인자로 지정 가능)
+- sheet_name을 주면 그 시트만, 없으면 워크북을 한 번 열어 모든 시트를 같은 옵션(header 등)으로 파싱
+  (header 등 옵션은 요청한 시트에만 적용 - 다른 시트의 형식 때문에 실패하지 않음)
+- 캐시: <캐시 폴더>/<파일 sha256>/<엔진+시트 선택+옵션 해시>/ 아래에 시트별 파일 + manifest.json(시트 순서/이름)
+  - Parquet으로 저장한 뒤 다시 읽어 원본과 같을 때만 Parquet 사용, 아니면(혼합 타입 컬럼,
+    숫자 컬럼명, pyarrow 미설치 등) pickle로 저장
+- 내용이 같은 파일을 다시 읽으면 XLSX 파싱 없이 캐시에서 로드 (경로/수정 시각과 무관)
+- 기본 캐시 위치: ~/.cache/contract_crawler/excel (EXCEL_CACHE_DIR 환경변수로 변경)
+
+사용 예시
+    from utils.excel_cache import read_workbook
+    sheets = read_workbook(path)                  # {시트명: DataFrame} (모든 시트)
+    df = read_workbook(path, sheet_name='CLM등록')  # DataFrame
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR_ENV = 'EXCEL_CACHE_DIR'
+ENGINE_ENV = 'EXCEL_READ_ENGINE'
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'contract_crawler' / 'excel'
+MANIFEST_NAME = 'manifest.json'
+CACHE_FORMAT_VERSION = 2
+
+_lock = threading.Lock()
+# (경로, mtime_ns, size) → sha256 (같은 프로세스에서 같은 파일을 여러 번 읽을 때 재해시 생략)
+_hash_cache: Dict[Tuple[str, int, int], str] = {}
+
+SheetName = Union[str, int, List[Union[str, int]], None]
+
+
+def default_engine() -> str:
+    engine = os.getenv(ENGINE_ENV, '').strip()
+    if engine:
+        return engine
+    return 'calamine' if importlib.util.find_spec('python_calamine') is not None else 'openpyxl'
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """파일 내용 sha256 (프로세스 안에서는 stat 값이 같으면 재사용)"""
+    st = os.stat(path)
+    stat_key = (str(Path(path).resolve()), st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _hash_cache.get(stat_key)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+    with _lock:
+        _hash_cache[stat_key] = sha
+    return sha
+
+
+def _options_key(engine: str, requested: Optional[List[Union[str, int]]], read_kwargs: Dict[str, Any]) -> str:
+    text = repr((CACHE_FORMAT_VERSION, engine, requested, sorted(read_kwargs.items())))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _restore_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet은 object 컬럼의 NaN을 None으로 돌려주므로 read_excel 결과처럼 NaN으로 복원"""
+    for i, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            column = df.iloc[:, i]
+            if column.map(lambda v: v is None).any():
+                df.isetitem(i, column.where(column.notna(), np.nan))
+    return df
+
+
+def _save_sheet(df: pd.DataFrame, target_dir: Path, position: int) -> str:
+    """Parquet 왕복 결과가 원본과 같으면 Parquet, 아니면 pickle로 저장하고 파일명 반환
+
+    컬럼명이 모두 문자열이 아니면(header=None의 정수 컬럼명 등) Parquet으로 복원되지 않으므로 시도하지 않음
+    """
+    parquet_name = f'{position}.parquet'
+    if all(isinstance(col, str) for col in df.columns):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # 실패하면 pickle로 저장하므로 pandas/pyarrow 경고는 생략
+                df.to_parquet(target_dir / parquet_name)
+            if _restore_missing(pd.read_parquet(target_dir / parquet_name)).equals(df):
+                return parquet_name
+        except Exception:
+            pass
+        (target_dir / parquet_name).unlink(missing_ok=True)
+    pickle_name = f'{position}.pkl'
+    df.to_pickle(target_dir / pickle_name)
+    return pickle_name
+
+
+def _load_sheet(path: Path) -> pd.DataFrame:
+    if path.suffix == '.parquet':
+        return _restore_missing(pd.read_parquet(path))
+    return pd.read_pickle(path)
+
+
+def _load_cached(entry_dir: Path) -> Optional[Dict[str, pd.DataFrame]]:
+    try:
+        manifest = json.loads((entry_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+        return {sheet['name']: _load_sheet(entry_dir / sheet['file']) for sheet in manifest['sheets']}
+    except Exception:
+        return None
+
+
+def _store_cached(entry_dir: Path, sheets: Dict[str, pd.DataFrame], source: Path) -> None:
+    """임시 폴더에 모두 쓴 뒤 이름을 바꿔 넣어, 중간에 실패해도 반쯤 쓴 캐시가 남지 않게 함"""
+    entry_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix='.tmp-', dir=entry_dir.parent))
+    try:
+        files = [
+            {'name': name, 'file': _save_sheet(df, tmp_dir, position)}
+            for position, (name, df) in enumerate(sheets.items())
+        ]
+        manifest = {'source': str(source), 'sheets': files}
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # 다른 프로세스가 먼저 같은 캐시를 만든 경우
+            pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _requested(sheet_name: SheetName) -> Optional[List[Union[str, int]]]:
+    """파싱할 시트 목록 (None: 전체) - 요청한 시트만 읽어 read_kwargs가 다른 시트에 적용되지 않게 함"""
+    if sheet_name is None:
+        return None
+    return list(sheet_name) if isinstance(sheet_name, list) else [sheet_name]
+
+
+def _select(sheets: Dict[Any, pd.DataFrame], sheet_name: SheetName):
+    """pd.read_excel 과 같은 반환 형태 (None/목록: dict, 이름/번호: DataFrame)"""
+    if sheet_name is None or isinstance(sheet_name, list):
+        return sheets
+    return sheets[sheet_name]
+
+
+def read_workbook(
+    path: Union[str, Path],
+    sheet_name: SheetName = None,
+    cache: bool = True,
+    engine: Optional[str] = None,
+    prepare: Optional[Callable[[Path, Path], Path]] = None,
+    **read_kwargs: Any,
+):
+    """sheet_name에 해당하는 시트를 파싱(또는 캐시에서 로드)해 pd.read_excel과 같은 형태로 반환
+
+    sheet_name: None이면 모든 시트를 한 번에, 이름/번호/목록이면 그 시트만 파싱
+    read_kwargs: header 등 pd.read_excel 옵션 - 요청한 시트에만 적용 (시트 선택/옵션이 다르면 캐시도 따로 저장)
+    prepare: 캐시에 없을 때만 호출 - (원본 경로, 임시 폴더) → 실제로 파싱할 파일 경로 (예: 스타일 보정본)
+    반환된 DataFrame은 호출마다 새로 로드되므로 수정해도 캐시에 영향 없음
+    """
+    path = Path(path)
+    engine = engine or default_engine()
+    requested = _requested(sheet_name)
+    entry_dir = None
+    if cache:
+        entry_dir = cache_dir() / file_sha256(path) / _options_key(engine, requested, read_kwargs)
+        if entry_dir.is_dir():
+            sheets = _load_cached(entry_dir)
+            if sheets is not None:
+                return _select(sheets, sheet_name)
+            shutil.rmtree(entry_dir, ignore_errors=True)  # 손상된 캐시는 지우고 다시 만듦
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = prepare(path, Path(tmp)) if prepare is not None else path
+        sheets = pd.read_excel(source, sheet_name=requested, engine=engine, **read_kwargs)
+
+    if entry_dir is not None:
+        try:
+            _store_cached(entry_dir, sheets, path)
+        except Exception as e:
+            print(f"⚠ 엑셀 캐시 저장 실패 ({path.name}): {e}")
+    return _select(sheets, sheet_name)
+
+
+def clear_cache() -> None:
+    """캐시 폴더 전체 삭제"""
+    shutil.rmtree(cache_dir(), ignore_errors=True)
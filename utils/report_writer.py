@@ -0,0 +1,302 @@
+"""불일치 리포트처럼 행이 많은 결과를 메모리를 거의 쓰지 않고 엑셀로 저장하는 스트리밍 작성기.
+
+용도
+- 비교 스크립트가 list[dict] → DataFrame → pd.ExcelWriter 로 저장하던 결과를
+  DataFrame 없이 행 단위로 흘려보내 저장 (수십만 행도 메모리 사용량 일정)
+
+동작 방식
+- write_rows(시트명, 행 dict들): 행을 시트별 임시 파일(pickle 묶음)에 바로 기록하고,
+  컬럼 순서는 pd.DataFrame(list_of_dicts)와 같은 "처음 등장한 순서"로만 기억
+- close(): 임시 파일을 다시 읽으며 한 행씩 엑셀에 기록
+  - xlsxwriter가 있으면 constant_memory 모드, 없으면 openpyxl write-only 모드
+  - 엑셀 최대 행 수(1,048,576)를 넘는 시트는 '시트명_2', '시트명_3' ... 으로 나눔
+  - sidecar='csv' | 'parquet' 이면 시트별 사이드카 파일도 함께 저장 (시트를 나누지 않은 전체 행)
+    Parquet은 타입이 섞인 컬럼을 위해 모든 값을 문자열로 저장
+
+사용 예시
+    from utils.report_writer import ReportWriter
+    with ReportWriter(output_file, sidecar='csv') as writer:
+        writer.write_rows('전체필드_불일치', rows)
+"""
+
+import csv
+import math
+import pickle
+import shutil
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xlsxwriter
+except Exception:  # pragma: no cover
+    xlsxwriter = None  # type: ignore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+
+EXCEL_MAX_ROWS = 1_048_576  # 헤더 포함
+SHEET_NAME_LIMIT = 31
+SIDECAR_FORMATS = ('csv', 'parquet')
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+DATE_FORMAT = 'yyyy-mm-dd'
+
+
+def _cell_value(value: Any) -> Any:
+    """엑셀에 쓸 수 있는 값으로 변환 (결측 → None, numpy 스칼라 → 파이썬 값, 리스트/딕셔너리 → 문자열)"""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, (list, tuple, dict, set)):
+        return str(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return str(value)
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return value
+
+
+class _SpooledSheet:
+    """한 시트의 행을 임시 파일에 묶음 단위로 기록"""
+
+    def __init__(self, path: Path, batch_size: int):
+        self.path = path
+        self.batch_size = batch_size
+        self.columns: Dict[Any, None] = {}  # 순서 있는 집합
+        self.count = 0
+        self._batch: List[Mapping[str, Any]] = []
+        self._file = open(path, 'wb')
+
+    def add_columns(self, columns: Iterable[Any]) -> None:
+        for column in columns:
+            if column not in self.columns:
+                self.columns[column] = None
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        self.add_columns(row)
+        self._batch.append(row)
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._batch:
+            pickle.dump(self._batch, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            self._batch = []
+
+    def finish(self) -> None:
+        if not self._file.closed:
+            self._flush()
+            self._file.close()
+
+    def iter_values(self) -> Iterator[List[Any]]:
+        """헤더 순서대로 변환한 값 목록을 한 행씩 반환 (여러 번 호출 가능)"""
+        self.finish()
+        columns = list(self.columns)
+        with open(self.path, 'rb') as f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    break
+                for row in batch:
+                    yield [_cell_value(row.get(column)) for column in columns]
+
+
+class ReportWriter:
+    def __init__(self, path: Union[str, Path], engine: Optional[str] = None,
+                 max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1, sidecar: Optional[str] = None,
+                 batch_size: int = 5000):
+        if sidecar is not None and sidecar not in SIDECAR_FORMATS:
+            raise ValueError(f"지원하지 않는 사이드카 형식: {sidecar} (가능: {', '.join(SIDECAR_FORMATS)})")
+        self.path = Path(path)
+        self.engine = engine or ('xlsxwriter' if xlsxwriter is not None else 'openpyxl')
+        self.max_rows_per_sheet = max_rows_per_sheet
+        self.sidecar = sidecar
+        self.batch_size = batch_size
+        self._spool_dir = Path(tempfile.mkdtemp(prefix='report-'))
+        self._sheets: Dict[str, _SpooledSheet] = {}
+        self._closed = False
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _sheet(self, sheet_name: str) -> _SpooledSheet:
+        sheet = self._sheets.get(sheet_name)
+        if sheet is None:
+            sheet = _SpooledSheet(self._spool_dir / f'{len(self._sheets)}.pkl', self.batch_size)
+            self._sheets[sheet_name] = sheet
+        return sheet
+
+    def write_rows(self, sheet_name: str, rows: Iterable[Mapping[str, Any]],
+                   columns: Optional[Sequence[Any]] = None) -> int:
+        """행 dict들을 시트에 추가 (columns: 행이 없어도 헤더로 쓸 컬럼, 앞쪽 순서 고정용)"""
+        sheet = self._sheet(sheet_name)
+        if columns is not None:
+            sheet.add_columns(columns)
+        before = sheet.count
+        for row in rows:
+            sheet.append(row)
+        return sheet.count - before
+
+    def write_frame(self, sheet_name: str, df: pd.DataFrame) -> int:
+        """DataFrame을 batch_size 행씩 나눠 추가 (index 제외)"""
+        written = self.write_rows(sheet_name, [], columns=list(df.columns))
+        for start in range(0, len(df), self.batch_size):
+            written += self.write_rows(sheet_name, df.iloc[start:start + self.batch_size].to_dict('records'))
+        return written
+
+    def row_count(self, sheet_name: str) -> int:
+        sheet = self._sheets.get(sheet_name)
+        return sheet.count if sheet is not None else 0
+
+    def _parts(self, sheet_name: str, sheet: _SpooledSheet) -> List[str]:
+        """최대 행 수 기준으로 나눈 시트 이름들 (엑셀 시트명 31자 제한 반영)"""
+        part_count = max(1, math.ceil(sheet.count / self.max_rows_per_sheet))
+        names = [sheet_name[:SHEET_NAME_LIMIT]]
+        for part in range(2, part_count + 1):
+            suffix = f'_{part}'
+            names.append(sheet_name[:SHEET_NAME_LIMIT - len(suffix)] + suffix)
+        return names
+
+    def _split_rows(self, sheet: _SpooledSheet) -> Iterator[List[Any]]:
+        """시트 조각마다 행 iterator 하나씩 (조각 경계에서 끊어 읽음)"""
+        rows = sheet.iter_values()
+        remaining = sheet.count
+        while True:
+            take = min(remaining, self.max_rows_per_sheet)
+            yield (next(rows) for _ in range(take))
+            remaining -= take
+            if remaining <= 0:
+                break
+
+    def _write_xlsxwriter(self) -> None:
+        workbook = xlsxwriter.Workbook(str(self.path), {'constant_memory': True, 'strings_to_urls': False})
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        datetime_format = workbook.add_format({'num_format': DATETIME_FORMAT})
+        date_format = workbook.add_format({'num_format': DATE_FORMAT})
+        try:
+            for sheet_name, sheet in self._sheets.items():
+                columns = list(sheet.columns)
+                for title, rows in zip(self._parts(sheet_name, sheet), self._split_rows(sheet)):
+                    worksheet = workbook.add_worksheet(title)
+                    for col, column in enumerate(columns):
+                        worksheet.write_string(0, col, str(column), header_format)
+                    for row_number, values in enumerate(rows, start=1):
+                        for col, value in enumerate(values):
+                            if value is None:
+                                continue
+                            if isinstance(value, datetime):
+                                worksheet.write_datetime(row_number, col, value, datetime_format)
+                            elif isinstance(value, date):
+                                worksheet.write_datetime(row_number, col, value, date_format)
+                            else:
+                                worksheet.write(row_number, col, value)
+        finally:
+            workbook.close()
+
+    def _write_openpyxl(self) -> None:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, sheet in self._sheets.items():
+            columns = list(sheet.columns)
+            for title, rows in zip(self._parts(sheet_name, sheet), self._split_rows(sheet)):
+                worksheet = workbook.create_sheet(title)
+                header = []
+                for column in columns:
+                    cell = WriteOnlyCell(worksheet, value=str(column))
+                    cell.font = Font(bold=True)
+                    header.append(cell)
+                worksheet.append(header)
+                for values in rows:
+                    worksheet.append(values)
+        workbook.save(self.path)
+
+    def _sidecar_path(self, sheet_name: str) -> Path:
+        return self.path.with_name(f"{self.path.stem}_{sheet_name}.{self.sidecar}")
+
+    def _write_sidecars(self) -> List[Path]:
+        written = []
+        for sheet_name, sheet in self._sheets.items():
+            target = self._sidecar_path(sheet_name)
+            columns = [str(column) for column in sheet.columns]
+            if self.sidecar == 'csv':
+                # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+                with open(target, 'w', encoding='utf-8-sig', newline='') as f:
+                    csv_writer = csv.writer(f)
+                    csv_writer.writerow(columns)
+                    for values in sheet.iter_values():
+                        csv_writer.writerow(['' if value is None else value for value in values])
+            else:
+                if pa is None:
+                    print(f"⚠ pyarrow가 없어 Parquet 사이드카를 건너뜁니다: {target.name}")
+                    continue
+                schema = pa.schema([(column, pa.string()) for column in columns])
+                with pq.ParquetWriter(target, schema) as parquet_writer:
+                    batch: List[List[Any]] = []
+                    for values in sheet.iter_values():
+                        batch.append(values)
+                        if len(batch) >= self.batch_size:
+                            parquet_writer.write_table(self._arrow_table(batch, schema))
+                            batch = []
+                    if batch or sheet.count == 0:
+                        parquet_writer.write_table(self._arrow_table(batch, schema))
+            written.append(target)
+        return written
+
+    @staticmethod
+    def _arrow_table(batch: List[List[Any]], schema):
+        arrays = [
+            pa.array([None if values[i] is None else str(values[i]) for values in batch], type=pa.string())
+            for i in range(len(schema))
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def close(self) -> List[Path]:
+        """엑셀(및 사이드카) 저장 후 임시 파일 삭제, 저장한 파일 경로 목록 반환"""
+        if self._closed:
+            return []
+        try:
+            for sheet in self._sheets.values():
+                sheet.finish()
+            written: List[Path] = []
+            if self._sheets:
+                if self.engine == 'xlsxwriter' and xlsxwriter is not None:
+                    self._write_xlsxwriter()
+                else:
+                    self._write_openpyxl()
+                written.append(self.path)
+                if self.sidecar:
+                    written.extend(self._write_sidecars())
+            return written
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """저장하지 않고 임시 파일만 정리"""
+        for sheet in self._sheets.values():
+            sheet.finish()
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+        self._closed = True
@@ -1,9 +1,13 @@
 import pandas as pd
+import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from tempfile import TemporaryDirectory
 import zipfile
 
+# 저장소 루트의 utils 패키지 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.excel_cache import read_workbook
+
 COLUMNS_TO_COMPARE = ["계약명", "상대 계약자", "요청자", "검토담당자", "계약 시작일", "계약 종료일"]
 LIST_FILE = "계약서리스트_양식_대주산업_모두싸인.xlsx"
 SIGNED_FILE = "체결계약서조회_2025-11-18.xlsx"
@@ -73,10 +77,8 @@ def normalize_people(value: str) -> str:
 
 def load_signed_contracts(base_path: Path) -> pd.DataFrame:
     file_path = base_path / SIGNED_FILE
-    with TemporaryDirectory() as tmp:
-        tmp_dir = Path(tmp)
-        sanitized = sanitize_styles(file_path, tmp_dir)
-        df = pd.read_excel(sanitized, header=0)
+    # 스타일 보정은 캐시에 없을 때만 수행
+    df = read_workbook(file_path, sheet_name=0, prepare=sanitize_styles, header=0)
     df = df.rename(
         columns={
             "관리번호": "관리번호",
@@ -95,7 +97,7 @@ def load_signed_contracts(base_path: Path) -> pd.DataFrame:
 
 def load_contract_list(base_path: Path) -> pd.DataFrame:
     file_path = base_path / LIST_FILE
-    df = pd.read_excel(file_path, header=1)
+    df = read_workbook(file_path, sheet_name=0, header=1)
     df = df.rename(
         columns={
             "관리 번호": "관리번호",
@@ -8,8 +8,13 @@
 
 import pandas as pd
 import os
+import sys
 from pathlib import Path
 
+# 저장소 루트의 utils 패키지 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.excel_cache import read_workbook
+
 def merge_excel_files():
     """
     로아이 원본 폴더의 모든 엑셀 파일을 하나의 엑셀 파일로 합치는 함수
@@ -46,8 +51,8 @@ def merge_excel_files():
                 if len(sheet_name) > 31:
                     sheet_name = sheet_name[:31]
                 
-                # 엑셀 파일 읽기
-                df = pd.read_excel(file_path)
+                # 엑셀 파일 읽기 (첫 번째 시트, 내용이 같으면 캐시에서 로드)
+                df = read_workbook(file_path, sheet_name=0)
                 
                 # 데이터프레임을 시트로 저장
                 df.to_excel(writer, sheet_name=sheet_name, index=False)